@@ -18,9 +18,11 @@ class AgentLogger:
     
 
     def log_decision(self, game_id: str, step, state, rendered_state: str, thought_process: str, final_output: str, response: str, time_completed: str, provider="", model="", player=""):
-        # check if we need to serialize
+        # check if we need to serialize, observations log their plain values
         if isinstance(state, np.ndarray):
             state = self.serialize_state(state)
+        elif hasattr(state, 'to_dict'):
+            state = state.to_dict()
 
         # create the log entry
         log_entry = {
@@ -0,0 +1,168 @@
+# File: agents/snake/board_reader.py
+from collections import deque
+import numpy as np
+from environments.snake.snake_observation import SnakeObservation
+
+# the direction index that is a 180-degree turn from each direction index (UP, RIGHT, DOWN, LEFT)
+OPPOSITE_DIRECTIONS = (2, 3, 0, 1)
+
+class BoardReader:
+    """
+    Reads snake states onto a board padded with a one cell wall border, for the search based agents.
+
+    Cells are indices into the padded board, so the neighbours of any board cell are cell + offset with no
+    bounds check, and blocked marks the walls and the body. The order of the body is not part of the state,
+    so the reader follows the head from one state to the next to know where the tail is.
+    """
+
+    def __init__(self):
+        # the buffers, allocated for the board size on the first read
+        self.size = None
+
+        # the head cells of the last length + 1 states (oldest first), so trail[-length] is the tail
+        # and trail[-2] is where the head came from
+        self.trail = deque()
+        self.length = 0
+
+        # the board read from the last state
+        self.head = None
+        self.food = None
+        self.direction = None
+
+        # the tail and the cell after it, when read from an observation rather than the trail
+        self.observed_tail = None
+        self.observed_next_tail = None
+
+    def prepare(self, size):
+        """Allocate the buffers for a board size."""
+        # set the size and the width of the padded board
+        self.size = size
+        self.width = size + 2
+
+        # the blocked cells, with a numpy view to copy the body in from the state
+        self.blocked = bytearray(self.width * self.width)
+        self.blocked_view = np.frombuffer(self.blocked, dtype=np.uint8).reshape(self.width, self.width)
+        self.blocked_view[[0, -1], :] = 1
+        self.blocked_view[:, [0, -1]] = 1
+
+        # the cell offsets and direction indices of UP, RIGHT, DOWN, LEFT
+        self.offsets = (-self.width, 1, self.width, -1)
+        self.offset_directions = {offset: direction for direction, offset in enumerate(self.offsets)}
+
+        # forget the trail of the previous board
+        self.trail.clear()
+        self.length = 0
+
+    def read(self, state, parse_state_string):
+        """
+        Read a state (array, string parsed with parse_state_string, or SnakeObservation) onto the board.
+
+        Returns True if the board size changed, so the caller's own buffers need allocating again.
+        """
+        if isinstance(state, SnakeObservation):
+            return self.read_observation(state)
+
+        # Check if the state is a string or numpy array
+        if isinstance(state, str):
+            state = parse_state_string(state)
+
+            # the parsed string keeps the head out of the body channel and marks empty cells in channel 3
+            state[:, :, 0] += state[:, :, 1]
+            state[:, :, 3] = 0
+
+        # allocate the buffers for this board size
+        resized = state.shape[0] != self.size
+        if resized:
+            self.prepare(state.shape[0])
+
+        # copy the body into the padded board
+        self.blocked_view[1:-1, 1:-1] = state[:, :, 0]
+        length = int(np.count_nonzero(state[:, :, 0]))
+
+        # get the head, food and next head cells on the padded board
+        head = self.padded_cell(int(np.argmax(state[:, :, 1])))
+        food_index = int(np.argmax(state[:, :, 2]))
+        self.food = self.padded_cell(food_index) if state.flat[food_index * 4 + 2] else None
+        next_index = int(np.argmax(state[:, :, 3]))
+        next_head = self.padded_cell(next_index) if state.flat[next_index * 4 + 3] else None
+
+        # follow the head, starting over if it jumped (a new game) or the length changed unexpectedly
+        if self.trail and length - self.length in (0, 1) and head - self.trail[-1] in self.offset_directions:
+            self.trail.append(head)
+        else:
+            self.trail.clear()
+            self.trail.append(head)
+        self.head = head
+        self.length = length
+        self.observed_tail = None
+        while len(self.trail) > length + 1:
+            self.trail.popleft()
+
+        # the direction from the next head marker, or from the last move if the snake faces a wall
+        if next_head is not None:
+            self.direction = self.offset_directions.get(next_head - head)
+        elif len(self.trail) > 1:
+            self.direction = self.offset_directions.get(head - self.trail[-2])
+        else:
+            self.direction = None
+
+        return resized
+
+    def read_observation(self, observation):
+        """
+        Read a SnakeObservation onto the board. The observation carries the body in order and the direction,
+        so nothing is searched for and the trail is not needed.
+        """
+        # allocate the buffers for this board size
+        resized = observation.size != self.size
+        if resized:
+            self.prepare(observation.size)
+
+        # copy the occupancy into the padded board
+        self.blocked_view[1:-1, 1:-1] = observation.occupancy
+
+        # take the head, food, length and direction as they are
+        body = observation.body
+        self.head = self.padded_cell_at(observation.head)
+        self.food = self.padded_cell_at(observation.food) if observation.food is not None else None
+        self.length = len(body)
+        self.direction = observation.direction - 1
+
+        # the tail and the cell after it come straight from the ordered body
+        self.observed_tail = self.padded_cell_at(body[0])
+        self.observed_next_tail = self.padded_cell_at(body[1]) if self.length > 1 else None
+        self.trail.clear()
+
+        return resized
+
+    @property
+    def tail(self):
+        """The tail cell, None until the trail covers the whole body."""
+        if self.observed_tail is not None:
+            return self.observed_tail
+        return self.trail[-self.length] if len(self.trail) >= self.length else None
+
+    @property
+    def next_tail(self):
+        """The cell the tail moves to if the snake moves without eating (None if unknown or length 1)."""
+        if self.observed_tail is not None:
+            return self.observed_next_tail
+        return self.trail[1 - self.length] if self.length > 1 and len(self.trail) >= self.length else None
+
+    def padded_cell(self, index):
+        """Convert a row-major cell index of the board into a cell of the padded board."""
+        row, col = divmod(index, self.size)
+        return (row + 1) * self.width + col + 1
+
+    def padded_cell_at(self, position):
+        """Convert a (row, col) position of the board into a cell of the padded board."""
+        return (position[0] + 1) * self.width + position[1] + 1
+
+    def position(self, cell):
+        """Convert a cell of the padded board into a (row, col) position of the board."""
+        row, col = divmod(cell, self.width)
+        return row - 1, col - 1
+
+    def is_reverse(self, move):
+        """Check whether a direction index is a 180-degree turn, which the environment ignores."""
+        return self.direction is not None and move == OPPOSITE_DIRECTIONS[self.direction]
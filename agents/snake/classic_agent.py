@@ -4,6 +4,7 @@ from typing import Tuple
 from agents.agent_type import AgentType
 from agents.base_agent import BaseAgent
 from agents.snake.snake_action import SnakeAction
+from environments.snake.snake_observation import SnakeObservation
 
 
 class ClassicAgent(BaseAgent):
@@ -20,15 +21,24 @@ class ClassicAgent(BaseAgent):
         return AgentType.CLASSIC
 
     def get_snake_head_position(self, state: np.ndarray) -> Tuple[int, int]:
-        """Extract the position of the snake's head from the state."""
+        """Extract the position of the snake's head from the state (or read it from an observation)."""
+        if isinstance(state, SnakeObservation):
+            return state.head
         return tuple(np.argwhere(state[:,:,1] == 1)[0])
 
     def get_food_position(self, state: np.ndarray) -> Tuple[int, int]:
-        """Extract the position of the food from the state."""
+        """Extract the position of the food from the state (or read it from an observation)."""
+        if isinstance(state, SnakeObservation):
+            return state.food
         return tuple(np.argwhere(state[:,:,2] == 1)[0])
 
     def get_snake_body_positions(self, state: np.ndarray) -> np.ndarray:
-        """Extract the positions of the snake's body from the state."""
+        """
+        Extract the positions of the snake's body from the state. For an observation this is the live body,
+        which supports an O(1) (row, col) in test.
+        """
+        if isinstance(state, SnakeObservation):
+            return state.body
         return np.argwhere(state[:,:,1] == 1)
     
     def serialize_state(self, state: np.ndarray) -> list:
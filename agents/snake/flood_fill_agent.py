@@ -0,0 +1,150 @@
+# File: agents/snake/flood_fill_agent.py
+import time
+from array import array
+from agents.snake.board_reader import BoardReader
+from agents.snake.snake_action import SnakeAction
+from agents.snake.classic_agent import ClassicAgent
+
+class FloodFillAgent(ClassicAgent):
+    """
+    Heads for the food, but only along moves that leave the snake room to live.
+
+    Each candidate move is scored by flood filling the board from the new head: a move is safe if the
+    snake can still reach its own tail (which keeps moving away) or if the reachable area is at least as
+    long as the snake. Safe moves are ranked by distance to the food, unsafe ones by reachable area.
+
+    The board is read onto a grid padded with a wall border (see BoardReader), and the visited marks are
+    generation stamps, so each flood fill is O(free cells) with no allocation.
+    """
+
+    def __init__(self, id: str, name: str, description: str):
+        # call the parent
+        super().__init__(id, name, description)
+
+        # the board, read from each state
+        self.board = BoardReader()
+
+    def prepare(self, size):
+        """Allocate the search buffers for a board size."""
+        cells = (size + 2) * (size + 2)
+
+        # the visited generation stamps and the flood fill queue
+        self.visited = array('I', bytes(4 * cells))
+        self.generation = 0
+        self.queue = array('i', bytes(4 * cells))
+
+    def get_action(self, step: int, state) -> SnakeAction:
+        # choose the move
+        best_move = self.choose_action(state)
+
+        # set the time completed
+        time_completed = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        # log the state, thought process, and decision
+        self.logger.log_decision(self.game_id, step, state, "", "", best_move, best_move, time_completed)
+
+        return best_move
+
+    def choose_action(self, state) -> SnakeAction:
+        """Read the board from a state (array or string) and choose a move, without logging."""
+        # read the board, allocating the search buffers for a new board size
+        if self.board.read(state, self.parse_state_string):
+            self.prepare(self.board.size)
+
+        # choose the move
+        best_move = self.select_action()
+
+        # Update the current direction
+        self.current_direction = best_move
+
+        return best_move
+
+    def select_action(self) -> SnakeAction:
+        """Choose a move from the board already read into the search buffers."""
+        board = self.board
+        blocked = board.blocked
+        width = board.width
+        head, food, length = board.head, board.food, board.length
+
+        # the tail is only known once the trail covers the whole body
+        tail = board.tail
+
+        best_move = None
+        best_key = None
+        for move, offset in enumerate(board.offsets):
+            # a 180-degree turn is ignored by the environment, and walls and the body are death
+            if board.is_reverse(move):
+                continue
+            cell = head + offset
+            if blocked[cell]:
+                continue
+
+            # without food the tail moves on, freeing its cell and leaving the next segment as the tail
+            eats = cell == food
+            if eats or tail is None:
+                area, reachable = self.flood_fill(cell, tail, length)
+            elif length == 1:
+                # the new head is the whole snake
+                area, reachable = self.flood_fill(cell, None, length)
+                reachable = True
+            else:
+                blocked[tail] = 0
+                area, reachable = self.flood_fill(cell, board.next_tail, length)
+                blocked[tail] = 1
+
+            # rank safe moves by distance to the food, unsafe moves by the room they leave
+            if food is None:
+                distance = 0
+            else:
+                distance = abs(cell // width - food // width) + abs(cell % width - food % width)
+            safe = reachable or area >= length
+            key = (True, -distance, area) if safe else (False, area, -distance)
+            if best_key is None or key > best_key:
+                best_key = key
+                best_move = move
+
+        # no move survives, so keep going the current way
+        if best_move is None:
+            best_move = board.direction if board.direction is not None else 0
+
+        # return the SnakeAction value
+        return best_move + 1
+
+    def flood_fill(self, start, target, length):
+        """
+        Count the free cells reachable from start (which is treated as the new head) and whether the
+        target cell is next to one of them, stopping early once the move is known to be safe.
+        """
+        # start a new generation of visited marks
+        self.generation += 1
+        if self.generation == 0xFFFFFFFF:
+            self.visited = array('I', bytes(len(self.visited) * 4))
+            self.generation = 1
+        generation = self.generation
+        visited = self.visited
+        blocked = self.board.blocked
+        queue = self.queue
+
+        # breadth first search from the new head
+        visited[start] = generation
+        queue[0] = start
+        read, write = 0, 1
+        reachable = False
+        while read < write:
+            cell = queue[read]
+            read += 1
+            for offset in self.board.offsets:
+                neighbour = cell + offset
+                if neighbour == target:
+                    reachable = True
+                if visited[neighbour] != generation and not blocked[neighbour]:
+                    visited[neighbour] = generation
+                    queue[write] = neighbour
+                    write += 1
+
+            # the move is safe, no need to search further
+            if reachable and write > length:
+                break
+
+        # the new head itself is not free space
+        return write - 1, reachable
@@ -29,7 +29,7 @@ class FoodSeekerAgent(ClassicAgent):
             best_move = SnakeAction.RIGHT
         
         # log the state, thought process, and decision
-        self.logger.log_decision(self.game_id, step, state, "", best_move, best_move, time_completed)
+        self.logger.log_decision(self.game_id, step, state, "", "", best_move, best_move, time_completed)
 
         # return the best move
         return best_move
@@ -0,0 +1,246 @@
+# File: agents/snake/hamiltonian_agent.py
+import heapq
+import time
+from array import array
+from collections import deque
+from agents.snake.board_reader import BoardReader
+from agents.snake.snake_action import SnakeAction
+from agents.snake.classic_agent import ClassicAgent
+
+def hamiltonian_cycle(size):
+    """
+    Return a cycle through every (row, col) of an even sized board: down the first column, up and down
+    the other columns below the first row, then back along the first row.
+    """
+    if size % 2:
+        raise ValueError(f"A Hamiltonian cycle needs an even board size, not {size}")
+
+    # down the first column
+    cycle = [(row, 0) for row in range(size)]
+
+    # up and down the other columns, leaving the first row free
+    for col in range(1, size):
+        rows = range(size - 1, 0, -1) if col % 2 else range(1, size)
+        cycle.extend((row, col) for row in rows)
+
+    # back along the first row
+    cycle.extend((0, col) for col in range(size - 1, 0, -1))
+    return cycle
+
+class HamiltonianAgent(ClassicAgent):
+    """
+    Fills the board by following a Hamiltonian cycle, taking A* shortcuts to the food.
+
+    The body always lies along the cycle in order, tail first, so every cell ahead of the head on the
+    cycle, up to the tail, is free. A path that keeps moving further ahead and never reaches the tail is
+    therefore safe. A* only searches such paths, and always finds one because the cycle itself is one.
+
+    The plan to the food is cached. The tail only moves further ahead, so the rest of a valid plan stays
+    valid. Each step therefore only checks that the head is where the plan expects and that the food has
+    not moved, and the agent replans only when it has.
+    """
+
+    def __init__(self, id: str, name: str, description: str):
+        # call the parent
+        super().__init__(id, name, description)
+
+        # the board, read from each state
+        self.board = BoardReader()
+
+        # the cached plan: the cells still to visit (next first), the food it leads to and the head it expects
+        self.plan = deque()
+        self.plan_food = None
+        self.plan_head = None
+
+        # the number of A* searches run, to see how often the plan is reused
+        self.searches = 0
+
+    def prepare(self, size):
+        """Build the cycle and allocate the search buffers for a board size."""
+        board = self.board
+        cells = board.width * board.width
+
+        # the cycle as padded board cells, and the position of each cell on it (-1 for the walls)
+        self.cycle = [board.padded_cell(row * size + col) for row, col in hamiltonian_cycle(size)]
+        self.cycle_index = array('i', [-1]) * cells
+        for index, cell in enumerate(self.cycle):
+            self.cycle_index[cell] = index
+
+        # the A* buffers: visited generation stamps, best path lengths and parents
+        self.visited = array('I', bytes(4 * cells))
+        self.generation = 0
+        self.costs = array('i', bytes(4 * cells))
+        self.parents = array('i', bytes(4 * cells))
+
+        # forget the plan
+        self.plan.clear()
+
+    def get_action(self, step: int, state) -> SnakeAction:
+        # choose the move
+        best_move = self.choose_action(state)
+
+        # set the time completed
+        time_completed = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        # log the state, thought process, and decision
+        self.logger.log_decision(self.game_id, step, state, "", "", best_move, best_move, time_completed)
+
+        return best_move
+
+    def choose_action(self, state) -> SnakeAction:
+        """Read the board from a state (array or string) and choose a move, without logging."""
+        # read the board, building the cycle for a new board size
+        if self.board.read(state, self.parse_state_string):
+            self.prepare(self.board.size)
+
+        # choose the next cell and turn it into a move
+        cell = self.select_cell()
+        best_move = self.board.offset_directions[cell - self.board.head] + 1
+
+        # Update the current direction
+        self.current_direction = best_move
+
+        return best_move
+
+    def select_cell(self):
+        """Choose the cell the head moves into next."""
+        board = self.board
+        head, food, tail = board.head, board.food, board.tail
+        cycle_index = self.cycle_index
+        num_cells = len(self.cycle)
+
+        # how far ahead of the head the tail is on the cycle, the cells in between are free
+        head_index = cycle_index[head]
+        limit = num_cells if tail is None or board.length == 1 else (cycle_index[tail] - head_index) % num_cells
+
+        # keep following the cached plan while the head is where it expects and the food has not moved
+        if self.plan and self.plan_food == food and self.plan_head == head and self.is_ahead(self.plan[0], head_index, limit):
+            return self.follow_plan()
+
+        # plan a shortcut once the food is ahead of the head
+        self.plan.clear()
+        if food is not None and (cycle_index[food] - head_index) % num_cells < limit:
+            self.plan.extend(self.find_path(head, food, limit, board.length))
+            self.searches += 1
+            self.plan_food = food
+            if self.plan:
+                return self.follow_plan()
+
+        # otherwise follow the cycle
+        cell = self.cycle[(head_index + 1) % num_cells]
+        if self.is_ahead(cell, head_index, limit):
+            return cell
+
+        # the body is off the cycle (only while it is very short), so take any free cell
+        return self.any_free_cell()
+
+    def follow_plan(self):
+        """Take the next cell of the plan."""
+        cell = self.plan.popleft()
+
+        # a 180-degree turn (only possible at length one) would be ignored by the environment
+        if self.board.is_reverse(self.board.offset_directions[cell - self.board.head]):
+            self.plan.clear()
+            return self.any_free_cell()
+
+        self.plan_head = cell
+        return cell
+
+    def is_ahead(self, cell, head_index, limit):
+        """Check whether a cell is free and ahead of the head on the cycle, before the tail."""
+        return not self.board.blocked[cell] and 0 < (self.cycle_index[cell] - head_index) % len(self.cycle) < limit
+
+    def any_free_cell(self):
+        """Return the free neighbour closest to the food (or straight ahead if there is none)."""
+        board = self.board
+        width = board.width
+        food = board.food if board.food is not None else board.head
+        best_cell = None
+        for move, offset in enumerate(board.offsets):
+            cell = board.head + offset
+            if board.is_reverse(move) or board.blocked[cell]:
+                continue
+            distance = abs(cell // width - food // width) + abs(cell % width - food % width)
+            if best_cell is None or distance < best_distance:
+                best_cell, best_distance = cell, distance
+        if best_cell is None:
+            direction = board.direction if board.direction is not None else 0
+            best_cell = board.head + board.offsets[direction]
+        return best_cell
+
+    def find_path(self, head, food, limit, length):
+        """
+        A* from the head to the food, moving only to free cells further ahead on the cycle and before the
+        tail. Returns the cells of the path after the head, or an empty list if there is none.
+
+        The tail counts as a collision, so the head must never end up right behind it with the free cells
+        it skipped still inside the body. Eating stops the tail for a step, so the food must be at least two
+        cells short of the tail. A shortcut that skips cells must leave room for the whole body to pass the
+        skipped cells first, so it must land at least length + 2 cells short of the tail.
+        """
+        board = self.board
+        width = board.width
+        blocked = board.blocked
+        cycle_index = self.cycle_index
+        num_cells = len(self.cycle)
+        head_index = cycle_index[head]
+        food_row, food_col = divmod(food, width)
+        shortcut_limit = limit - length - 2
+
+        # start a new generation of visited marks
+        self.generation += 1
+        if self.generation == 0xFFFFFFFF:
+            self.visited = array('I', bytes(len(self.visited) * 4))
+            self.generation = 1
+        generation = self.generation
+        visited = self.visited
+        costs = self.costs
+        parents = self.parents
+
+        # search the cells in order of path length plus Manhattan distance to the food
+        visited[head] = generation
+        costs[head] = 0
+        frontier = [(abs(head // width - food_row) + abs(head % width - food_col), 0, head)]
+        while frontier:
+            _, cost, cell = heapq.heappop(frontier)
+            if cell == food:
+                break
+            if cost > costs[cell]:
+                continue
+
+            # move further ahead on the cycle, without reaching the tail
+            ahead = (cycle_index[cell] - head_index) % num_cells
+            for offset in board.offsets:
+                neighbour = cell + offset
+                index = cycle_index[neighbour]
+                if index < 0 or blocked[neighbour]:
+                    continue
+                neighbour_ahead = (index - head_index) % num_cells
+                if not ahead < neighbour_ahead < limit:
+                    continue
+                if neighbour_ahead > ahead + 1 and neighbour_ahead > shortcut_limit:
+                    continue
+                if neighbour == food and neighbour_ahead > limit - 2:
+                    continue
+                if visited[neighbour] == generation and costs[neighbour] <= cost + 1:
+                    continue
+
+                # record the shorter path
+                visited[neighbour] = generation
+                costs[neighbour] = cost + 1
+                parents[neighbour] = cell
+                estimate = cost + 1 + abs(neighbour // width - food_row) + abs(neighbour % width - food_col)
+                heapq.heappush(frontier, (estimate, cost + 1, neighbour))
+
+        # there is no path yet
+        if visited[food] != generation:
+            return []
+
+        # walk back from the food
+        path = []
+        cell = food
+        while cell != head:
+            path.append(cell)
+            cell = parents[cell]
+        path.reverse()
+        return path
@@ -1,8 +1,8 @@
 # File: agents/snake/smart_seeker_agent.py
 import time
-from agents.agent_action import AgentAction
 from agents.snake.snake_action import SnakeAction
 from agents.snake.classic_agent import ClassicAgent
+from environments.snake.snake_observation import SnakeObservation
 
 class SmartSeekerAgent(ClassicAgent):
     def get_action(self, step:int, state) -> SnakeAction:
@@ -16,8 +16,9 @@ class SmartSeekerAgent(ClassicAgent):
         # get the food position
         food = self.get_food_position(state)
 
-        # get the snake body positions
+        # get the snake body positions, as a list for the array state (the observation body tests in O(1))
         snake_body = self.get_snake_body_positions(state)
+        body_positions = snake_body if isinstance(state, SnakeObservation) else snake_body.tolist()
 
         # Define the possible moves
         possible_moves = {
@@ -38,7 +39,7 @@ class SmartSeekerAgent(ClassicAgent):
         # Filter out moves that would result in a collision with the snake's body or are opposite to current direction
         safe_moves = {
             action: pos for action, pos in possible_moves.items()
-            if pos not in snake_body.tolist() and action != opposite_directions[self.current_direction]
+            if pos not in body_positions and action != opposite_directions[self.current_direction]
         }
 
         # Determine the best move that gets closer to the food
@@ -53,7 +54,7 @@ class SmartSeekerAgent(ClassicAgent):
 
         # If no safe move is found, default to the first safe move
         if best_move is None:
-            best_move = next(iter(safe_moves.keys()), AgentAction.UP)
+            best_move = next(iter(safe_moves.keys()), SnakeAction.UP)
 
         # set the time completed
         time_completed = time.strftime('%Y-%m-%d %H:%M:%S')
@@ -62,7 +63,7 @@ class SmartSeekerAgent(ClassicAgent):
         self.current_direction = best_move
 
         # log the state, thought process, and decision
-        self.logger.log_decision(self.game_id, step, state, "", best_move, best_move, time_completed)
+        self.logger.log_decision(self.game_id, step, state, "", "", best_move, best_move, time_completed)
 
         return best_move
     
\ No newline at end of file
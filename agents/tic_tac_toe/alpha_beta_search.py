@@ -0,0 +1,342 @@
+# File: agents/tic_tac_toe/alpha_beta_search.py
+import random
+import time
+from array import array
+from environments.tic_tac_toe.win_lines import LINE_DIRECTIONS, winning_windows
+
+# the score of a win, and the scores beyond which a position is a proven win or loss
+WIN = 10 ** 9
+WIN_THRESHOLD = WIN - 10 ** 4
+
+# the transposition table entry flags: the stored value is exact, a lower bound or an upper bound
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+class SearchStats:
+    """The counters of one search."""
+
+    def __init__(self):
+        self.nodes = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.depth = 0
+        self.elapsed = 0.0
+
+        # the best move and score found at each completed depth
+        self.iterations = []
+
+    @property
+    def nodes_per_second(self) -> float:
+        """The nodes searched per second."""
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """The fraction of transposition table probes that found the position."""
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+def board_symmetries(rows, cols):
+    """
+    Return the symmetries of a rows x cols board as cell permutations: the D4 group of a square board, or the
+    identity, both flips and the half turn of a rectangular one.
+    """
+    def permutation(transform):
+        return tuple(transform(row, col) for row in range(rows) for col in range(cols))
+
+    last_row, last_col = rows - 1, cols - 1
+    symmetries = [
+        permutation(lambda row, col: row * cols + col),
+        permutation(lambda row, col: (last_row - row) * cols + col),
+        permutation(lambda row, col: row * cols + last_col - col),
+        permutation(lambda row, col: (last_row - row) * cols + last_col - col),
+    ]
+    if rows == cols:
+        symmetries += [
+            permutation(lambda row, col: col * cols + row),
+            permutation(lambda row, col: (last_col - col) * cols + last_row - row),
+            permutation(lambda row, col: col * cols + last_row - row),
+            permutation(lambda row, col: (last_col - col) * cols + row),
+        ]
+    return symmetries
+
+class AlphaBetaSearch:
+    """
+    Alpha-beta search for m,n,k games (tic tac toe on a rows x cols board, win_length in a row to win).
+
+    Cells are row-major indices, holding 0 (empty), 1 (X) or 2 (O). The search runs by iterative deepening
+    under a time budget, ordering moves by the transposition table move and then by how many winning windows
+    pass through each cell. Positions are keyed by a Zobrist hash taken in every board symmetry, the smallest
+    being the canonical key, so symmetric positions share one transposition table entry. The table has a fixed
+    number of slots and keeps the deeper entry, or the newer one once a search is over.
+
+    Scores are from the point of view of the player to move: WIN - plies for a win, plies - WIN for a loss,
+    otherwise the balance of open windows (weighted by the stones in them) when the depth runs out.
+    """
+
+    def __init__(self, rows=3, cols=3, win_length=3, tt_size=2 ** 18, use_symmetry=True, seed=0):
+        # set the board
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.num_cells = rows * cols
+        if win_length > max(rows, cols):
+            raise ValueError(f"A {rows}x{cols} board has no line of {win_length}")
+
+        # the winning windows, the windows through each cell, and the cells ordered by how many windows they are in
+        self.windows = winning_windows(rows, cols, win_length)
+        self.cell_windows = [[] for _ in range(self.num_cells)]
+        for window_index, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(window_index)
+        self.move_order = sorted(range(self.num_cells), key=lambda cell: -len(self.cell_windows[cell]))
+
+        # the cells on either side of each cell in the four line directions, nearest first, for the win check
+        self.rays = [self.cell_rays(cell) for cell in range(self.num_cells)]
+
+        # the weight of a window holding only one player's stones, by the number of stones
+        self.window_weights = [0] + [10 ** (stones - 1) for stones in range(1, win_length + 1)]
+
+        # the symmetries, the inverse of each, and the Zobrist keys (63 bits, to fit a signed array)
+        self.symmetries = board_symmetries(rows, cols) if use_symmetry else board_symmetries(rows, cols)[:1]
+        self.inverse_symmetries = []
+        for symmetry in self.symmetries:
+            inverse = [0] * self.num_cells
+            for cell, image in enumerate(symmetry):
+                inverse[image] = cell
+            self.inverse_symmetries.append(tuple(inverse))
+        rng = random.Random(seed)
+        self.zobrist = [(0, rng.getrandbits(63), rng.getrandbits(63)) for _ in range(self.num_cells)]
+        self.side_key = rng.getrandbits(63)
+
+        # the transposition table, in fixed size arrays (a depth of -1 marks an empty slot)
+        self.tt_size = 1 << max(1, (tt_size - 1).bit_length())
+        self.tt_mask = self.tt_size - 1
+        self.tt_keys = array('q', bytes(8 * self.tt_size))
+        self.tt_depths = array('h', [-1]) * self.tt_size
+        self.tt_values = array('q', bytes(8 * self.tt_size))
+        self.tt_flags = array('b', bytes(self.tt_size))
+        self.tt_moves = array('h', bytes(2 * self.tt_size))
+        self.tt_ages = array('H', bytes(2 * self.tt_size))
+        self.age = 0
+
+    def cell_rays(self, cell):
+        """Return, for each line direction, the cells forward and backward of a cell up to win_length - 1 away."""
+        row, col = divmod(cell, self.cols)
+        rays = []
+        for delta_row, delta_col in LINE_DIRECTIONS:
+            directions = []
+            for sign in (1, -1):
+                ray = []
+                for step in range(1, self.win_length):
+                    ray_row, ray_col = row + sign * step * delta_row, col + sign * step * delta_col
+                    if not (0 <= ray_row < self.rows and 0 <= ray_col < self.cols):
+                        break
+                    ray.append(ray_row * self.cols + ray_col)
+                directions.append(ray)
+            rays.append(directions)
+        return rays
+
+    def clear(self):
+        """Empty the transposition table."""
+        self.tt_depths = array('h', [-1]) * self.tt_size
+        self.age = 0
+
+    def search(self, cells, player, time_budget=None, max_depth=None):
+        """
+        Search a position for the player to move, returning (best cell, score, stats).
+
+        The search deepens one ply at a time until the result is proven, max_depth is reached or the time
+        budget (in seconds) runs out. The first ply is always completed; a deeper iteration that runs out of
+        time is discarded. The best cell is None if the board is full or already won.
+        """
+        stats = SearchStats()
+        start = time.perf_counter()
+
+        # set up the board, the window counts and the hashes in every symmetry
+        self.cells = bytearray(cells)
+        self.empty_count = self.cells.count(0)
+        self.window_counts = ([0] * len(self.windows), [0] * len(self.windows), [0] * len(self.windows))
+        self.balance = 0
+        self.hashes = [0] * len(self.symmetries)
+        for cell, stone in enumerate(self.cells):
+            if stone:
+                self.cells[cell] = 0
+                self.empty_count += 1
+                self.place(cell, stone)
+
+        # placing the stones flipped the side to move once each, so set it to the player to move
+        if ((self.num_cells - self.empty_count) % 2 == 1) != (player == 2):
+            self.hashes = [key ^ self.side_key for key in self.hashes]
+        self.stats = stats
+        self.deadline = None
+        self.age = (self.age + 1) & 0xFFFF
+
+        # a finished game has no move
+        if self.empty_count == 0 or any(self.is_win(cell, self.cells[cell]) for cell in range(self.num_cells) if self.cells[cell]):
+            stats.elapsed = time.perf_counter() - start
+            return None, 0, stats
+
+        # deepen until the result is proven or the budget runs out
+        max_depth = self.empty_count if max_depth is None else min(max_depth, self.empty_count)
+        best_cell, best_score = None, 0
+        for depth in range(1, max_depth + 1):
+            self.root_cell = None
+            try:
+                score = self.negamax(depth, 0, -WIN - 1, WIN + 1, player)
+            except SearchTimeout:
+                break
+            finally:
+                # start the time budget once the first ply is complete
+                if time_budget is not None:
+                    self.deadline = start + time_budget
+            best_cell, best_score = self.root_cell, score
+            stats.depth = depth
+            stats.iterations.append((depth, best_cell, best_score))
+
+            # a win or loss within the searched depth is proven (one found further off through the table may
+            # still have a quicker alternative)
+            if WIN - abs(score) <= depth or (self.deadline is not None and time.perf_counter() > self.deadline):
+                break
+
+        stats.elapsed = time.perf_counter() - start
+        return best_cell, best_score, stats
+
+    def place(self, cell, player):
+        """Put a stone on the board, updating the window counts, the balance and the hashes."""
+        self.cells[cell] = player
+        self.empty_count -= 1
+        mine, theirs = self.window_counts[player], self.window_counts[3 - player]
+        weights = self.window_weights
+        sign = 1 if player == 1 else -1
+        for window in self.cell_windows[cell]:
+            # the window counts for the player only while the opponent has no stone in it
+            if theirs[window] == 0:
+                self.balance += sign * (weights[mine[window] + 1] - weights[mine[window]])
+            elif mine[window] == 0:
+                self.balance += sign * weights[theirs[window]]
+            mine[window] += 1
+        side_key = self.side_key
+        hashes = self.hashes
+        for index, symmetry in enumerate(self.symmetries):
+            hashes[index] ^= self.zobrist[symmetry[cell]][player] ^ side_key
+
+    def remove(self, cell, player):
+        """Take a stone off the board, undoing place."""
+        self.cells[cell] = 0
+        self.empty_count += 1
+        mine, theirs = self.window_counts[player], self.window_counts[3 - player]
+        weights = self.window_weights
+        sign = 1 if player == 1 else -1
+        for window in self.cell_windows[cell]:
+            mine[window] -= 1
+            if theirs[window] == 0:
+                self.balance -= sign * (weights[mine[window] + 1] - weights[mine[window]])
+            elif mine[window] == 0:
+                self.balance -= sign * weights[theirs[window]]
+        side_key = self.side_key
+        hashes = self.hashes
+        for index, symmetry in enumerate(self.symmetries):
+            hashes[index] ^= self.zobrist[symmetry[cell]][player] ^ side_key
+
+    def is_win(self, cell, player):
+        """Check whether the stone on a cell completes a line for its player."""
+        cells = self.cells
+        needed = self.win_length - 1
+        for forward, backward in self.rays[cell]:
+            count = 0
+            for ray_cell in forward:
+                if cells[ray_cell] != player:
+                    break
+                count += 1
+            for ray_cell in backward:
+                if cells[ray_cell] != player:
+                    break
+                count += 1
+            if count >= needed:
+                return True
+        return False
+
+    def negamax(self, depth, ply, alpha, beta, player):
+        """Return the score of the position for the player to move, searching depth plies."""
+        stats = self.stats
+        stats.nodes += 1
+        if self.deadline is not None and not stats.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        # the canonical key is the smallest hash over the symmetries
+        key = min(self.hashes)
+        symmetry_index = self.hashes.index(key)
+        slot = key & self.tt_mask
+
+        # probe the transposition table
+        tt_cell = None
+        stats.tt_probes += 1
+        if self.tt_depths[slot] >= 0 and self.tt_keys[slot] == key:
+            stats.tt_hits += 1
+            tt_cell = self.inverse_symmetries[symmetry_index][self.tt_moves[slot]]
+            if self.tt_depths[slot] >= depth and ply:
+                value = self.tt_values[slot]
+                if value > WIN_THRESHOLD:
+                    value -= ply
+                elif value < -WIN_THRESHOLD:
+                    value += ply
+                flag = self.tt_flags[slot]
+                if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                    return value
+
+        # out of depth, score the open windows
+        if depth == 0:
+            return self.balance if player == 1 else -self.balance
+
+        # the table move first, then the empty cells in the most lines
+        cells = self.cells
+        moves = [cell for cell in self.move_order if not cells[cell]]
+        if tt_cell is not None and not cells[tt_cell]:
+            moves.remove(tt_cell)
+            moves.insert(0, tt_cell)
+
+        alpha_original = alpha
+        best_score = -WIN - 1
+        best_cell = moves[0]
+        for cell in moves:
+            self.place(cell, player)
+            try:
+                if self.is_win(cell, player):
+                    score = WIN - ply - 1
+                elif self.empty_count == 0:
+                    score = 0
+                else:
+                    score = -self.negamax(depth - 1, ply + 1, -beta, -alpha, 3 - player)
+            finally:
+                self.remove(cell, player)
+
+            if score > best_score:
+                best_score, best_cell = score, cell
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        # remember the root move
+        if ply == 0:
+            self.root_cell = best_cell
+
+        # store the result, replacing an entry from an older search or one searched no deeper
+        if self.tt_depths[slot] < 0 or self.tt_ages[slot] != self.age or self.tt_depths[slot] <= depth:
+            value = best_score
+            if value > WIN_THRESHOLD:
+                value += ply
+            elif value < -WIN_THRESHOLD:
+                value -= ply
+            self.tt_keys[slot] = key
+            self.tt_depths[slot] = depth
+            self.tt_values[slot] = value
+            self.tt_flags[slot] = UPPER if best_score <= alpha_original else LOWER if best_score >= beta else EXACT
+            self.tt_moves[slot] = self.symmetries[symmetry_index][best_cell]
+            self.tt_ages[slot] = self.age
+
+        return best_score
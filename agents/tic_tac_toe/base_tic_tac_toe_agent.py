@@ -1,67 +1,94 @@
 import numpy as np
 import random
+from agents.tic_tac_toe.bitboard import EMPTY_ACTIONS, ONGOING, OUTCOMES, SHIFTS, THREATS, marks, occupied, pack, pack_array, unpack
+from environments.tic_tac_toe.tic_tac_toe_observation import TicTacToeObservation
 
 class BaseTicTacToeAgent:
-    """Base class for Tic-Tac-Toe agents."""
-    
+    """
+    Base class for Tic-Tac-Toe agents.
+
+    The helpers take a state as a 3x3 board array, a TicTacToeObservation or a packed board (an int, see
+    agents.tic_tac_toe.bitboard), and work on the packed board with table lookups. Searches should pack the
+    board once and stay on packed boards, which apply_action returns for them without copying. Only the
+    available and random moves are found on other board sizes.
+    """
+
     action_map = {
         (0, 0): 1, (0, 1): 2, (0, 2): 3,
         (1, 0): 4, (1, 1): 5, (1, 2): 6,
         (2, 0): 7, (2, 1): 8, (2, 2): 9
     }
-    
+
     reverse_action_map = {v: k for k, v in action_map.items()}
 
+    def get_board(self, state):
+        """ Return the board array of a state, which may be an array, a TicTacToeObservation or a packed board. """
+        if isinstance(state, TicTacToeObservation):
+            return state.board
+        if isinstance(state, int):
+            return unpack(state)
+        return state
+
+    def get_bitboard(self, state) -> int:
+        """ Return the packed board of a state. """
+        if isinstance(state, int):
+            return state
+        if isinstance(state, TicTacToeObservation):
+            return pack(state.cells)
+        return pack_array(state.astype(int, copy=False))
+
     def get_random_move(self, state) -> int:
         """ Return a random valid move (number between 1 and 9) from the current state. """
-        empty_positions = [(r, c) for r in range(3) for c in range(3) if state[r, c] == 0]
-        if empty_positions:
-            row, col = random.choice(empty_positions)
-            return self.action_map[(row, col)]
+        # the empty cells in board order, so the choice matches a scan of the rows
+        empty_actions = self.get_available_actions(state)
+        if empty_actions:
+            return random.choice(empty_actions)
         return None
-    
+
     def is_terminal(self, state) -> bool:
         """ Check if the game is in a terminal state (win or draw). """
-        return self.get_winner(state) is not None or not np.any(state == 0)
-    
+        return OUTCOMES[self.get_bitboard(state)] != ONGOING
+
     def get_winner(self, state):
         """ Return the winner if there's one. Returns 1 for 'X', 2 for 'O', and None for no winner. """
-        for player in [1, 2]:
-            if self.find_winning_move(state, player):
-                return player
-        return None if np.any(state == 0) else 0  # 0 indicates a draw
-    
+        # the first player with a winning move, else 0 on a full board (a draw), looked up for the packed board
+        outcome = OUTCOMES[self.get_bitboard(state)]
+        return None if outcome == ONGOING else outcome
+
     def find_winning_move(self, state, player):
         """ Check for a winning move for the player and return the action if it exists. """
-        # Check rows, columns, diagonals
-        for row in range(3):
-            if np.sum(state[row, :] == player) == 2 and np.sum(state[row, :] == 0) == 1:
-                col = np.where(state[row, :] == 0)[0][0]
-                return self.action_map[(row, col)]
-        for col in range(3):
-            if np.sum(state[:, col] == player) == 2 and np.sum(state[:, col] == 0) == 1:
-                row = np.where(state[:, col] == 0)[0][0]
-                return self.action_map[(row, col)]
-        if np.sum(np.diag(state) == player) == 2 and np.sum(np.diag(state) == 0) == 1:
-            diag_index = np.where(np.diag(state) == 0)[0][0]
-            return self.action_map[(diag_index, diag_index)]
-        if np.sum(np.diag(np.fliplr(state)) == player) == 2 and np.sum(np.diag(np.fliplr(state)) == 0) == 1:
-            anti_diag_index = np.where(np.diag(np.fliplr(state)) == 0)[0][0]
-            return self.action_map[(anti_diag_index, 2 - anti_diag_index)]
+        # Check the lines holding two of the player's marks (rows, columns, diagonals) for an empty third cell
+        packed = self.get_bitboard(state)
+        taken = occupied(packed)
+        for bit, action in THREATS[marks(packed, player)]:
+            if not taken & bit:
+                return action
         return None
 
     def get_available_actions(self, state) -> list:
         """ Return available actions based on the current state. """
-        empty_positions = [(r, c) for r in range(3) for c in range(3) if state[r, c] == 0]
-        return [self.action_map[(r, c)] for (r, c) in empty_positions]
+        # boards other than 3x3 list their empty cells directly
+        if isinstance(state, TicTacToeObservation) and len(state.cells) != 9:
+            return list(state.valid_actions)
+        if isinstance(state, np.ndarray) and state.size != 9:
+            return [int(cell) + 1 for cell in np.flatnonzero(state.ravel() == 0)]
+        return list(EMPTY_ACTIONS[occupied(self.get_bitboard(state))])
 
     def apply_action(self, state, action, player):
-        """ Apply an action to the board and return the resulting state. """
+        """ Apply an action to the board and return the resulting state, of the same kind as the state. """
         row, col = self.reverse_action_map[action]
+        bit = 1 << (action - 1)
+        packed = self.get_bitboard(state)
 
-        if state[row, col] != 0:
+        if occupied(packed) & bit:
             raise ValueError(f"Invalid move: Cell ({row}, {col}) is already occupied.")
 
+        # a packed board returns the next packed board, an observation the next observation
+        if isinstance(state, int):
+            return packed | bit << SHIFTS[player]
+        if isinstance(state, TicTacToeObservation):
+            return state.apply_action(action, player)
+
         new_state = np.copy(state)
         new_state[row, col] = player
         return new_state
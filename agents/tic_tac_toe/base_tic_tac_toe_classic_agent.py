@@ -1,7 +1,8 @@
-import numpy as np
 import time
 from agents.base_agent import BaseAgent
 from agents.tic_tac_toe.base_tic_tac_toe_agent import BaseTicTacToeAgent
+from agents.tic_tac_toe.bitboard import ternary_index
+from agents.tic_tac_toe.tactics_table import FORK, load_table
 
 class BaseTicTacToeClassicAgent(BaseAgent, BaseTicTacToeAgent):
     def __init__(self, id: str, name: str, description: str, player=1):
@@ -11,6 +12,9 @@ class BaseTicTacToeClassicAgent(BaseAgent, BaseTicTacToeAgent):
         # set the player
         self.player = player
 
+        # the tactics table, memory-mapped and shared by every agent
+        self.tactics = load_table()
+
     @property
     def agent_type(self) -> str:
         raise NotImplementedError("This should be implemented by child classes.")
@@ -27,23 +31,23 @@ class BaseTicTacToeClassicAgent(BaseAgent, BaseTicTacToeAgent):
         Returns:
         - The action (1-9) that sets up a two-way win, or None if no such move exists.
         """
-        available_actions = self.get_available_actions(state)
-        for action in available_actions:
-            # Apply the action for the player
-            new_state = self.apply_action(state, action, player)
-            
-            # Check how many winning moves the player would have on the next turn
-            win_count = 0
-            for next_action in self.get_available_actions(new_state):
-                next_state = self.apply_action(new_state, next_action, player)
-                if self.find_winning_move(next_state, player):
-                    win_count += 1
-                
-                # If the player has at least 2 winning moves, this is a two-way win
-                if win_count >= 2:
-                    return action  # This move sets up a two-way win
-        
-        return None  # No two-way win setup found
+        # looked up in the tactics table
+        return self.find_tactic(state, player, FORK)
+
+    def find_tactic(self, state, player: int, column: int) -> int:
+        """
+        Look up a move of the player in the tactics table (see agents.tic_tac_toe.tactics_table).
+
+        Args:
+        - state: The current game board, as any state get_bitboard accepts.
+        - player: The player to move (1 or 2).
+        - column: The move to look up (WIN, THREAT or FORK).
+
+        Returns:
+        - The action (1-9), or None if the player has no such move.
+        """
+        action = self.tactics[ternary_index(self.get_bitboard(state)), player - 1, column]
+        return int(action) if action else None
 
 
     def generate_thought_process(self, step: int, state, current_player: int, winning_move: int = None, blocking_move: int = None) -> str:
@@ -51,13 +55,15 @@ class BaseTicTacToeClassicAgent(BaseAgent, BaseTicTacToeAgent):
         Generates a clear and structured thought process for decision-making.
         """
         # Analyze the current board
-        player_1_positions = [(r, c) for r in range(3) for c in range(3) if state[r, c] == 1]
-        player_2_positions = [(r, c) for r in range(3) for c in range(3) if state[r, c] == 2]
+        board = self.get_board(state)
+        rows, cols = board.shape
+        player_1_positions = [(r, c) for r in range(rows) for c in range(cols) if board[r, c] == 1]
+        player_2_positions = [(r, c) for r in range(rows) for c in range(cols) if board[r, c] == 2]
 
         thought_process = (
             f"Step {step}:\n"
             f"Board analysis for Player {current_player}:\n"
-            f"{state}\n"
+            f"{board}\n"
             f"Player 1 (X) positions: {player_1_positions}\n"
             f"Player 2 (O) positions: {player_2_positions}\n"
             f"---\n"
@@ -74,10 +80,12 @@ class BaseTicTacToeClassicAgent(BaseAgent, BaseTicTacToeAgent):
         if blocking_move:
             thought_process += f"Player {current_player} needs to block Player {2 if current_player == 1 else 1} at position {blocking_move}.\n"
 
-        # Two-way win analysis
+        # Two-way win analysis (the line checks are for the 3x3 board)
         thought_process += "2. Checking for advanced strategies (two-way wins)...\n"
-        two_way_win_setup = self.check_potential_two_way_win(state, current_player)
-        if two_way_win_setup:
+        two_way_win_setup = self.check_potential_two_way_win(state, current_player) if board.shape == (3, 3) else None
+        if board.shape != (3, 3):
+            thought_process += "Two-way win analysis is only done on the 3x3 board.\n"
+        elif two_way_win_setup:
             thought_process += f"Player {current_player} can set up a two-way win by moving to position {two_way_win_setup}.\n"
         else:
             thought_process += "No two-way win opportunity found.\n"
@@ -0,0 +1,45 @@
+# File: agents/tic_tac_toe/batch_rollouts.py
+"""
+Random rollouts of a tic tac toe position played as one NumPy batch.
+
+A random playout fills the empty cells in a uniformly random order, the players taking turns, and ends when a
+player completes a line. So every game of the batch is drawn at once as a random permutation of the empty
+cells (the ply each is filled at), and the win-line matrix gives the ply each line is completed at: the last
+of its three cells, if one player holds all of them. The first line completed decides the game, and a game
+without one is a draw.
+"""
+import numpy as np
+from agents.tic_tac_toe.bitboard import LINES, SHIFTS
+
+# the win-line matrix: the cells (0-8) of each line, one line per row
+WIN_LINES = np.array(LINES)
+
+# the ply of the cells already on the board, before any rollout move
+PLACED = -1
+
+# the ply of a line that is never completed
+NEVER = 9
+
+def batch_rollout(board, player, count, rng) -> np.ndarray:
+    """
+    Play count random games from a packed board with player to move (the game must not be over), returning
+    how many ended in a draw, a win for X and a win for O, as an array indexed by the winner.
+    """
+    # the owner and the ply of every cell, the empty cells filled in a random order per game
+    marks = np.array([1 if board >> cell & 1 else 2 if board >> (cell + SHIFTS[2]) & 1 else 0 for cell in range(9)])
+    empty = np.flatnonzero(marks == 0)
+    plies = np.full((count, 9), PLACED)
+    plies[:, empty] = rng.permuted(np.broadcast_to(np.arange(len(empty)), (count, len(empty))), axis=1)
+    owners = np.broadcast_to(marks, (count, 9)).copy()
+    owners[:, empty] = np.where(plies[:, empty] % 2 == 0, player, 3 - player)
+
+    # the ply each line is completed at, if one player holds all of its cells
+    line_owners = owners[:, WIN_LINES]
+    held = (line_owners[:, :, 0] == line_owners[:, :, 1]) & (line_owners[:, :, 1] == line_owners[:, :, 2])
+    completed = np.where(held, plies[:, WIN_LINES].max(axis=2), NEVER)
+
+    # the first line completed decides the game
+    first_line = completed.argmin(axis=1)
+    games = np.arange(count)
+    winners = np.where(completed[games, first_line] < NEVER, line_owners[games, first_line, 0], 0)
+    return np.bincount(winners, minlength=3)
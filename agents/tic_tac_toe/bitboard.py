@@ -0,0 +1,99 @@
+# File: agents/tic_tac_toe/bitboard.py
+"""
+A 3x3 tic tac toe board packed into one int: X's cells in bits 0-8 and O's cells in bits 9-17, cell i
+(action i + 1) being bit i of each. Packed boards are immutable and hashable, so searches can key their
+trees on them directly.
+
+The tables are indexed by a 9-bit mask of one player's cells (or of the occupied cells).
+"""
+import numpy as np
+
+# the mask of all nine cells, and the shift of each player's cells
+FULL = 0x1FF
+SHIFTS = (None, 0, 9)
+
+# the cells (0-8) of each line, in the order the agents check them: rows, columns, diagonal, anti-diagonal
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+LINE_MASKS = tuple((1 << a) | (1 << b) | (1 << c) for a, b, c in LINES)
+
+# WINS[mask]: whether the cells complete a line
+WINS = bytes(any(mask & line == line for line in LINE_MASKS) for mask in range(FULL + 1))
+
+def line_threats(mask):
+    """The (bit, action) of the third cell of every line where the cells hold exactly two, in line order."""
+    threats = []
+    for line, line_mask in zip(LINES, LINE_MASKS):
+        held = mask & line_mask
+        if bin(held).count("1") == 2:
+            third = (line_mask ^ held).bit_length() - 1
+            threats.append((1 << third, third + 1))
+    return tuple(threats)
+
+# THREATS[mask]: the lines the cells could complete with one more mark, if the third cell is empty
+THREATS = tuple(line_threats(mask) for mask in range(FULL + 1))
+
+# EMPTY_ACTIONS[occupied]: the actions (1-9) of the empty cells, in ascending order
+EMPTY_ACTIONS = tuple(tuple(cell + 1 for cell in range(9) if not occupied >> cell & 1) for occupied in range(FULL + 1))
+
+# the outcome of a board by the agents' get_winner: the first player (X, then O) with a line they can
+# complete next move, else a draw on a full board, else ONGOING
+ONGOING = 3
+
+def build_outcomes():
+    """Return OUTCOMES, indexed by packed board, for every pair of X and O masks at once."""
+    x_masks = np.arange(FULL + 1)[:, None]
+    o_masks = np.arange(FULL + 1)[None, :]
+    taken = x_masks | o_masks
+    popcount = np.array([bin(mask).count("1") for mask in range(FULL + 1)])
+
+    # a player threatens a line holding two of their marks and no other
+    def threatens(mine):
+        threat = np.zeros((FULL + 1, FULL + 1), dtype=bool)
+        for line_mask in LINE_MASKS:
+            threat |= (popcount[mine & line_mask] == 2) & (popcount[taken & line_mask] == 2)
+        return threat
+
+    outcomes = np.where(taken == FULL, 0, ONGOING)
+    outcomes = np.where(threatens(o_masks), 2, outcomes)
+    outcomes = np.where(threatens(x_masks), 1, outcomes)
+
+    # packed boards put O's mask above X's, so index by (O, X)
+    return outcomes.T.astype(np.uint8).tobytes()
+
+# OUTCOMES[packed]: 1 or 2 for the winner, 0 for a draw, ONGOING otherwise (boards with both marks on a cell included)
+OUTCOMES = build_outcomes()
+
+# TERNARY[mask]: the base 3 weight of the cells, cell 0 most significant (the index of the solved table)
+TERNARY = tuple(sum(3 ** (8 - cell) for cell in range(9) if mask >> cell & 1) for mask in range(FULL + 1))
+
+def pack(cells) -> int:
+    """Pack 9 cells (0 = empty, 1 = X, 2 = O), in action order, into a board."""
+    packed = 0
+    for cell, mark in enumerate(cells):
+        if mark:
+            packed |= 1 << (cell + SHIFTS[mark])
+    return packed
+
+def pack_array(board) -> int:
+    """Pack a 3x3 board array."""
+    return pack(board.ravel().tolist())
+
+def unpack(packed) -> np.ndarray:
+    """Unpack a board into a 3x3 array."""
+    return np.array([1 if packed >> cell & 1 else 2 if packed >> (cell + 9) & 1 else 0 for cell in range(9)]).reshape(3, 3)
+
+def ternary_index(packed) -> int:
+    """The base 3 index of a board (0 = empty, 1 = X, 2 = O)."""
+    return TERNARY[packed & FULL] + 2 * TERNARY[packed >> 9]
+
+def marks(packed, player) -> int:
+    """The 9-bit mask of a player's cells."""
+    return packed >> SHIFTS[player] & FULL
+
+def occupied(packed) -> int:
+    """The 9-bit mask of the occupied cells."""
+    return (packed | packed >> 9) & FULL
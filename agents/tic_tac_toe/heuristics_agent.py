@@ -1,6 +1,7 @@
 import time
 from agents.agent_type import AgentType
 from agents.tic_tac_toe.base_tic_tac_toe_classic_agent import BaseTicTacToeClassicAgent
+from agents.tic_tac_toe.tactics_table import FORK, THREAT
 
 class HeuristicsTicTacToeAgent(BaseTicTacToeClassicAgent):
     
@@ -19,16 +20,8 @@ class HeuristicsTicTacToeAgent(BaseTicTacToeClassicAgent):
         
         Returns the move that sets up the two-way win if found, otherwise None.
         """
-        for action in self.get_available_actions(state):
-            new_state = self.apply_action(state, action, self.player)
-            win_count = 0
-            for next_action in self.get_available_actions(new_state):
-                next_state = self.apply_action(new_state, next_action, self.player)
-                if self.find_winning_move(next_state, self.player):
-                    win_count += 1
-                if win_count >= 2:
-                    return action  # Return the move that creates two winning options
-        return None  # No two-way win found
+        # looked up in the tactics table
+        return self.find_tactic(state, self.player, FORK)
 
     
     def get_action(self, step: int, state, rendered_state: str, current_player: int) -> int:
@@ -38,28 +31,29 @@ class HeuristicsTicTacToeAgent(BaseTicTacToeClassicAgent):
         # initialize
         best_move = None
 
+        # look the moves up for the packed board
+        board = self.get_bitboard(state)
+
         # 1. Winning move
-        for action in self.get_available_actions(state):
-            new_state = self.apply_action(state, action, self.player)
-            if self.find_winning_move(new_state, self.player):
-                best_move = action
-                rationale += f"Found a winning move at position {best_move}.\n"
-                break
+        # (the first move after which the player has a winning move: THREAT rather than WIN on purpose, as
+        # the agent has always looked one move further here, and the table keeps its decisions unchanged)
+        threat_move = self.find_tactic(board, self.player, THREAT)
+        if threat_move:
+            best_move = threat_move
+            rationale += f"Found a winning move at position {best_move}.\n"
 
         # 2. Block opponent’s winning move
         if not best_move:
             opponent = 1 if self.player == 2 else 2
-            for action in self.get_available_actions(state):
-                new_state = self.apply_action(state, action, opponent)
-                if self.find_winning_move(new_state, opponent):
-                    best_move = action
-                    rationale += f"Blocking opponent's winning move at position {best_move}.\n"
-                    break
+            blocking_move = self.find_tactic(board, opponent, THREAT)
+            if blocking_move:
+                best_move = blocking_move
+                rationale += f"Blocking opponent's winning move at position {best_move}.\n"
 
         # 3. Set up a two-way win
         if not best_move:
             rationale += "Checking if a two-way win can be set up...\n"
-            two_way_win_move = self.check_two_way_win(state)
+            two_way_win_move = self.check_two_way_win(board)
             if two_way_win_move:
                 best_move = two_way_win_move
                 rationale += f"Setting up a two-way win with move at position {best_move}.\n"
@@ -67,7 +61,7 @@ class HeuristicsTicTacToeAgent(BaseTicTacToeClassicAgent):
         # If no best move is found, fallback to a random move from available options
         if best_move is None:
             rationale += "No immediate winning or blocking move was found. Falling back to a random move based on available options.\n"
-            best_move = self.get_random_move(state)
+            best_move = self.get_random_move(board)
 
         # Log the decision with the final best move and rationale
         self.log_decision_with_thoughts(step, state, rendered_state, current_player, best_move, rationale)
@@ -28,4 +28,4 @@ class HumanAgent(BaseTicTacToeClassicAgent):
 
     def is_move_valid(self, state, action):
         row, col = self.reverse_action_map[action]
-        return state[row, col] == 0
+        return self.get_board(state)[row, col] == 0
@@ -1,19 +1,29 @@
-import random
 import time
-import numpy as np
-import math
-from collections import defaultdict
 from agents.agent_type import AgentType
 from agents.tic_tac_toe.base_tic_tac_toe_classic_agent import BaseTicTacToeClassicAgent
+from agents.tic_tac_toe.mcts_tree import MCTSTree
+from agents.tic_tac_toe.root_parallel_mcts import RootParallelMCTS
 
 class MonteCarloTreeSearchTicTacToeAgent(BaseTicTacToeClassicAgent):
-    def __init__(self, id: str, name: str, description: str, player=2, simulations=10000, exploration_weight=0.5):
+    def __init__(self, id: str, name: str, description: str, player=2, simulations=10000, exploration_weight=0.5, max_nodes=100000, time_budget=None, early_stop=False, workers=1, rollouts_per_leaf=1):
         super().__init__(id, name, description, player)
-        self.simulations = simulations  # Number of simulations for MCTS
+        self.simulations = simulations  # Number of simulations for MCTS (None for no limit, with a time budget)
         self.exploration_weight = exploration_weight  # Exploration constant for UCT
-        self.state_visits = defaultdict(int)  # Store visit counts for each state
-        self.state_wins = defaultdict(float)  # Store win counts for each state
-        self.state_children = {}  # Store the possible actions (children) for each state
+
+        # the anytime mode: seconds per move (None for no deadline), and whether to stop once the best move is decisive
+        self.time_budget = time_budget
+        self.early_stop = early_stop
+        if simulations is None and time_budget is None:
+            raise ValueError("The MCTS agent needs a number of simulations or a time budget.")
+
+        # the stats of the last search
+        self.last_stats = None
+
+        # the search tree, kept across moves and games and evicted past max_nodes nodes, or with several workers
+        # one tree per worker process, searched in parallel from the root
+        self.workers = workers
+        self.rollouts_per_leaf = rollouts_per_leaf  # random games played from each new leaf, batched with NumPy past one
+        self.searcher = MCTSTree(exploration_weight, max_nodes, rollouts_per_leaf) if workers == 1 else RootParallelMCTS(workers, exploration_weight, max_nodes, rollouts_per_leaf)
 
     @property
     def agent_type(self) -> AgentType:
@@ -23,15 +33,15 @@ class MonteCarloTreeSearchTicTacToeAgent(BaseTicTacToeClassicAgent):
         # Set the rationale
         rationale = "Using Monte Carlo Tree Search to evaluate moves.\n"
 
-        # Run simulations and select the best action
-        for _ in range(self.simulations):
-            self.run_simulation(state)
-
-        # Get the best move
-        best_move = self.best_action(state)
+        # search from the node of the position, reusing what earlier searches learned about it
+        start = time.perf_counter()
+        best_move, stats = self.searcher.decide(self.get_bitboard(state), current_player, self.simulations, self.time_budget, self.early_stop)
+        self.last_stats = stats
+        latency = time.perf_counter() - start
 
         # Set the rationale
-        rationale += f"Ran {self.simulations} simulations. Best move selected with the highest win rate is at position {best_move}.\n"
+        rationale += f"Ran {stats.simulations} simulations on top of {stats.reused} reused ones, over {self.workers} worker(s) with {self.rollouts_per_leaf} rollout(s) per leaf, in {stats.elapsed:.3f}s ({stats.simulations_per_second:,.0f} simulations/s), stopped by the {stats.stop_reason}.\n"
+        rationale += f"Best move selected with the highest win rate is at position {best_move}, decided in {latency * 1000:.1f}ms.\n"
 
         # If no best move is found, fallback to a random move
         if best_move is None:
@@ -43,101 +53,3 @@ class MonteCarloTreeSearchTicTacToeAgent(BaseTicTacToeClassicAgent):
 
         # Return the move
         return best_move
-
-    def run_simulation(self, state):
-        """Run a single MCTS simulation: Selection, Expansion, Simulation, and Backpropagation."""
-        path = []
-        current_player = self.player
-        state_copy = np.copy(state)
-
-        # Selection: Traverse the tree based on UCB until we reach an unexplored state
-        while self.is_fully_expanded(state_copy) and state_copy.tostring() in self.state_children:
-            action, state_copy = self.select(state_copy)
-            path.append((state_copy.tostring(), action))
-            current_player = 2 if current_player == 1 else 1  # Switch player
-
-        # Expansion: Add new child states to the tree if we encounter an unexplored state
-        if not self.is_terminal(state_copy):
-            action = self.expand(state_copy, current_player)
-            state_copy = self.apply_action(state_copy, action, current_player)
-            path.append((state_copy.tostring(), action))
-
-        # Simulation: Play out the game randomly from the new state
-        winner = self.simulate_game(state_copy, current_player)
-
-        # Backpropagation: Update the nodes in the path with the result of the simulation
-        self.backpropagate(path, winner)
-
-    def is_fully_expanded(self, state) -> bool:
-        """Check if all possible actions have been explored from this state."""
-        return state.tostring() in self.state_children and len(self.state_children[state.tostring()]) == len(self.get_available_actions(state))
-
-    def select(self, state):
-        """Use Upper Confidence Bound (UCB) to select the best child."""
-        best_ucb = -float('inf')
-        best_action = None
-        best_state = None
-        total_visits = sum(self.state_visits[(state.tostring(), action)] for action in self.state_children[state.tostring()])
-
-        for action in self.state_children[state.tostring()]:
-            state_after_action = self.apply_action(state, action, self.player)
-            visits = self.state_visits[(state.tostring(), action)]
-            wins = self.state_wins[(state.tostring(), action)]
-
-            if visits == 0:
-                ucb = float('inf')  # Encourage exploration of unvisited actions
-            else:
-                ucb = (wins / visits) + self.exploration_weight * math.sqrt(math.log(total_visits) / visits)
-
-            if ucb > best_ucb:
-                best_ucb = ucb
-                best_action = action
-                best_state = state_after_action
-
-        return best_action, best_state
-
-    def expand(self, state, current_player):
-        """Add unexplored actions to the tree."""
-        available_actions = self.get_available_actions(state)
-        if state.tostring() not in self.state_children:
-            self.state_children[state.tostring()] = available_actions
-
-        return random.choice(available_actions)
-
-    def simulate_game(self, state, current_player):
-        """Simulate the game randomly from the given state, terminating early for known outcomes."""
-        while not self.is_terminal(state):
-            available_actions = self.get_available_actions(state)
-            action = random.choice(available_actions)
-            state = self.apply_action(state, action, current_player)
-            current_player = 2 if current_player == 1 else 1
-
-        return self.get_winner(state)
-
-    def backpropagate(self, path, winner):
-        """Backpropagate the result of the simulation up the tree."""
-        for state_str, action in path:
-            self.state_visits[(state_str, action)] += 1
-            if winner == self.player:
-                self.state_wins[(state_str, action)] += 1
-            elif winner == 0:  # Handle draws with partial reward
-                self.state_wins[(state_str, action)] += 0.5
-
-    def best_action(self, state) -> int:
-        """Return the action with the highest win rate."""
-        best_action = None
-        best_win_rate = -float('inf')
-
-        for action in self.get_available_actions(state):
-            visits = self.state_visits[(state.tostring(), action)]
-            wins = self.state_wins[(state.tostring(), action)]
-            win_rate = wins / visits if visits > 0 else 0
-
-            if win_rate > best_win_rate:
-                best_win_rate = win_rate
-                best_action = action
-
-        # If no best action is found, fallback to a random move
-        if best_action is None:
-            best_action = self.get_random_move(state)
-        return best_action
@@ -0,0 +1,307 @@
+# File: agents/tic_tac_toe/mcts_tree.py
+import math
+import random
+import time
+import numpy as np
+from agents.tic_tac_toe.batch_rollouts import batch_rollout
+from agents.tic_tac_toe.bitboard import EMPTY_ACTIONS, FULL, SHIFTS, WINS, marks, occupied
+
+# the share of max_nodes the tree is cut back to when it grows past it, so eviction runs once in a while
+EVICT_TO = 0.75
+
+# the rollouts between checks of the time budget and of an early stop
+CHECK_INTERVAL = 128
+
+# the chance that a lead taken as decisive is wrong, bounded for each move by Hoeffding's inequality
+DECISIVE_DELTA = 0.01
+
+# why a search stopped: it ran its simulations, ran out of time, or the best move's lead was decisive
+STOP_SIMULATIONS = "simulation limit"
+STOP_TIME = "time budget"
+STOP_DECISIVE = "decisive lead"
+
+# the reward of each player (indexed by player) for each winner (0 for a draw)
+REWARDS = ((None, 0.5, 0.5), (None, 1.0, 0.0), (None, 0.0, 1.0))
+
+class MCTSStats:
+    """The counters of one search."""
+
+    def __init__(self):
+        self.simulations = 0
+        self.elapsed = 0.0
+        self.stop_reason = STOP_SIMULATIONS
+
+        # the simulations through the root from earlier searches
+        self.reused = 0
+
+    @property
+    def simulations_per_second(self) -> float:
+        """The simulations run per second."""
+        return self.simulations / self.elapsed if self.elapsed else 0.0
+
+def game_winner(board, mover):
+    """Return the mover if their last move completed a line, 0 on a full board, else None."""
+    if WINS[marks(board, mover)]:
+        return mover
+    if occupied(board) == FULL:
+        return 0
+    return None
+
+def rollout(board, player) -> int:
+    """Play random moves from a position to the end of the game, returning the winner (0 for a draw)."""
+    choice = random.choice
+    while True:
+        empty_actions = EMPTY_ACTIONS[occupied(board)]
+        if not empty_actions:
+            return 0
+        board |= 1 << (choice(empty_actions) - 1 + SHIFTS[player])
+        if WINS[board >> SHIFTS[player] & FULL]:
+            return player
+        player = 3 - player
+
+class MCTSNode:
+    """
+    A position in the search tree.
+
+    - board: the packed board (see agents.tic_tac_toe.bitboard).
+    - player: the player to move.
+    - winner: the winner if the game is over (0 for a draw), else None.
+    - children: the expanded moves, keyed by action.
+    - untried: the legal moves not expanded yet.
+    - visits: the simulations through the node.
+    - wins: their reward for the player who moved into the node (1 for a win, 0.5 for a draw).
+    """
+
+    __slots__ = ("board", "player", "winner", "children", "untried", "visits", "wins")
+
+    def __init__(self, board, player):
+        self.board = board
+        self.player = player
+        self.winner = game_winner(board, 3 - player)
+        self.children = {}
+        self.untried = list(EMPTY_ACTIONS[occupied(board)]) if self.winner is None else []
+        self.visits = 0
+        self.wins = 0.0
+
+class MCTSTree:
+    """
+    Monte Carlo tree search over one tree that is kept across moves and games.
+
+    The tree grows from the empty board, and each search starts from the node of the position to move in, so
+    the statistics gathered on earlier moves (and in earlier games through the same positions) are reused.
+    When the tree holds more than max_nodes nodes, the least visited subtrees are evicted, except for the
+    path to the position being searched. Each simulation counts as one visit, whatever its rollouts per leaf.
+    """
+
+    def __init__(self, exploration_weight=0.5, max_nodes=100000, rollouts_per_leaf=1):
+        self.exploration_weight = exploration_weight
+        self.max_nodes = max_nodes
+
+        # the random games played from each new leaf, as one NumPy batch when there are several (see
+        # agents.tic_tac_toe.batch_rollouts), the leaf's reward being their mean
+        self.rollouts_per_leaf = rollouts_per_leaf
+        self.rng = np.random.default_rng(random.getrandbits(64))
+        self.top = MCTSNode(0, 1)
+        self.size = 1
+
+        # the nodes from the top to the last position found, kept on eviction
+        self.path = [self.top]
+
+    def add_child(self, node, action) -> MCTSNode:
+        """Expand a move of a node."""
+        child = MCTSNode(node.board | 1 << (action - 1 + SHIFTS[node.player]), 3 - node.player)
+        node.children[action] = child
+        node.untried.remove(action)
+        self.size += 1
+        return child
+
+    def find(self, board, player) -> MCTSNode:
+        """
+        Return the node of a position, walking down from the empty board through the most visited children
+        on the way and adding the missing ones. A position that cannot be reached by alternating moves from the
+        empty board gets a node outside the tree.
+        """
+        node = self.top
+        path = [node]
+        while node.board != board:
+            # the most visited child whose marks are all on the board
+            next_node = None
+            for child in node.children.values():
+                if not child.board & ~board and (next_node is None or child.visits > next_node.visits):
+                    next_node = child
+
+            # else add the lowest move of the player to move that is on the board
+            if next_node is None:
+                remaining = marks(board, node.player) & ~marks(node.board, node.player)
+                if not remaining or node.winner is not None:
+                    return MCTSNode(board, player)
+                next_node = self.add_child(node, (remaining & -remaining).bit_length())
+
+            node = next_node
+            path.append(node)
+
+        if node.player != player:
+            return MCTSNode(board, player)
+        self.path = path
+        return node
+
+    def decide(self, board, player, simulations=None, time_budget=None, early_stop=False):
+        """Search a position from its node in the tree, returning the best action (or None) and the stats."""
+        root = self.find(board, player)
+        reused = root.visits
+        stats = self.search(root, simulations, time_budget, early_stop)
+        stats.reused = reused
+        return self.best_action(root), stats
+
+    def search(self, root, simulations=None, time_budget=None, early_stop=False) -> MCTSStats:
+        """
+        Run simulations from a node: selection by UCB, expansion, a random rollout and backpropagation.
+
+        The search stops after simulations, once time_budget seconds have passed, or with early_stop once the
+        best move's lead is decisive, whichever comes first (the time and the lead are checked every
+        CHECK_INTERVAL rollouts). Returns the stats of the search.
+        """
+        if simulations is None and time_budget is None:
+            raise ValueError("A search needs a number of simulations or a time budget.")
+        stats = MCTSStats()
+        start = time.perf_counter()
+        deadline = start + time_budget if time_budget is not None else None
+
+        # a node outside the tree is searched without counting toward its size
+        in_tree = root is self.path[-1]
+        interval = max(1, CHECK_INTERVAL // self.rollouts_per_leaf)
+
+        while simulations is None or stats.simulations < simulations:
+            batch = interval if simulations is None else min(interval, simulations - stats.simulations)
+            self.simulate(root, batch, in_tree)
+            stats.simulations += batch
+
+            # stop on the deadline or a decisive lead
+            if deadline is not None and time.perf_counter() >= deadline:
+                stats.stop_reason = STOP_TIME
+                break
+            if early_stop and self.is_decisive(root):
+                stats.stop_reason = STOP_DECISIVE
+                break
+
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def simulate(self, root, simulations, in_tree):
+        """Run simulations from a node, counting its new nodes toward the tree's size if it is in the tree."""
+        exploration_weight = self.exploration_weight
+        log = math.log
+        sqrt = math.sqrt
+        randrange = random.randrange
+        rollouts_per_leaf = self.rollouts_per_leaf
+
+        for _ in range(simulations):
+            # keep the tree within its node limit
+            if in_tree and self.size > self.max_nodes:
+                self.evict()
+
+            # Selection: descend through fully expanded nodes by UCB
+            node = root
+            path = [node]
+            while not node.untried and node.children:
+                log_visits = log(node.visits) if node.visits else 0.0
+                best_ucb = -1.0
+                for child in node.children.values():
+                    visits = child.visits
+                    if not visits:
+                        best_child = child
+                        break
+                    ucb = child.wins / visits + exploration_weight * sqrt(log_visits / visits)
+                    if ucb > best_ucb:
+                        best_ucb = ucb
+                        best_child = child
+                node = best_child
+                path.append(node)
+
+            # Expansion: add a random untried move
+            untried = node.untried
+            if untried:
+                action = untried.pop(randrange(len(untried)))
+                child = MCTSNode(node.board | 1 << (action - 1 + SHIFTS[node.player]), 3 - node.player)
+                node.children[action] = child
+                self.size += in_tree
+                node = child
+                path.append(node)
+
+            # Simulation: play out the game randomly unless it is over
+            winner = node.winner
+            if winner is not None:
+                rewards = REWARDS[winner]
+            elif rollouts_per_leaf == 1:
+                rewards = REWARDS[rollout(node.board, node.player)]
+            else:
+                draws, x_wins, o_wins = batch_rollout(node.board, node.player, rollouts_per_leaf, self.rng).tolist()
+                rewards = (None, (x_wins + 0.5 * draws) / rollouts_per_leaf, (o_wins + 0.5 * draws) / rollouts_per_leaf)
+
+            # Backpropagation: reward each node for the player who moved into it
+            for node in path:
+                node.visits += 1
+                node.wins += rewards[3 - node.player]
+
+    def is_decisive(self, root) -> bool:
+        """
+        Check if the best move of a node can be told apart from the rest: every move has been tried and either
+        one wins on the spot, or the best win rate is above every other move's by more than their Hoeffding
+        confidence radii at DECISIVE_DELTA.
+        """
+        if root.untried or not root.children:
+            return False
+        children = root.children.values()
+        if any(child.winner == root.player for child in children):
+            return True
+
+        # the lowest win rate the best move could have, against the highest of each other move
+        def radius(visits):
+            return math.sqrt(math.log(1 / DECISIVE_DELTA) / (2 * visits)) if visits else float('inf')
+
+        best = max(children, key=lambda child: child.wins / child.visits if child.visits else -1.0)
+        if not best.visits:
+            return False
+        lower = best.wins / best.visits - radius(best.visits)
+        return all(child is best or (child.visits and child.wins / child.visits + radius(child.visits) < lower) for child in children)
+
+    def best_action(self, root):
+        """Return the visited move of a node with the highest win rate, or None."""
+        best_action = None
+        best_win_rate = -1.0
+        for action, child in root.children.items():
+            if child.visits and child.wins / child.visits > best_win_rate:
+                best_win_rate = child.wins / child.visits
+                best_action = action
+        return best_action
+
+    def evict(self):
+        """Remove the least visited subtrees until the tree is back to EVICT_TO of max_nodes."""
+        # every child in the tree with its parent, least visited first
+        entries = []
+        stack = [self.top]
+        while stack:
+            node = stack.pop()
+            for action, child in node.children.items():
+                entries.append((child.visits, id(child), node, action, child))
+                stack.append(child)
+        entries.sort(key=lambda entry: entry[:2])
+
+        kept = set(map(id, self.path))
+        removed = set()
+        target = int(self.max_nodes * EVICT_TO)
+        for _, child_id, node, action, child in entries:
+            if self.size <= target:
+                break
+            if child_id in kept or child_id in removed:
+                continue
+
+            # detach the subtree, its move going back to the untried ones
+            del node.children[action]
+            node.untried.append(action)
+            stack = [child]
+            while stack:
+                descendant = stack.pop()
+                removed.add(id(descendant))
+                stack.extend(descendant.children.values())
+                self.size -= 1
@@ -1,44 +1,58 @@
 import time
-import random
-import numpy as np
 from agents.agent_type import AgentType
+from agents.tic_tac_toe.alpha_beta_search import AlphaBetaSearch, WIN, WIN_THRESHOLD
 from agents.tic_tac_toe.base_tic_tac_toe_classic_agent import BaseTicTacToeClassicAgent
+from agents.tic_tac_toe.bitboard import FULL, WINS, marks, occupied
+from environments.tic_tac_toe.tic_tac_toe_observation import TicTacToeObservation
 
 
 class MiniMaxTicTacToeAgent(BaseTicTacToeClassicAgent):
+    """
+    Plays the minimax move found by an alpha-beta search (see agents.tic_tac_toe.alpha_beta_search), deepening
+    until the result is proven or time_budget seconds have passed. The search keeps its transposition table
+    between moves, one search per board shape and win length.
+    """
 
-    def __init__(self, id: str, name: str, description: str, player=1):
+    def __init__(self, id: str, name: str, description: str, player=1, win_length=3, time_budget=1.0, tt_size=2 ** 18, use_symmetry=True):
         super().__init__(id, name, description, player)
 
+        # the search settings
+        self.win_length = win_length
+        self.time_budget = time_budget
+        self.tt_size = tt_size
+        self.use_symmetry = use_symmetry
+
+        # the search for each board shape, and the stats of the last search
+        self.engines = {}
+        self.last_stats = None
+
     @property
     def agent_type(self) -> AgentType:
         """Return the type of the agent."""
         return AgentType.CLASSIC
     
     def get_action(self, step: int, state, rendered_state: str, current_player: int) -> int:
-        # set the rationale
-        rationale = "Using Minimax algorithm to evaluate possible moves.\n"
+        # search the board of an observation, which also gives the marks in a row needed to win
+        win_length = state.win_length if isinstance(state, TicTacToeObservation) else self.win_length
+        state = self.get_board(state)
 
-        # initialize
-        best_move = None
-        best_score = -float('inf')
-
-        # Loop through available actions and find the best one using Minimax
-        for action in self.get_available_actions(state):
-            # get the new state and score
-            new_state = self.apply_action(state, action, self.player)
-            score = self._minimax(new_state, 0, False)
+        # set the rationale
+        rationale = "Using Minimax algorithm with alpha-beta pruning to evaluate possible moves.\n"
 
-            # add the evaluation and score
-            rationale += f"Evaluating action {action}, score: {score}.\n"
+        # search the board
+        rows, cols = state.shape
+        engine = self.get_engine(rows, cols, win_length)
+        best_cell, best_score, stats = engine.search(state.ravel().tolist(), self.player, time_budget=self.time_budget)
+        best_move = best_cell + 1 if best_cell is not None else None
+        self.last_stats = stats
 
-            # check if this the best score
-            if score > best_score:
-                best_score = score
-                best_move = action
+        # add the best move of each depth
+        for depth, cell, score in stats.iterations:
+            rationale += f"Depth {depth}: best action {cell + 1}, {self.describe_score(score)}.\n"
 
         # set the rationale
-        rationale += f"Best move determined by Minimax is at position {best_move} with score {best_score}.\n"
+        rationale += f"Best move determined by Minimax is at position {best_move} ({self.describe_score(best_score)}).\n"
+        rationale += f"Searched {stats.nodes} nodes in {stats.elapsed:.3f}s ({stats.nodes_per_second:,.0f} nodes/s), transposition table hit rate {stats.tt_hit_rate:.1%}.\n"
 
         # If no best move is found, fallback to a random move from available options
         if best_move is None:
@@ -51,8 +65,25 @@ class MiniMaxTicTacToeAgent(BaseTicTacToeClassicAgent):
         # return the best move
         return best_move
 
+    def get_engine(self, rows: int, cols: int, win_length: int) -> AlphaBetaSearch:
+        """ Return the search for a board shape and win length, creating it on first use. """
+        key = (rows, cols, win_length)
+        if key not in self.engines:
+            self.engines[key] = AlphaBetaSearch(rows, cols, min(win_length, max(rows, cols)), self.tt_size, self.use_symmetry)
+        return self.engines[key]
+
+    def describe_score(self, score: int) -> str:
+        """ Describe a search score as a win or loss in some moves, or a heuristic score. """
+        if score > WIN_THRESHOLD:
+            return f"win in {WIN - score} plies"
+        if score < -WIN_THRESHOLD:
+            return f"loss in {WIN + score} plies"
+        return f"score {score}"
+
     def _minimax(self, state, depth, is_maximizing_player) -> int:
-        """ The Minimax algorithm to calculate the best move. """
+        """ The exhaustive Minimax algorithm to calculate the best move (the reference for the solved table check). """
+        # search on packed boards
+        state = self.get_bitboard(state)
         winner = self.get_winner(state)
 
         # Terminal conditions: return scores for win, loss, or draw
@@ -82,15 +113,14 @@ class MiniMaxTicTacToeAgent(BaseTicTacToeClassicAgent):
 
     def is_terminal(self, state) -> bool:
         """Check if the game is in a terminal state (win or draw)."""
-        return self.get_winner(state) is not None or not np.any(state == 0)
+        packed = self.get_bitboard(state)
+        return self.get_winner(packed) is not None or occupied(packed) == FULL
 
     def get_winner(self, state):
         """Return the winner if there's one. Returns 1 for 'X', 2 for 'O', and None for no winner."""
+        packed = self.get_bitboard(state)
         for player in [1, 2]:
             # Check rows, columns, and diagonals for a win
-            if any(np.all(state[row, :] == player) for row in range(3)) or \
-               any(np.all(state[:, col] == player) for col in range(3)) or \
-               np.all(np.diag(state) == player) or \
-               np.all(np.diag(np.fliplr(state)) == player):
+            if WINS[marks(packed, player)]:
                 return player
-        return None if np.any(state == 0) else 0  # 0 indicates a draw
+        return None if occupied(packed) != FULL else 0  # 0 indicates a draw
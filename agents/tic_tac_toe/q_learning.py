@@ -0,0 +1,124 @@
+# File: agents/tic_tac_toe/q_learning.py
+"""
+The tic tac toe Q table, learned by tabular Q-learning in self-play on the headless TicTacToeEnv path.
+
+Boards are indexed in base 3 like the solved table (see agents.tic_tac_toe.solved_table), so the table is a
+dense 3^9 x 9 array: row index, column action - 1. A value is for the player to move, on the scale of the
+environment's rewards: 1 for a win, 0.5 for a draw, 0 for a loss. Both players learn in the same table, a
+move being scored by its reward if it ends the game and otherwise by the opponent's best reply from their
+side, discounted toward a draw: 0.5 - gamma * (max Q[next] - 0.5). Occupied cells hold ILLEGAL, below every
+value, so the best move of a board is the argmax of its row.
+
+Train the table, or check the shipped one against the solved table:
+
+    python -m agents.tic_tac_toe.q_learning
+    python -m agents.tic_tac_toe.q_learning --verify
+"""
+import argparse
+import os
+import random
+import time
+from functools import lru_cache
+import numpy as np
+from agents.tic_tac_toe.solved_table import BEST_MOVES, NUM_POSITIONS, POWERS, SCORE, UNSOLVED, load_table as load_solved_table
+from environments.tic_tac_toe.tic_tac_toe_environment import TicTacToeEnv
+
+# the shipped table
+TABLE_PATH = os.path.join(os.path.dirname(__file__), "tables", "q_tic_tac_toe.npy")
+
+# the value of occupied cells, and of the moves not learned yet (a draw)
+ILLEGAL = -1.0
+UNLEARNED = 0.5
+
+def new_table():
+    """Return a table with every legal move UNLEARNED and every occupied cell ILLEGAL."""
+    cells = np.arange(NUM_POSITIONS)[:, None] // np.array(POWERS) % 3
+    return np.where(cells == 0, UNLEARNED, ILLEGAL).astype(np.float32)
+
+def train(table, games, alpha=0.5, gamma=0.9, epsilon=1.0, seed=None):
+    """
+    Update a table with games of epsilon-greedy self-play, returning it.
+
+    Each player takes a random move with probability epsilon, else their best move, and every move is
+    updated toward its target by a step of alpha. The targets take the best reply whatever is played, so
+    the default of random moves throughout learns perfect play fastest, by reaching every position.
+    """
+    rng = random.Random(seed)
+    env = TicTacToeEnv(render_on_step=False)
+    for _ in range(games):
+        env.reset_fast()
+        index = 0
+        game_over = False
+        while not game_over:
+            # pick the move
+            player = env.current_player
+            row = table[index]
+            if rng.random() < epsilon:
+                action = rng.choice(env.get_valid_moves())
+            else:
+                action = int(row.argmax()) + 1
+            _, reward, game_over = env.step_fast(action)
+
+            # score the move by its reward, or by the opponent's best reply
+            next_index = index + player * POWERS[action - 1]
+            target = reward if game_over else UNLEARNED - gamma * (float(table[next_index].max()) - UNLEARNED)
+            row[action - 1] += alpha * (target - row[action - 1])
+            index = next_index
+    return table
+
+def save_table(table, path=TABLE_PATH):
+    """Save a table as .npy."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, table)
+
+@lru_cache(maxsize=None)
+def load_table(path=TABLE_PATH):
+    """Load a table, memory-mapped and read-only, once per path."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No tic tac toe Q table at {path}, run python -m agents.tic_tac_toe.q_learning")
+    return np.load(path, mmap_mode='r')
+
+def verify(table, solved_table):
+    """Return the number of positions of the solved table whose best move in the Q table is not a best move."""
+    indices = np.flatnonzero(solved_table[:, SCORE] != UNSOLVED)
+    actions = np.asarray(table)[indices].argmax(axis=1)
+    return int(np.count_nonzero((solved_table[indices, BEST_MOVES] >> actions & 1) == 0))
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Train or verify the tic tac toe Q table.")
+    parser.add_argument('--verify', action='store_true', help="Check the shipped table instead of training one")
+    parser.add_argument('--games', type=int, default=200000, help="Self-play games to train for")
+    parser.add_argument('--alpha', type=float, default=0.5, help="Learning rate")
+    parser.add_argument('--gamma', type=float, default=0.9, help="Discount toward a draw")
+    parser.add_argument('--epsilon', type=float, default=1.0, help="Chance of a random move")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the random moves")
+    parser.add_argument('--path', default=TABLE_PATH, help="Path of the table")
+    args = parser.parse_args()
+
+    # the positions to check against
+    solved_table = load_solved_table()
+    positions = int(np.count_nonzero(solved_table[:, SCORE] != UNSOLVED))
+
+    if args.verify:
+        mismatches = verify(load_table(args.path), solved_table)
+        print(f"Checked the table at {args.path} against the solved table: {mismatches} of {positions} positions without a best move")
+        if mismatches:
+            raise SystemExit(1)
+        return
+
+    # train, reporting the positions still without a best move as the games go
+    table = new_table()
+    rounds = 10
+    start = time.perf_counter()
+    for round_index in range(rounds):
+        train(table, args.games // rounds, args.alpha, args.gamma, args.epsilon, seed=args.seed + round_index)
+        games = (round_index + 1) * (args.games // rounds)
+        elapsed = time.perf_counter() - start
+        print(f"{games} games in {elapsed:.1f}s ({games / elapsed:,.0f} games/s): {verify(table, solved_table)} of {positions} positions without a best move")
+
+    save_table(table, args.path)
+    print(f"Saved the table to {args.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# File: agents/tic_tac_toe/q_learning_agent.py
+from agents.agent_type import AgentType
+from agents.tic_tac_toe.base_tic_tac_toe_classic_agent import BaseTicTacToeClassicAgent
+from agents.tic_tac_toe.bitboard import ternary_index
+from agents.tic_tac_toe.q_learning import TABLE_PATH, load_table
+
+class QLearningTicTacToeAgent(BaseTicTacToeClassicAgent):
+    """
+    Plays the best move of the Q table learned in self-play (see agents.tic_tac_toe.q_learning) with a single
+    lookup of the board's row.
+    """
+
+    def __init__(self, id: str, name: str, description: str, player=1, table_path=TABLE_PATH):
+        # call the parent
+        super().__init__(id, name, description, player)
+
+        # the Q table, memory-mapped and shared by every agent
+        self.table = load_table(table_path)
+
+    @property
+    def agent_type(self) -> AgentType:
+        """Return the type of the agent."""
+        return AgentType.CLASSIC
+
+    def get_action(self, step: int, state, rendered_state: str, current_player: int) -> int:
+        # look the board's row up, occupied cells being below every value
+        values = self.table[ternary_index(self.get_bitboard(state))]
+        best_move = int(values.argmax()) + 1
+        rationale = f"Looked up the learned values: move {best_move} is worth {values[best_move - 1]:.3f} (1 for a win, 0.5 for a draw, 0 for a loss).\n"
+
+        # Log decision
+        self.log_decision_with_thoughts(step, state, rendered_state, current_player, best_move, rationale)
+
+        # return the best move
+        return best_move
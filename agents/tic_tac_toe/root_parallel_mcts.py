@@ -0,0 +1,106 @@
+# File: agents/tic_tac_toe/root_parallel_mcts.py
+import multiprocessing
+import os
+import random
+import time
+import weakref
+from agents.tic_tac_toe.mcts_tree import MCTSStats, MCTSTree
+
+def worker_loop(connection, seed, exploration_weight, max_nodes, rollouts_per_leaf):
+    """
+    Serve searches on one tree until None arrives. Each request is (board, player, simulations, time_budget,
+    early_stop), answered with the visits and wins of the root's moves, the simulations run, why the search
+    stopped and the simulations reused.
+    """
+    random.seed(seed)
+    tree = MCTSTree(exploration_weight, max_nodes, rollouts_per_leaf)
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+
+        board, player, simulations, time_budget, early_stop = request
+        root = tree.find(board, player)
+        reused = root.visits
+        stats = tree.search(root, simulations, time_budget, early_stop)
+        children = {action: (child.visits, child.wins) for action, child in root.children.items()}
+        connection.send((children, stats.simulations, stats.stop_reason, reused))
+    connection.close()
+
+def shutdown(connections, processes):
+    """Ask the workers to stop, terminating any that do not."""
+    for connection in connections:
+        try:
+            connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=1)
+        if process.is_alive():
+            process.terminate()
+
+class RootParallelMCTS:
+    """
+    Root parallel Monte Carlo tree search: each worker process grows its own MCTSTree from the same position
+    with its own seed, and the visits and wins of the root's moves are summed over the workers.
+
+    The workers are started once and serve every search, keeping their trees across moves and games like a
+    single MCTSTree. The simulations of a search are split between them, while a time budget applies to each,
+    and max_nodes is shared out so the trees together hold about as many nodes as one tree would.
+    """
+
+    def __init__(self, workers, exploration_weight=0.5, max_nodes=100000, rollouts_per_leaf=1, seed=None):
+        if workers < 1:
+            raise ValueError("Root parallel MCTS needs at least one worker.")
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), 'little')
+
+        # start the workers, which stop with this object or at exit
+        self.workers = workers
+        self.connections = []
+        self.processes = []
+        for index in range(workers):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=worker_loop, args=(worker_connection, seed + index, exploration_weight, max(1, max_nodes // workers), rollouts_per_leaf), daemon=True)
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        self._finalizer = weakref.finalize(self, shutdown, self.connections, self.processes)
+
+    def decide(self, board, player, simulations=None, time_budget=None, early_stop=False):
+        """Search a position in every worker, returning the best action of the summed statistics (or None) and the stats."""
+        stats = MCTSStats()
+        start = time.perf_counter()
+
+        # each worker runs its share of the simulations
+        worker_simulations = -(-simulations // self.workers) if simulations is not None else None
+        for connection in self.connections:
+            connection.send((board, player, worker_simulations, time_budget, early_stop))
+
+        # sum the visits and wins of each move
+        totals = {}
+        stop_reasons = set()
+        for connection in self.connections:
+            children, worker_simulations_run, stop_reason, reused = connection.recv()
+            for action, (visits, wins) in children.items():
+                total_visits, total_wins = totals.get(action, (0, 0.0))
+                totals[action] = (total_visits + visits, total_wins + wins)
+            stats.simulations += worker_simulations_run
+            stats.reused += reused
+            stop_reasons.add(stop_reason)
+        stats.stop_reason = ", ".join(sorted(stop_reasons))
+        stats.elapsed = time.perf_counter() - start
+
+        # the visited move with the highest win rate, as in a single tree
+        best_action = None
+        best_win_rate = -1.0
+        for action, (visits, wins) in totals.items():
+            if visits and wins / visits > best_win_rate:
+                best_win_rate = wins / visits
+                best_action = action
+        return best_action, stats
+
+    def close(self):
+        """Stop the workers."""
+        self._finalizer()
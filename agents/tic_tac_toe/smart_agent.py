@@ -1,7 +1,7 @@
 import time
-import numpy as np
 from agents.agent_type import AgentType
 from agents.tic_tac_toe.base_tic_tac_toe_classic_agent import BaseTicTacToeClassicAgent
+from agents.tic_tac_toe.tactics_table import WIN
 
 class SmartTicTacToeAgent(BaseTicTacToeClassicAgent):
     def __init__(self, id: str, name: str, description: str, player=1):
@@ -20,8 +20,11 @@ class SmartTicTacToeAgent(BaseTicTacToeClassicAgent):
         # Initialize the best move to None
         best_move = None
 
+        # look the moves up for the packed board
+        board = self.get_bitboard(state)
+
         # Check for winning move
-        winning_move = self.find_winning_move(state, current_player)
+        winning_move = self.find_tactic(board, current_player, WIN)
 
         if winning_move:
             # Set the rationale for a winning move
@@ -30,7 +33,7 @@ class SmartTicTacToeAgent(BaseTicTacToeClassicAgent):
         else:
             # Block opponent's winning move
             opponent = 1 if current_player == 2 else 2
-            blocking_move = self.find_winning_move(state, opponent)
+            blocking_move = self.find_tactic(board, opponent, WIN)
 
             if blocking_move:
                 # Set the rationale for blocking the opponent
@@ -40,7 +43,7 @@ class SmartTicTacToeAgent(BaseTicTacToeClassicAgent):
         # If no best move is found, fallback to a random move from available options
         if best_move is None:
             rationale += "No immediate winning or blocking move was available based on the current state, so a random valid move was selected.\n"
-            best_move = self.get_random_move(state)
+            best_move = self.get_random_move(board)
 
         # Log the decision with the final best move and rationale
         self.log_decision_with_thoughts(step, state, rendered_state, current_player, best_move, rationale)
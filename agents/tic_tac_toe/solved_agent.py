@@ -0,0 +1,43 @@
+# File: agents/tic_tac_toe/solved_agent.py
+from agents.agent_type import AgentType
+from agents.tic_tac_toe.base_tic_tac_toe_classic_agent import BaseTicTacToeClassicAgent
+from agents.tic_tac_toe.solved_table import BEST_MOVES, SCORE, UNSOLVED, board_index, first_best_move, load_table, position_index
+from environments.tic_tac_toe.tic_tac_toe_observation import TicTacToeObservation
+
+class SolvedTicTacToeAgent(BaseTicTacToeClassicAgent):
+    """
+    Plays the minimax move of any position with a single lookup in the solved table
+    (see agents.tic_tac_toe.solved_table), instead of searching the game tree each move.
+    """
+
+    def __init__(self, id: str, name: str, description: str, player=1):
+        # call the parent
+        super().__init__(id, name, description, player)
+
+        # the solved table, memory-mapped and shared by every agent
+        self.table = load_table()
+
+    @property
+    def agent_type(self) -> AgentType:
+        """Return the type of the agent."""
+        return AgentType.CLASSIC
+
+    def get_action(self, step: int, state, rendered_state: str, current_player: int) -> int:
+        # look the position up
+        index = position_index(state.cells) if isinstance(state, TicTacToeObservation) else board_index(state)
+        score = int(self.table[index, SCORE])
+
+        # take the first of the best moves, as the minimax agent would
+        if score != UNSOLVED:
+            best_move = first_best_move(int(self.table[index, BEST_MOVES]))
+            rationale = f"Looked up the solved position: move {best_move} scores {score}.\n"
+        else:
+            # the position cannot be reached in a real game, so fall back to a random move
+            best_move = self.get_random_move(state)
+            rationale = "The position is not in the solved table. Falling back to a random move.\n"
+
+        # Log decision
+        self.log_decision_with_thoughts(step, state, rendered_state, current_player, best_move, rationale)
+
+        # return the best move
+        return best_move
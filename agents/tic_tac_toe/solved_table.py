@@ -0,0 +1,180 @@
+# File: agents/tic_tac_toe/solved_table.py
+"""
+The solved tic tac toe table: the minimax score and best moves of every reachable position.
+
+A position is indexed in base 3 over its cells (0 = empty, 1 = X, 2 = O), cell 0 most significant, so the
+table has 3^9 = 19683 rows. Each row holds:
+- SCORE: the score of the best move for the player to move, as MiniMaxTicTacToeAgent scores it
+  (10 - plies for a win, plies - 10 for a loss, 0 for a draw).
+- BEST_MOVES: a bitmask of the best actions, bit action - 1 set for each.
+Rows of unreachable and finished positions have the score UNSOLVED and no best moves.
+
+Regenerate the table, or check the shipped one against a fresh solve and the minimax agent:
+
+    python -m agents.tic_tac_toe.solved_table
+    python -m agents.tic_tac_toe.solved_table --verify
+"""
+import argparse
+import os
+import time
+from functools import lru_cache
+import numpy as np
+
+# the shipped table
+TABLE_PATH = os.path.join(os.path.dirname(__file__), "tables", "solved_tic_tac_toe.npy")
+
+# the columns of the table, and the score of positions that are not solved
+SCORE = 0
+BEST_MOVES = 1
+UNSOLVED = -128
+
+# the number of positions, and the base 3 weight of each cell
+NUM_POSITIONS = 3 ** 9
+POWERS = tuple(3 ** (8 - cell) for cell in range(9))
+
+# the cells of every line
+LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6),
+)
+
+def position_index(cells) -> int:
+    """Return the base 3 index of a position given as 9 cells."""
+    index = 0
+    for cell in cells:
+        index = index * 3 + cell
+    return index
+
+def board_index(board) -> int:
+    """Return the base 3 index of a 3x3 board array."""
+    return int(np.dot(board.ravel(), POWERS))
+
+def has_won(cells, player) -> bool:
+    """Check whether a player has completed a line."""
+    return any(cells[a] == player and cells[b] == player and cells[c] == player for a, b, c in LINES)
+
+def solve():
+    """
+    Solve every reachable position by negamax from the empty board, returning the table.
+
+    Each position is searched once: a child's score is taken from the table after it is solved, one ply
+    further from the end, so the scores match a full minimax from any position.
+    """
+    table = np.zeros((NUM_POSITIONS, 2), dtype=np.int16)
+    table[:, SCORE] = UNSOLVED
+    solved = bytearray(NUM_POSITIONS)
+
+    def search(cells, player):
+        # the score of the best move for the player to move (the position is not finished)
+        index = position_index(cells)
+        if solved[index]:
+            return int(table[index, SCORE])
+
+        best_score = None
+        best_moves = 0
+        for cell in range(9):
+            if cells[cell]:
+                continue
+            child = cells[:cell] + (player,) + cells[cell + 1:]
+
+            # score the move: an immediate win, a draw on a full board, or the opponent's best reply a ply later
+            if has_won(child, player):
+                score = 10
+            elif 0 not in child:
+                score = 0
+            else:
+                reply = search(child, 3 - player)
+                score = -(reply - 1) if reply > 0 else -(reply + 1) if reply < 0 else 0
+
+            # keep every move with the best score
+            if best_score is None or score > best_score:
+                best_score, best_moves = score, 1 << cell
+            elif score == best_score:
+                best_moves |= 1 << cell
+
+        table[index, SCORE] = best_score
+        table[index, BEST_MOVES] = best_moves
+        solved[index] = 1
+        return best_score
+
+    search((0,) * 9, 1)
+    return table
+
+def save_table(table, path=TABLE_PATH):
+    """Save a table as .npy."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, table)
+
+@lru_cache(maxsize=None)
+def load_table(path=TABLE_PATH):
+    """Load a table, memory-mapped and read-only, once per path."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No solved tic tac toe table at {path}, run python -m agents.tic_tac_toe.solved_table")
+    return np.load(path, mmap_mode='r')
+
+def first_best_move(best_moves: int) -> int:
+    """Return the lowest action in a best moves bitmask (the one the minimax agent picks)."""
+    return (best_moves & -best_moves).bit_length()
+
+def verify(table):
+    """
+    Check a table against MiniMaxTicTacToeAgent on every solved position, returning the number of mismatches.
+
+    The minimax agent scores each move for its own player, so every position is checked from the point of view
+    of the player to move, comparing the best score and the move the agent picks.
+    """
+    # imported here, only the check needs the agent
+    from agents.tic_tac_toe.minimax_agent import MiniMaxTicTacToeAgent
+    agents = {player: MiniMaxTicTacToeAgent(id="verify", name="Verify", description="", player=player) for player in (1, 2)}
+
+    mismatches = 0
+    for index in np.flatnonzero(table[:, SCORE] != UNSOLVED):
+        cells = tuple(int(cell) for cell in np.base_repr(int(index), 3).zfill(9))
+        board = np.array(cells).reshape(3, 3)
+        player = 1 if cells.count(1) == cells.count(2) else 2
+        agent = agents[player]
+
+        # the minimax agent's scores, the best taken in action order as get_action does
+        best_move = None
+        best_score = -float('inf')
+        for action in agent.get_available_actions(board):
+            score = agent._minimax(agent.apply_action(board, action, player), 0, False)
+            if score > best_score:
+                best_score, best_move = score, action
+
+        if best_score != table[index, SCORE] or best_move != first_best_move(int(table[index, BEST_MOVES])):
+            mismatches += 1
+            print(f"Mismatch at {cells}: minimax {best_move} ({best_score}), table {first_best_move(int(table[index, BEST_MOVES]))} ({table[index, SCORE]})")
+
+    return mismatches
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Regenerate or verify the solved tic tac toe table.")
+    parser.add_argument('--verify', action='store_true', help="Check the shipped table instead of writing it")
+    parser.add_argument('--path', default=TABLE_PATH, help="Path of the table")
+    args = parser.parse_args()
+
+    # solve every position
+    start = time.perf_counter()
+    table = solve()
+    print(f"Solved {np.count_nonzero(table[:, SCORE] != UNSOLVED)} positions in {time.perf_counter() - start:.2f}s")
+
+    if not args.verify:
+        save_table(table, args.path)
+        print(f"Saved the table to {args.path}")
+        return
+
+    # the shipped table must match a fresh solve and the minimax agent
+    shipped = np.load(args.path)
+    if not np.array_equal(shipped, table):
+        raise SystemExit(f"The table at {args.path} differs from a fresh solve, regenerate it")
+    start = time.perf_counter()
+    mismatches = verify(shipped)
+    print(f"Checked against the minimax agent in {time.perf_counter() - start:.1f}s: {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# File: agents/tic_tac_toe/tactics_table.py
+"""
+The tic tac toe tactics table: the winning, threat and fork moves of every board, for each player.
+
+Boards are indexed in base 3 like the solved table (see agents.tic_tac_toe.solved_table), and each row holds
+an action (1-9), or NONE, per player (index player - 1) and column:
+- WIN: the move completing a line, as find_winning_move finds it.
+- THREAT: the first move after which the player has a winning move, as the heuristics agent looks for one.
+- FORK: the first move setting up two winning moves, as check_potential_two_way_win finds it.
+A player's blocking move is the opponent's WIN, and their fork blocking move the opponent's FORK.
+
+Regenerate the table, or check the shipped one against a fresh build:
+
+    python -m agents.tic_tac_toe.tactics_table
+    python -m agents.tic_tac_toe.tactics_table --verify
+"""
+import argparse
+import os
+import time
+from functools import lru_cache
+import numpy as np
+from agents.tic_tac_toe.bitboard import EMPTY_ACTIONS, SHIFTS, THREATS, marks, occupied, pack
+
+# the shipped table
+TABLE_PATH = os.path.join(os.path.dirname(__file__), "tables", "tic_tac_toe_tactics.npy")
+
+# the columns of the table, and the action stored when there is no move
+WIN = 0
+THREAT = 1
+FORK = 2
+NONE = 0
+
+# the number of boards
+NUM_POSITIONS = 3 ** 9
+
+def winning_move(packed, player) -> int:
+    """The first empty cell completing one of the player's lines, or NONE."""
+    taken = occupied(packed)
+    for bit, action in THREATS[marks(packed, player)]:
+        if not taken & bit:
+            return action
+    return NONE
+
+def threat_move(packed, player) -> int:
+    """The first move after which the player has a winning move, or NONE."""
+    for action in EMPTY_ACTIONS[occupied(packed)]:
+        if winning_move(packed | 1 << (action - 1 + SHIFTS[player]), player):
+            return action
+    return NONE
+
+def fork_move(packed, player) -> int:
+    """The first move after which two of the player's next moves leave a winning move, or NONE."""
+    for action in EMPTY_ACTIONS[occupied(packed)]:
+        new_packed = packed | 1 << (action - 1 + SHIFTS[player])
+        win_count = 0
+        for next_action in EMPTY_ACTIONS[occupied(new_packed)]:
+            if winning_move(new_packed | 1 << (next_action - 1 + SHIFTS[player]), player):
+                win_count += 1
+            if win_count >= 2:
+                return action
+    return NONE
+
+def build():
+    """Build the table over every board, reachable or not."""
+    table = np.zeros((NUM_POSITIONS, 2, 3), dtype=np.uint8)
+    for index in range(NUM_POSITIONS):
+        packed = pack(int(cell) for cell in np.base_repr(index, 3).zfill(9))
+        for player in (1, 2):
+            table[index, player - 1] = (winning_move(packed, player), threat_move(packed, player), fork_move(packed, player))
+    return table
+
+def save_table(table, path=TABLE_PATH):
+    """Save a table as .npy."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, table)
+
+@lru_cache(maxsize=None)
+def load_table(path=TABLE_PATH):
+    """Load a table, memory-mapped and read-only, once per path."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No tic tac toe tactics table at {path}, run python -m agents.tic_tac_toe.tactics_table")
+    return np.load(path, mmap_mode='r')
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Regenerate or verify the tic tac toe tactics table.")
+    parser.add_argument('--verify', action='store_true', help="Check the shipped table instead of writing it")
+    parser.add_argument('--path', default=TABLE_PATH, help="Path of the table")
+    args = parser.parse_args()
+
+    # find the moves of every board
+    start = time.perf_counter()
+    table = build()
+    print(f"Built the tactics of {NUM_POSITIONS} boards in {time.perf_counter() - start:.2f}s")
+
+    if not args.verify:
+        save_table(table, args.path)
+        print(f"Saved the table to {args.path}")
+        return
+
+    # the shipped table must match a fresh build
+    shipped = np.load(args.path)
+    mismatches = int(np.count_nonzero((shipped != table).any(axis=(1, 2))))
+    print(f"Checked the table at {args.path}: {mismatches} mismatches")
+    if mismatches:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# File: benchmarks/observations.py
+"""
+Time per decision of the classic snake agents given the array state and given the structured observation.
+
+Each game is driven by the agent reading observations, and at every step a second instance of the same agent
+decides from the array state of the same position, so both are timed on identical positions. Agents that only
+decide through get_action include writing their decision log (sent to a temporary directory), which logs the
+whole state tensor for arrays and the plain values for observations.
+
+The tic tac toe agents are not timed: they pack either input into the same bitboards and decide by table
+lookups (see agents.tic_tac_toe.tactics_table), so both take the same time.
+
+    python -m benchmarks.observations
+"""
+import argparse
+import os
+import tempfile
+import time
+from agents.snake.flood_fill_agent import FloodFillAgent
+from agents.snake.food_seeker_agent import FoodSeekerAgent
+from agents.snake.hamiltonian_agent import HamiltonianAgent
+from agents.snake.smart_seeker_agent import SmartSeekerAgent
+from environments.snake.snake_environment import SnakeEnv
+
+def make_agent(agent_class, log_dir, **kwargs):
+    """Create an agent that logs to the temporary directory."""
+    agent = agent_class(id="benchmark", name="Benchmark", description="", **kwargs)
+    agent.game_id = "benchmark"
+    agent.logger.log_filename = os.path.join(log_dir, f"{agent_class.__name__}.jsonl")
+    return agent
+
+def time_snake(agent_class, decide, log_dir, size, games, seed):
+    """Return the microseconds per decision from (array state, observation) for a snake agent."""
+    env = SnakeEnv(size=size, record_history=False, copy_state=False, seed=seed)
+    array_agent = make_agent(agent_class, log_dir)
+    observation_agent = make_agent(agent_class, log_dir)
+    array_time = observation_time = 0.0
+    decisions = 0
+
+    for game in range(games):
+        state = env.reset()
+        step = 0
+        while not env.game_over:
+            # the array state, copied so the agent cannot see the next step
+            start = time.perf_counter()
+            decide(array_agent, step, state.copy())
+            array_time += time.perf_counter() - start
+
+            # the observation, which drives the game
+            start = time.perf_counter()
+            action = decide(observation_agent, step, env.get_observation())
+            observation_time += time.perf_counter() - start
+
+            state, _, _ = env.step_fast(action)
+            decisions += 1
+            step += 1
+
+    return array_time / decisions * 1e6, observation_time / decisions * 1e6
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark classic snake agents on array states and observations.")
+    parser.add_argument('--size', type=int, default=10, help="Snake board size")
+    parser.add_argument('--games', type=int, default=10, help="Games played per agent")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the games")
+    args = parser.parse_args()
+
+    # the snake agents: the search agents are timed without logging, the others through get_action
+    snake_agents = [
+        ("food seeker", FoodSeekerAgent, lambda agent, step, state: agent.get_action(step, state)),
+        ("smart seeker", SmartSeekerAgent, lambda agent, step, state: agent.get_action(step, state)),
+        ("flood fill", FloodFillAgent, lambda agent, step, state: agent.choose_action(state)),
+        ("hamiltonian", HamiltonianAgent, lambda agent, step, state: agent.choose_action(state)),
+    ]
+
+    # print the header
+    print(f"{'agent':>22} {'array us':>10} {'observation us':>15} {'speedup':>8}")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        for name, agent_class, decide in snake_agents:
+            array_us, observation_us = time_snake(agent_class, decide, log_dir, args.size, args.games, args.seed)
+            print(f"{'snake ' + name:>22} {array_us:>10.1f} {observation_us:>15.1f} {array_us / observation_us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# File: benchmarks/snake_agents.py
+"""
+Decisions per second and average final length of the classic snake agents.
+
+The flood fill agent is timed through choose_action, its decision without logging. The smart seeker only
+decides through get_action, so its time includes writing the decision log (sent to a temporary directory).
+
+    python -m benchmarks.snake_agents
+"""
+import argparse
+import os
+import tempfile
+import time
+from agents.snake.flood_fill_agent import FloodFillAgent
+from agents.snake.smart_seeker_agent import SmartSeekerAgent
+from environments.snake.snake_environment import SnakeEnv
+
+def play(decide, size, games, seed):
+    """Play games with a decision function, returning (decisions per second, average length, games won)."""
+    env = SnakeEnv(size=size, record_history=False, copy_state=False, seed=seed)
+    decisions = 0
+    decision_time = 0.0
+    lengths = []
+    won = 0
+
+    for game in range(games):
+        state = env.reset()
+        step = 0
+        while not env.game_over:
+            # time the decision only
+            start = time.perf_counter()
+            action = decide(step, state)
+            decision_time += time.perf_counter() - start
+            decisions += 1
+
+            # take the step
+            state, _, _ = env.step_fast(action)
+            step += 1
+
+        lengths.append(len(env.snake))
+        won += env.won
+
+    return decisions / decision_time, sum(lengths) / len(lengths), won
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark the classic snake agents.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20], help="Board sizes to play on")
+    parser.add_argument('--games', type=int, default=20, help="Games played per agent and board size")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the games")
+    args = parser.parse_args()
+
+    # print the header
+    print(f"{'agent':>12} {'size':>5} {'decisions/s':>12} {'avg length':>11} {'won':>4}")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        for size in args.sizes:
+            # the flood fill agent, timed without logging
+            flood_fill = FloodFillAgent(id="snake_flood_fill", name="Flood Fill Agent", description="")
+            rate, length, won = play(lambda step, state: flood_fill.choose_action(state), size, args.games, args.seed)
+            print(f"{'flood fill':>12} {size:>5} {rate:>12,.0f} {length:>11.1f} {won:>4}")
+
+            # the smart seeker, logging to the temporary directory
+            smart_seeker = SmartSeekerAgent(id="snake_smart_seeker", name="Smart Seeker Agent", description="")
+            smart_seeker.game_id = "benchmark"
+            smart_seeker.logger.log_filename = os.path.join(log_dir, "snake_smart_seeker.jsonl")
+            rate, length, won = play(smart_seeker.get_action, size, args.games, args.seed)
+            print(f"{'smart seeker':>12} {size:>5} {rate:>12,.0f} {length:>11.1f} {won:>4}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# File: benchmarks/snake_engine_parity.py
+"""
+Parity checks of the bitboard snake engine against the grid engine, followed by a step throughput
+comparison of the two.
+
+Both engines are played from the same seeds with the same actions. The engines draw food differently,
+so the bitboard game is given the grid game's food after every placement; everything else (states,
+rewards, game over, body, counters, snapshot/restore and clone) must match exactly.
+
+    python -m benchmarks.snake_engine_parity
+"""
+import argparse
+import random
+import time
+import numpy as np
+from environments.snake.snake_environment import DIRECTION_DELTAS, SnakeEnv
+
+def sync_food(source, target):
+    """Give the target game the source game's food."""
+    target.food = source.food
+    target.observation.set_food(source.food)
+
+def choose_action(env, rng):
+    """Head for the food while avoiding walls and the body, with some random moves to vary the games."""
+    head_row, head_col = env.snake[-1]
+    safe = []
+    for action in env.get_valid_actions():
+        delta_row, delta_col = DIRECTION_DELTAS[action - 1]
+        if not env.body.is_blocked(head_row + delta_row, head_col + delta_col):
+            safe.append(action)
+
+    # no safe move left, or a random move now and then
+    if not safe or rng.random() < 0.1:
+        return rng.randrange(5)
+
+    # otherwise take the safe move closest to the food
+    food_row, food_col = env.food
+    return min(safe, key=lambda action: abs(head_row + DIRECTION_DELTAS[action - 1][0] - food_row) + abs(head_col + DIRECTION_DELTAS[action - 1][1] - food_col))
+
+def assert_same(grid, bitboard, context):
+    """Check the two games are in the same state."""
+    assert list(grid.snake) == list(bitboard.snake), f"{context}: bodies differ"
+    assert grid.direction_index == bitboard.direction_index, f"{context}: directions differ"
+    assert (grid.steps, grid.steps_since_last_food) == (bitboard.steps, bitboard.steps_since_last_food), f"{context}: counters differ"
+    assert (grid.game_over, grid.won) == (bitboard.game_over, bitboard.won), f"{context}: game over differs"
+    assert np.array_equal(grid.body.occupancy_plane(), bitboard.body.occupancy_plane()), f"{context}: occupancy differs"
+    assert np.array_equal(grid.get_state(copy=True), bitboard.get_state(copy=True)), f"{context}: states differ"
+
+def check_parity(size, games, seed):
+    """Play games on both engines and check they agree step by step, returning the number of steps checked."""
+    rng = random.Random(seed)
+    grid = SnakeEnv(size=size, record_history=False, seed=seed, engine="grid")
+    bitboard = SnakeEnv(size=size, record_history=False, seed=seed, engine="bitboard")
+    checked = 0
+
+    for game in range(games):
+        # start both games from the same seed
+        grid.reset()
+        bitboard.reset(seed=grid.episode_seed)
+        sync_food(grid, bitboard)
+        assert_same(grid, bitboard, f"size {size} game {game} reset")
+
+        while not grid.game_over:
+            action = choose_action(grid, rng)
+
+            # now and then check snapshot/restore and clone of the bitboard game
+            if rng.random() < 0.05:
+                context = f"size {size} game {game} step {grid.steps}"
+                snapshot = bitboard.snapshot()
+                clone = bitboard.clone()
+
+                # the clone plays on exactly like the original
+                for _ in range(3):
+                    lookahead = rng.randrange(5)
+                    assert clone.step_fast(lookahead)[1:] == bitboard.step_fast(lookahead)[1:], f"{context}: clone differs"
+                    assert_same(clone, bitboard, f"{context} clone")
+
+                # and restoring the snapshot undoes the lookahead
+                bitboard.restore(snapshot)
+                assert_same(grid, bitboard, f"{context} restore")
+
+            # take the step on both engines
+            grid_result = grid.step_fast(action)
+            bitboard_result = bitboard.step_fast(action)
+            if grid.food != bitboard.food:
+                sync_food(grid, bitboard)
+
+            # compare the rewards and the games
+            context = f"size {size} game {game} step {grid.steps}"
+            assert grid_result[1:] == bitboard_result[1:], f"{context}: rewards differ"
+            assert_same(grid, bitboard, context)
+            checked += 1
+
+    return checked
+
+def steps_per_second(engine, size, steps, seed):
+    """Time step_fast with random actions, resetting after every game."""
+    env = SnakeEnv(size=size, record_history=False, copy_state=False, seed=seed, engine=engine)
+    actions = random.Random(seed).choices(range(5), k=steps)
+
+    start = time.perf_counter()
+    for action in actions:
+        if env.step_fast(action)[2]:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Check the bitboard snake engine against the grid engine.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 10, 20, 64], help="Board sizes to check")
+    parser.add_argument('--games', type=int, default=50, help="Games played per board size")
+    parser.add_argument('--steps', type=int, default=100000, help="Steps timed per engine and board size")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the games and actions")
+    args = parser.parse_args()
+
+    # check parity
+    for size in args.sizes:
+        checked = check_parity(size, args.games, args.seed)
+        print(f"size {size:>3}: {checked} steps over {args.games} games match")
+
+    # compare the throughput
+    print(f"\n{'size':>6} {'grid steps/s':>13} {'bitboard steps/s':>17}")
+    for size in args.sizes:
+        grid_rate = steps_per_second("grid", size, args.steps, args.seed)
+        bitboard_rate = steps_per_second("bitboard", size, args.steps, args.seed)
+        print(f"{size:>6} {grid_rate:>13,.0f} {bitboard_rate:>17,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# File: benchmarks/snake_food_placement.py
+"""
+Food placement cost against how full the board is.
+
+Compares SnakeEnv.place_food (a single draw from the free-cell index) with the old
+rejection-sampling loop, on boards from 10x10 to 100x100 filled from empty to 95%.
+
+    python -m benchmarks.snake_food_placement
+"""
+import argparse
+import random
+import time
+from environments.snake.snake_environment import SnakeEnv
+
+def boustrophedon(size, length):
+    """Return the first length cells of a row-by-row zig-zag path, tail first."""
+    path = []
+    for row in range(size):
+        cols = range(size) if row % 2 == 0 else range(size - 1, -1, -1)
+        path.extend((row, col) for col in cols)
+    return path[:length]
+
+def rejection_place_food(env):
+    """The old place_food loop, kept here as the baseline."""
+    while True:
+        food = (random.randint(0, env.size - 1), random.randint(0, env.size - 1))
+        if food not in env.snake:
+            return food
+
+def time_per_call(func, calls):
+    """Return the mean cost of func in microseconds."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark snake food placement against board fill.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 50, 100], help="Board sizes to benchmark")
+    parser.add_argument('--fills', type=float, nargs='+', default=[0.0, 0.25, 0.5, 0.75, 0.9, 0.95], help="Fractions of the board covered by the snake")
+    parser.add_argument('--calls', type=int, default=20000, help="Placements timed per cell of the table")
+    args = parser.parse_args()
+
+    # print the header
+    print(f"{'size':>6} {'fill':>6} {'index us':>10} {'rejection us':>14}")
+
+    for size in args.sizes:
+        env = SnakeEnv(size=size)
+        for fill in args.fills:
+            # cover the requested fraction of the board with the snake
+            env.snake = boustrophedon(size, max(1, int(fill * size * size)))
+
+            # time both placement strategies
+            index_us = time_per_call(env.place_food, args.calls)
+            rejection_us = time_per_call(lambda: rejection_place_food(env), args.calls)
+            print(f"{size:>6} {fill:>6.2f} {index_us:>10.3f} {rejection_us:>14.3f}")
+
+if __name__ == "__main__":
+    main()
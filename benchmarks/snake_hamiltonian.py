@@ -0,0 +1,59 @@
+# File: benchmarks/snake_hamiltonian.py
+"""
+Milliseconds per decision and final length of the Hamiltonian cycle agent on growing boards.
+
+Following the cycle can take up to a full lap to reach the food, so the games are played with
+max_steps_without_food set to the number of cells instead of the default 100.
+
+    python -m benchmarks.snake_hamiltonian
+"""
+import argparse
+import time
+from agents.snake.hamiltonian_agent import HamiltonianAgent
+from environments.snake.snake_environment import SnakeEnv
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark the Hamiltonian cycle snake agent.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 50], help="Board sizes to play on (even)")
+    parser.add_argument('--games', type=int, default=3, help="Games played per board size")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the games")
+    args = parser.parse_args()
+
+    # print the header
+    print(f"{'size':>5} {'ms/decision':>12} {'avg length':>11} {'cells':>6} {'won':>4} {'avg steps':>10} {'searches/food':>14}")
+
+    for size in args.sizes:
+        agent = HamiltonianAgent(id="snake_hamiltonian", name="Hamiltonian Agent", description="")
+        env = SnakeEnv(size=size, record_history=False, copy_state=False, seed=args.seed, max_steps_without_food=size * size)
+        decisions = 0
+        decision_time = 0.0
+        lengths = []
+        steps = []
+        won = 0
+        food_eaten = 0
+
+        for game in range(args.games):
+            state = env.reset()
+            while not env.game_over:
+                # time the decision only
+                start = time.perf_counter()
+                action = agent.choose_action(state)
+                decision_time += time.perf_counter() - start
+                decisions += 1
+
+                # take the step
+                state, _, _ = env.step_fast(action)
+
+            lengths.append(len(env.snake))
+            steps.append(env.steps)
+            won += env.won
+            food_eaten += len(env.snake) - 1
+
+        print(
+            f"{size:>5} {decision_time / decisions * 1000:>12.4f} {sum(lengths) / len(lengths):>11.1f} {size * size:>6} {won:>4} "
+            f"{sum(steps) / len(steps):>10.0f} {agent.searches / max(1, food_eaten):>14.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
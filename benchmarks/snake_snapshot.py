@@ -0,0 +1,39 @@
+# File: benchmarks/snake_snapshot.py
+"""
+Cost of SnakeEnv.snapshot, restore and clone against board size, with copy.deepcopy for reference.
+
+    python -m benchmarks.snake_snapshot
+"""
+import argparse
+import copy
+import time
+from benchmarks.snake_food_placement import boustrophedon, time_per_call
+from environments.snake.snake_environment import SnakeEnv
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark snake snapshot, restore and clone.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 20, 50, 100], help="Board sizes to benchmark")
+    parser.add_argument('--fill', type=float, default=0.25, help="Fraction of the board covered by the snake")
+    parser.add_argument('--calls', type=int, default=2000, help="Calls timed per operation")
+    args = parser.parse_args()
+
+    # print the header
+    print(f"{'size':>6} {'length':>7} {'snapshot us':>12} {'restore us':>11} {'clone us':>9} {'deepcopy us':>12}")
+
+    for size in args.sizes:
+        # build a game with a snake covering the requested fraction of the board
+        env = SnakeEnv(size=size, record_history=False)
+        env.snake = boustrophedon(size, max(1, int(args.fill * size * size)))
+        env.place_food()
+        snapshot = env.snapshot()
+
+        # time each operation
+        snapshot_us = time_per_call(env.snapshot, args.calls)
+        restore_us = time_per_call(lambda: env.restore(snapshot), args.calls)
+        clone_us = time_per_call(env.clone, args.calls)
+        deepcopy_us = time_per_call(lambda: copy.deepcopy(env), max(1, args.calls // 10))
+        print(f"{size:>6} {len(env.snake):>7} {snapshot_us:>12.2f} {restore_us:>11.2f} {clone_us:>9.2f} {deepcopy_us:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# File: benchmarks/tic_tac_toe_agents.py
+"""
+Speed of the classic tic tac toe agents' search loops: MCTS simulations and random rollouts (one at a time and
+batched) per second, the time of the exhaustive minimax over the opening, and the two-way win checks of the
+heuristic agents.
+
+    python -m benchmarks.tic_tac_toe_agents
+"""
+import argparse
+import itertools
+import random
+import time
+import numpy as np
+from agents.tic_tac_toe.batch_rollouts import batch_rollout
+from agents.tic_tac_toe.heuristics_agent import HeuristicsTicTacToeAgent
+from agents.tic_tac_toe.mcts_agent import MonteCarloTreeSearchTicTacToeAgent
+from agents.tic_tac_toe.mcts_tree import rollout
+from agents.tic_tac_toe.minimax_agent import MiniMaxTicTacToeAgent
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark the tic tac toe agents' search loops.")
+    parser.add_argument('--simulations', type=int, default=10000, help="MCTS simulations to time")
+    parser.add_argument('--rollouts', type=int, default=20000, help="Random rollouts to time")
+    parser.add_argument('--batch', type=int, default=256, help="Rollouts per NumPy batch")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the random moves")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    # MCTS simulations on a new tree, as O replying to X in the corner
+    agent = MonteCarloTreeSearchTicTacToeAgent(id="benchmark", name="Benchmark", description="", player=2)
+    board = np.zeros((3, 3), dtype=int)
+    board[0, 0] = 1
+    start = time.perf_counter()
+    root = agent.searcher.find(agent.get_bitboard(board), 2)
+    agent.searcher.search(root, args.simulations)
+    elapsed = time.perf_counter() - start
+    print(f"MCTS simulations: {args.simulations / elapsed:,.0f}/s (best move {agent.searcher.best_action(root)}, {agent.searcher.size} nodes)")
+
+    # random rollouts from the empty board
+    start = time.perf_counter()
+    for _ in range(args.rollouts):
+        rollout(0, 1)
+    elapsed = time.perf_counter() - start
+    print(f"MCTS rollouts: {args.rollouts / elapsed:,.0f}/s")
+
+    # the same rollouts played as NumPy batches
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    for _ in range(args.rollouts // args.batch):
+        batch_rollout(0, 1, args.batch, rng)
+    elapsed = time.perf_counter() - start
+    print(f"Batched rollouts ({args.batch} per batch): {args.rollouts // args.batch * args.batch / elapsed:,.0f}/s")
+
+    # the exhaustive minimax over every opening move
+    empty = np.zeros((3, 3), dtype=int)
+    agent = MiniMaxTicTacToeAgent(id="benchmark", name="Benchmark", description="")
+    start = time.perf_counter()
+    scores = [agent._minimax(agent.apply_action(empty, action, 1), 0, False) for action in agent.get_available_actions(empty)]
+    print(f"Exhaustive minimax over the opening: {time.perf_counter() - start:.2f}s (scores {scores})")
+
+    # the two-way win check for both players on every board with a move left
+    agent = HeuristicsTicTacToeAgent(id="benchmark", name="Benchmark", description="")
+    boards = [np.array(cells).reshape(3, 3) for cells in itertools.product(range(3), repeat=9) if 0 in cells]
+    start = time.perf_counter()
+    for board in boards:
+        agent.check_potential_two_way_win(board, 1)
+        agent.check_potential_two_way_win(board, 2)
+    elapsed = time.perf_counter() - start
+    print(f"Two-way win checks: {2 * len(boards) / elapsed:,.0f}/s")
+
+if __name__ == "__main__":
+    main()
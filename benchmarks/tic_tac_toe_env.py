@@ -0,0 +1,75 @@
+# File: benchmarks/tic_tac_toe_env.py
+"""
+Step throughput of TicTacToeEnv on m,n,k boards, playing random games with rendering off.
+
+Every finished game is also checked against a NumPy scan of the whole board for a line of win_length, so
+the bitboard win detection is verified on the games it times.
+
+    python -m benchmarks.tic_tac_toe_env
+"""
+import argparse
+import random
+import time
+import numpy as np
+from environments.tic_tac_toe.tic_tac_toe_environment import TicTacToeEnv
+
+# the boards played: (rows, cols, win length)
+BOARDS = ((3, 3, 3), (4, 4, 4), (5, 5, 4), (7, 7, 5), (15, 15, 5))
+
+def has_line(board, player, win_length):
+    """Check for a line of win_length marks by scanning every window of the board with NumPy."""
+    marks = board == player
+    rows, cols = marks.shape
+    for row in range(rows):
+        for col in range(cols):
+            for delta_row, delta_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + delta_row * (win_length - 1), col + delta_col * (win_length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    steps = np.arange(win_length)
+                    if marks[row + delta_row * steps, col + delta_col * steps].all():
+                        return True
+    return False
+
+def play(rows, cols, win_length, games, seed):
+    """Play random games, returning (steps per second, mismatches with the NumPy check)."""
+    rng = random.Random(seed)
+    env = TicTacToeEnv(rows=rows, cols=cols, win_length=win_length, render_on_step=False)
+    steps = 0
+    step_time = 0.0
+    mismatches = 0
+
+    for game in range(games):
+        env.reset()
+        valid_moves = env.get_valid_moves()
+        while not env.game_over:
+            # time the step only
+            action = valid_moves.pop(rng.randrange(len(valid_moves)))
+            start = time.perf_counter()
+            env.step(action)
+            step_time += time.perf_counter() - start
+            steps += 1
+
+        # the winner must be the only player with a line
+        won = env.result_message.startswith("Player")
+        for player in (1, 2):
+            expected = won and player == env.current_player
+            if has_line(env.board, player, win_length) != expected:
+                mismatches += 1
+
+    return steps / step_time, mismatches
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark TicTacToeEnv steps on m,n,k boards.")
+    parser.add_argument('--games', type=int, default=2000, help="Random games per board")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the moves")
+    args = parser.parse_args()
+
+    # print the header
+    print(f"{'board':>9} {'steps/s':>10} {'mismatches':>11}")
+    for rows, cols, win_length in BOARDS:
+        rate, mismatches = play(rows, cols, win_length, args.games, args.seed)
+        print(f"{f'{rows}x{cols}/{win_length}':>9} {rate:>10,.0f} {mismatches:>11}")
+
+if __name__ == "__main__":
+    main()
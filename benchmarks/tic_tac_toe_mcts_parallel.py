@@ -0,0 +1,53 @@
+# File: benchmarks/tic_tac_toe_mcts_parallel.py
+"""
+Scaling of root parallel MCTS from one worker process to every core: the time of a fixed number of simulations
+split between the workers, against a single tree in the calling process.
+
+Each worker count gets a new pool, started and warmed up with a short search before the timing, so the time
+excludes spawning the workers as the agent does between moves.
+
+    python -m benchmarks.tic_tac_toe_mcts_parallel
+"""
+import argparse
+import os
+import random
+import time
+from agents.tic_tac_toe.bitboard import SHIFTS
+from agents.tic_tac_toe.mcts_tree import MCTSTree
+from agents.tic_tac_toe.root_parallel_mcts import RootParallelMCTS
+
+# the position searched: O to reply to X in the corner
+BOARD = 1 << SHIFTS[1]
+PLAYER = 2
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark root parallel MCTS over worker counts.")
+    parser.add_argument('--simulations', type=int, default=200000, help="Simulations per search, split between the workers")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help="The largest worker count")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the searches")
+    args = parser.parse_args()
+
+    # the single tree in this process
+    random.seed(args.seed)
+    tree = MCTSTree(max_nodes=10 ** 7)
+    best_action, stats = tree.decide(BOARD, PLAYER, args.simulations)
+    baseline = stats.elapsed
+
+    # print the header
+    print(f"{os.cpu_count()} cores, {args.simulations:,} simulations per search")
+    print(f"{'workers':>8} {'seconds':>8} {'sims/s':>10} {'speedup':>8} {'move':>5}")
+    print(f"{'inline':>8} {baseline:>8.3f} {stats.simulations_per_second:>10,.0f} {1.0:>8.2f} {best_action:>5}")
+
+    for workers in range(1, args.max_workers + 1):
+        pool = RootParallelMCTS(workers, max_nodes=10 ** 7, seed=args.seed)
+        try:
+            # warm up with one simulation per worker on the empty board, so the timing excludes starting them
+            pool.decide(0, 1, workers)
+            best_action, stats = pool.decide(BOARD, PLAYER, args.simulations)
+        finally:
+            pool.close()
+        print(f"{workers:>8} {stats.elapsed:>8.3f} {stats.simulations_per_second:>10,.0f} {baseline / stats.elapsed:>8.2f} {best_action:>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# File: benchmarks/tic_tac_toe_search.py
+"""
+Nodes per second, transposition table hit rate and depth reached by the alpha-beta search on m,n,k boards,
+with and without symmetry reduction, searching the opening and then playing a game against itself (keeping
+the transposition table between moves).
+
+    python -m benchmarks.tic_tac_toe_search
+    python -m benchmarks.tic_tac_toe_search --baseline   # also time the exhaustive minimax on the 3x3 opening
+"""
+import argparse
+import time
+import numpy as np
+from agents.tic_tac_toe.alpha_beta_search import AlphaBetaSearch
+from agents.tic_tac_toe.minimax_agent import MiniMaxTicTacToeAgent
+
+# the boards searched: (rows, cols, win length)
+BOARDS = ((3, 3, 3), (4, 4, 3), (4, 4, 4), (5, 5, 4), (6, 6, 4), (7, 7, 5))
+
+def self_play(engine, time_budget):
+    """Play a game with the search on both sides, returning (moves, nodes, seconds, tt probes, tt hits)."""
+    cells = [0] * engine.num_cells
+    player = 1
+    moves = nodes = probes = hits = 0
+    elapsed = 0.0
+    while True:
+        cell, _, stats = engine.search(cells, player, time_budget=time_budget)
+        if cell is None:
+            break
+        cells[cell] = player
+        player = 3 - player
+        moves += 1
+        nodes += stats.nodes
+        elapsed += stats.elapsed
+        probes += stats.tt_probes
+        hits += stats.tt_hits
+    return moves, nodes, elapsed, probes, hits
+
+def main():
+    # parse the arguments
+    parser = argparse.ArgumentParser(description="Benchmark the alpha-beta tic tac toe search.")
+    parser.add_argument('--time-budget', type=float, default=1.0, help="Seconds per search")
+    parser.add_argument('--baseline', action='store_true', help="Also time the exhaustive minimax on the 3x3 opening")
+    args = parser.parse_args()
+
+    # print the header
+    print(f"{'board':>9} {'symmetry':>8} {'search':>8} {'depth':>5} {'nodes':>9} {'nodes/s':>9} {'tt hits':>8} {'seconds':>8}")
+
+    for rows, cols, win_length in BOARDS:
+        for use_symmetry in (True, False):
+            board = f"{rows}x{cols}/{win_length}"
+
+            # the opening, from an empty table
+            engine = AlphaBetaSearch(rows, cols, win_length, use_symmetry=use_symmetry)
+            _, _, stats = engine.search([0] * (rows * cols), 1, time_budget=args.time_budget)
+            print(f"{board:>9} {str(use_symmetry):>8} {'opening':>8} {stats.depth:>5} {stats.nodes:>9} {stats.nodes_per_second:>9,.0f} {stats.tt_hit_rate:>8.1%} {stats.elapsed:>8.2f}")
+
+            # a whole game, keeping the table between moves
+            engine = AlphaBetaSearch(rows, cols, win_length, use_symmetry=use_symmetry)
+            moves, nodes, elapsed, probes, hits = self_play(engine, args.time_budget)
+            hit_rate = hits / probes if probes else 0.0
+            print(f"{board:>9} {str(use_symmetry):>8} {'game':>8} {moves:>5} {nodes:>9} {nodes / elapsed:>9,.0f} {hit_rate:>8.1%} {elapsed:>8.2f}")
+
+    # the exhaustive minimax on the 3x3 opening, as the agent used to search it
+    if args.baseline:
+        agent = MiniMaxTicTacToeAgent(id="benchmark", name="Benchmark", description="")
+        board = np.zeros((3, 3), dtype=int)
+        start = time.perf_counter()
+        for action in agent.get_available_actions(board):
+            agent._minimax(agent.apply_action(board, action, 1), 0, False)
+        print(f"Exhaustive minimax on the 3x3 opening: {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -36,15 +36,15 @@ class EnvironmentLoader:
         # return
         return getattr(module, class_name)
 
-    def get_environment(self, env_id) -> Tuple[Any, EnvironmentType]:
+    def get_environment(self, env_id, **env_params) -> Tuple[Any, EnvironmentType]:
         # get the environment config
         env_config = self.get_environment_config(env_id)
 
         # get the environment class
         EnvClass = self.load_class(env_config.environment)
 
-        # instantiate an instance of the environment
-        env_instance = EnvClass(**env_config.env_params)
+        # instantiate an instance of the environment, with any params passed in overriding the config
+        env_instance = EnvClass(**{**env_config.env_params, **env_params})
 
         # return the instance and the config
         return env_instance, env_config
@@ -61,9 +61,9 @@ def get_app_root():
 app_root = get_app_root()
 environment_loader = EnvironmentLoader(os.path.join(app_root, 'config', 'environment_config.json'))
 
-def get_environment(env_id) -> Tuple[Any, EnvironmentType]:
+def get_environment(env_id, **env_params) -> Tuple[Any, EnvironmentType]:
     # get the environment by id
-    return environment_loader.get_environment(env_id)
+    return environment_loader.get_environment(env_id, **env_params)
 
 def list_environments() -> List[EnvironmentType]:
     # list all available environments
@@ -6,6 +6,9 @@ class ActionHistory:
         # Initialize the history list
         self.history = []
 
+        # the number of clears, so readers such as the renderer can tell the history started over
+        self.generation = 0
+
     def add_record(self, step, snake_head_position, snake_direction, snake_length, action):
         # Ensure snake_direction and action are stored as integers
         if isinstance(snake_direction, SnakeAction):
@@ -34,4 +37,4 @@ class ActionHistory:
     def clear(self):
         """Clear the action history."""
         self.history = []
-
+        self.generation += 1
@@ -0,0 +1,165 @@
+# File: environments/snake/bitboard_snake_body.py
+from collections import deque
+from itertools import islice
+import numpy as np
+
+class BitboardSnakeBody:
+    """
+    A drop-in alternative to SnakeBody that keeps the board as one Python int per row.
+
+    Each row int has size + 2 bits: bit col + 1 is set when (row, col) is covered by the body, and bits 0
+    and size + 1 are walls. Row 0 and row size + 1 are solid wall rows. A collision check for any cell
+    one step from the board, off-board cells included, is then a single bit test with no bounds check,
+    and free-space queries are popcounts of the complemented rows.
+
+    Food is drawn as the k-th free cell in row-major order, so for the same seed the food sequence differs
+    from SnakeBody's (which draws from its free-cell index); the game rules are otherwise identical.
+    """
+
+    def __init__(self, size, positions=()):
+        # set the size of the board
+        self.size = size
+
+        # the bits of the board cells in a row, and an empty row (walls only)
+        self.interior = ((1 << size) - 1) << 1
+        self.empty_row = 1 | (1 << (size + 1))
+        self.wall_row = (1 << (size + 2)) - 1
+
+        # bytes per row int, used to unpack the rows into an occupancy plane
+        self.row_bytes = (size + 2 + 7) // 8
+
+        # the ordered body (tail first) and the padded rows
+        self.segments = deque()
+        self.rows = []
+
+        # add the initial positions
+        self.reset(positions)
+
+    def reset(self, positions=()):
+        """Replace the body with the given positions (tail first)."""
+        # clear the board
+        self.segments.clear()
+        self.rows = [self.wall_row] + [self.empty_row] * self.size + [self.wall_row]
+
+        # add the new positions
+        for position in positions:
+            self.push_head(position)
+
+    def release(self):
+        """Remove the whole body from the board."""
+        while self.segments:
+            self.pop_tail()
+
+    @property
+    def head(self):
+        """Return the head position."""
+        return self.segments[-1]
+
+    @property
+    def tail(self):
+        """Return the tail position."""
+        return self.segments[0]
+
+    def push_head(self, position):
+        """Add a new head to the snake."""
+        self.segments.append(position)
+        self.rows[position[0] + 1] |= 1 << (position[1] + 1)
+
+    def pop_tail(self):
+        """Remove and return the tail of the snake."""
+        row, col = self.segments.popleft()
+        self.rows[row + 1] &= ~(1 << (col + 1))
+        return row, col
+
+    def is_blocked(self, row, col):
+        """Check whether a cell on the board, or one step off it, is a wall or covered by the body."""
+        return (self.rows[row + 1] >> (col + 1)) & 1 == 1
+
+    def free_count(self):
+        """Return the number of cells not covered by the body."""
+        return self.size * self.size - len(self.segments)
+
+    def random_free_position(self, rng):
+        """Return a uniformly random position not covered by the body, or None if the board is full."""
+        free = self.free_count()
+        if free == 0:
+            return None
+
+        # pick the k-th free cell in row-major order
+        k = rng.randrange(free)
+        interior = self.interior
+        for row in range(self.size):
+            free_bits = ~self.rows[row + 1] & interior
+            row_free = free_bits.bit_count()
+            if k < row_free:
+                # drop the k lowest free bits, the lowest one left is the cell
+                for _ in range(k):
+                    free_bits &= free_bits - 1
+                return row, (free_bits & -free_bits).bit_length() - 2
+            k -= row_free
+
+    def occupancy_plane(self):
+        """Return the occupancy of the board as a (size, size) uint8 array."""
+        size = self.size
+        data = b''.join([row.to_bytes(self.row_bytes, 'little') for row in self.rows[1:size + 1]])
+        bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(size, self.row_bytes), axis=1, bitorder='little')
+        return bits[:, 1:size + 1]
+
+    def snapshot(self):
+        """Return the body as a tuple of cell ids (tail first), plus the rows."""
+        size = self.size
+        return tuple([row * size + col for row, col in self.segments]), tuple(self.rows)
+
+    def restore(self, snapshot, positions):
+        """
+        Restore the body from a snapshot.
+
+        Args:
+        - snapshot: a value returned by snapshot().
+        - positions: the (row, col) tuple of every cell id, so the restored body reuses existing tuples.
+        """
+        cells, rows = snapshot
+        self.segments = deque([positions[cell] for cell in cells])
+        self.rows = list(rows)
+
+    def copy(self):
+        """Return an independent copy of the body."""
+        body = BitboardSnakeBody.__new__(BitboardSnakeBody)
+        body.size = self.size
+        body.interior = self.interior
+        body.empty_row = self.empty_row
+        body.wall_row = self.wall_row
+        body.row_bytes = self.row_bytes
+        body.segments = self.segments.copy()
+        body.rows = self.rows.copy()
+        return body
+
+    def is_occupied(self, position):
+        """Check whether an on-board position is covered by the body."""
+        return (self.rows[position[0] + 1] >> (position[1] + 1)) & 1 == 1
+
+    def __contains__(self, position):
+        # off-board positions are never part of the body
+        row, col = position
+        return 0 <= row < self.size and 0 <= col < self.size and (self.rows[row + 1] >> (col + 1)) & 1 == 1
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __getitem__(self, index):
+        # slices are returned as lists, matching the old list representation
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.segments))
+            return list(islice(self.segments, start, stop, step)) if step > 0 else list(self.segments)[index]
+        return self.segments[index]
+
+    def __eq__(self, other):
+        if isinstance(other, BitboardSnakeBody):
+            return self.segments == other.segments
+        return list(self.segments) == list(other)
+
+    def __repr__(self):
+        return repr(list(self.segments))
@@ -0,0 +1,204 @@
+# File: environments/snake/episode_recorder.py
+import mmap
+import struct
+from array import array
+from environments.snake.snake_environment import SnakeEnv
+
+# file header: magic, format version, board size, max_steps_without_food, followed by the names of the
+# snake engine and the reward function, each as a uint8 length and ASCII bytes
+HEADER = struct.Struct('<8sHHI')
+HEADER_MAGIC = b'SNAKEREC'
+FORMAT_VERSION = 2
+NAME_LENGTH = struct.Struct('<B')
+
+# game record header: episode seed, initial direction (SnakeAction value), number of actions,
+# followed by one uint8 SnakeAction value per step
+GAME_HEADER = struct.Struct('<QBI')
+
+# footer written after the index of game offsets: index offset, number of games, magic
+FOOTER = struct.Struct('<QQ8s')
+FOOTER_MAGIC = b'SNAKEIDX'
+
+class EpisodeRecorder:
+    """
+    Writes snake games as (seed, initial direction, uint8 action stream) records into a compact binary
+    file, followed by an index of game offsets so any game can be found without reading the others.
+
+    Attach it to a SnakeEnv with env.attach_recorder(recorder); every reset starts a new game record
+    and every step appends one byte. The environment's settings that change how a game plays out (the
+    board size, engine, reward function and max_steps_without_food) are written to the file header, and
+    must match the environment the recorder is attached to.
+    """
+
+    def __init__(self, path, size, engine="grid", reward_function="improved_reward", max_steps_without_food=100):
+        # set the path and the environment settings
+        self.path = path
+        self.size = size
+        self.engine = engine
+        self.reward_function = reward_function
+        self.max_steps_without_food = max_steps_without_food
+
+        # open the file and write the header
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(HEADER_MAGIC, FORMAT_VERSION, size, max_steps_without_food))
+        for name in (engine, reward_function):
+            encoded = name.encode('ascii')
+            self.file.write(NAME_LENGTH.pack(len(encoded)) + encoded)
+
+        # offsets of the games written so far
+        self.offsets = array('Q')
+
+        # the game being recorded
+        self.seed = None
+        self.initial_direction = None
+        self.actions = bytearray()
+
+    def begin_game(self, seed, initial_direction):
+        """Start recording a new game, finishing the current one first."""
+        self.end_game()
+        self.seed = seed
+        self.initial_direction = initial_direction
+        self.actions = bytearray()
+
+    def record(self, action):
+        """Record the SnakeAction value of one step."""
+        if not 0 <= action <= 4:
+            raise ValueError(f"Invalid action: {action}")
+        self.actions.append(action)
+
+    def end_game(self):
+        """Write the current game, if there is one."""
+        if self.seed is None:
+            return
+
+        # write the game record and remember where it starts
+        self.offsets.append(self.file.tell())
+        self.file.write(GAME_HEADER.pack(self.seed, self.initial_direction, len(self.actions)))
+        self.file.write(self.actions)
+
+        # no game in progress
+        self.seed = None
+
+    def close(self):
+        """Write the last game, the index and the footer, then close the file."""
+        if self.file.closed:
+            return
+
+        # write the last game
+        self.end_game()
+
+        # write the index and footer
+        index_offset = self.file.tell()
+        self.file.write(self.offsets.tobytes())
+        self.file.write(FOOTER.pack(index_offset, len(self.offsets), FOOTER_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class EpisodeReplayer:
+    """
+    Reads a file written by EpisodeRecorder. Games are looked up through the index, so reconstructing
+    step k of any game costs O(k) steps of one SnakeEnv and never decodes other games.
+
+    Games are replayed with the size, engine, reward function and max_steps_without_food read from the
+    file header, so they play out as they were recorded.
+    """
+
+    def __init__(self, path):
+        # map the file
+        self.path = path
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # read the header, the game records start after the two names
+        magic, version, self.size, self.max_steps_without_food = HEADER.unpack_from(self.data, 0)
+        if magic != HEADER_MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a snake episode file")
+        offset = HEADER.size
+        names = []
+        for _ in range(2):
+            (length,) = NAME_LENGTH.unpack_from(self.data, offset)
+            offset += NAME_LENGTH.size
+            names.append(self.data[offset:offset + length].decode('ascii'))
+            offset += length
+        self.engine, self.reward_function = names
+        self.records_offset = offset
+
+        # read the index, rebuilding it if the recorder was never closed
+        self.offsets = self.read_index()
+
+        # the environment used to reconstruct games
+        self.env = SnakeEnv(size=self.size, record_history=False, reward_function=self.reward_function, engine=self.engine, max_steps_without_food=self.max_steps_without_food)
+
+    def read_index(self):
+        """Return the game offsets from the footer index, or by scanning the records if there is none."""
+        # use the footer index if it is there
+        if len(self.data) >= self.records_offset + FOOTER.size:
+            index_offset, num_games, magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+            if magic == FOOTER_MAGIC:
+                offsets = array('Q')
+                offsets.frombytes(self.data[index_offset:index_offset + num_games * offsets.itemsize])
+                return offsets
+
+        # otherwise walk the game records
+        offsets = array('Q')
+        offset = self.records_offset
+        while offset + GAME_HEADER.size <= len(self.data):
+            _, _, num_actions = GAME_HEADER.unpack_from(self.data, offset)
+            if offset + GAME_HEADER.size + num_actions > len(self.data):
+                break
+            offsets.append(offset)
+            offset += GAME_HEADER.size + num_actions
+        return offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get_game(self, game_index):
+        """Return (seed, initial direction, actions) for a game, the actions as bytes."""
+        offset = self.offsets[game_index]
+        seed, initial_direction, num_actions = GAME_HEADER.unpack_from(self.data, offset)
+        start = offset + GAME_HEADER.size
+        return seed, initial_direction, self.data[start:start + num_actions]
+
+    def num_steps(self, game_index):
+        """Return the number of recorded steps in a game."""
+        return GAME_HEADER.unpack_from(self.data, self.offsets[game_index])[2]
+
+    def start_game(self, game_index):
+        """Reset the environment to the start of a game and return the game's actions."""
+        seed, initial_direction, actions = self.get_game(game_index)
+        self.env.reset(seed=seed)
+
+        # check the seed reproduces the recorded start
+        if self.env.direction_index + 1 != initial_direction:
+            raise ValueError(f"Game {game_index} does not replay: its seed gives a different initial direction")
+        return actions
+
+    def replay(self, game_index):
+        """Yield (state, reward, game_over) for each step of a game."""
+        actions = self.start_game(game_index)
+        for action in actions:
+            yield self.env.step_fast(action)
+
+    def state_at(self, game_index, step):
+        """Return the environment positioned after the first step actions of a game."""
+        actions = self.start_game(game_index)
+        for action in actions[:step]:
+            self.env.step_fast(action)
+        return self.env
+
+    def close(self):
+        """Unmap and close the file."""
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
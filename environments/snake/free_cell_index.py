@@ -0,0 +1,70 @@
+# File: environments/snake/free_cell_index.py
+from array import array
+
+class FreeCellIndex:
+    """
+    The set of free board cells kept as a swap-remove array plus a cell -> slot map,
+    so adding, removing and drawing a uniformly random free cell are all O(1).
+    """
+
+    def __init__(self, num_cells):
+        # set the number of cells on the board
+        self.num_cells = num_cells
+
+        # build the index with every cell free
+        self.reset()
+
+    def reset(self):
+        """Mark every cell as free, in cell order."""
+        self.cells = array('i', range(self.num_cells))
+        self.slots = array('i', range(self.num_cells))
+
+    def remove(self, cell):
+        """Mark a free cell as taken by moving the last free cell into its slot."""
+        slot = self.slots[cell]
+        last = self.cells.pop()
+
+        # if the cell was not the last one, move the last one into its slot
+        if last != cell:
+            self.cells[slot] = last
+            self.slots[last] = slot
+
+        # the cell no longer has a slot
+        self.slots[cell] = -1
+
+    def add(self, cell):
+        """Mark a taken cell as free again."""
+        self.slots[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    def random_cell(self, rng):
+        """Return a uniformly random free cell drawn with rng, or None if there are no free cells."""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+    def __contains__(self, cell):
+        return self.slots[cell] >= 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def snapshot(self):
+        """Return the free cells and slot map as bytes."""
+        return self.cells.tobytes(), self.slots.tobytes()
+
+    def restore(self, snapshot):
+        """Restore the free cells and slot map from a snapshot."""
+        cells, slots = snapshot
+        self.cells = array('i')
+        self.cells.frombytes(cells)
+        self.slots = array('i')
+        self.slots.frombytes(slots)
+
+    def copy(self):
+        """Return an independent copy of the index."""
+        index = FreeCellIndex.__new__(FreeCellIndex)
+        index.num_cells = self.num_cells
+        index.cells = array('i', self.cells)
+        index.slots = array('i', self.slots)
+        return index
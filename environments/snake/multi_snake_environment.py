@@ -0,0 +1,376 @@
+# File: environments/snake/multi_snake_environment.py
+import os
+import random
+import uuid
+import numpy as np
+from agents.snake.snake_action import SnakeAction
+from environments.environment_base import Environment
+from environments.snake.free_cell_index import FreeCellIndex
+from environments.snake.reward_functions import get_reward_function
+from environments.snake.snake_body import SnakeBody
+from environments.snake.snake_environment import DIRECTION_DELTAS, OPPOSITE_DIRECTIONS, VALID_ACTIONS, VALID_ACTION_MASKS
+from environments.snake.snake_observation import SnakeObservation
+
+class MultiSnakeEnv(Environment):
+    """
+    N snakes competing for shared food on one board, moving simultaneously each tick.
+
+    Every snake follows the SnakeEnv rules. On top of those, a snake dies if its head enters any snake's
+    body (tails included), and snakes whose heads meet on the same cell all die. All snakes share one
+    occupancy array, so resolving a tick costs O(number of snakes) rather than depending on body lengths.
+    The game ends when every snake is dead or, with more than one snake, when at most one is left alive.
+    """
+
+    # moves are collected from every agent and resolved together
+    simultaneous_moves = True
+
+    def __init__(self, size=15, num_snakes=2, num_food=1, agents=None, seed=None, reward_function="improved_reward", max_steps_without_food=100):
+        # set the game_id
+        self.game_id = str(uuid.uuid4())
+
+        # set the size, number of snakes and number of food items
+        # the snakes start on the middle row, one per cell at most
+        if not 1 <= num_snakes <= size:
+            raise ValueError(f"Invalid number of snakes: {num_snakes}, a board of size {size} fits 1 to {size}")
+        self.size = size
+        self.num_snakes = num_snakes
+        self.num_food = num_food
+
+        # a snake starves after more than max_steps_without_food steps without food
+        self.max_steps_without_food = max_steps_without_food
+
+        # set the reward function, either a registered name or a callable
+        self.reward_function = get_reward_function(reward_function).reward if isinstance(reward_function, str) else reward_function
+
+        # the shared occupancy and free cells of the board
+        self.occupancy = bytearray(size * size)
+        self.free_cells = FreeCellIndex(size * size)
+
+        # the RNG used for food placement and initial directions
+        self.seed_sequence = random.Random(seed)
+        self.episode_seed = None
+        self.rng = random.Random()
+
+        # Initialize agents (if provided)
+        self.agents = []
+        if agents:
+            self.set_agents(agents)
+        else:
+            self.reset()
+
+    def set_agents(self, agents):
+        """
+        Give each agent its own snake, agent i playing snake (player) i + 1.
+        """
+        self.agents = agents
+        for player, agent in enumerate(agents, start=1):
+            agent.player = player
+
+        # one snake per agent
+        if not 1 <= len(agents) <= self.size:
+            raise ValueError(f"Invalid number of agents: {len(agents)}, a board of size {self.size} fits 1 to {self.size} snakes")
+        self.num_snakes = len(agents)
+        self.reset()
+
+    def start_positions(self):
+        """Spread the snakes evenly across the middle row of the board."""
+        row = self.size // 2
+        return [(row, (index + 1) * self.size // (self.num_snakes + 1)) for index in range(self.num_snakes)]
+
+    def reset(self, seed=None):
+        # set the game_id
+        self.game_id = str(uuid.uuid4())
+
+        # seed the episode
+        self.episode_seed = seed if seed is not None else self.seed_sequence.getrandbits(64)
+        self.rng.seed(self.episode_seed)
+
+        # clear the board
+        self.occupancy[:] = bytes(len(self.occupancy))
+        self.free_cells.reset()
+
+        # create the snakes, all sharing the board's occupancy and free cells
+        self.snakes = [SnakeBody(self.size, occupancy=self.occupancy, free_cells=self.free_cells) for _ in range(self.num_snakes)]
+        for body, position in zip(self.snakes, self.start_positions()):
+            body.push_head(position)
+
+        # place the food
+        self.food = []
+        for _ in range(self.num_food):
+            self.place_food()
+
+        # choose a random initial direction for each snake
+        self.direction_indices = [self.rng.randrange(4) for _ in range(self.num_snakes)]
+
+        # per snake status
+        self.alive = [True] * self.num_snakes
+        self.scores = [0] * self.num_snakes
+        self.steps_since_last_food = [0] * self.num_snakes
+
+        # game status
+        self.steps = 0
+        self.game_over = False
+        self.winner = None
+
+        # return the states
+        return self.get_state()
+
+    def place_food(self):
+        """Place one food item on a random free cell that holds no food yet, returning False if there is none."""
+        # every free cell already holds food
+        if len(self.free_cells) <= len(self.food):
+            return False
+
+        # draw until the cell does not already hold food (there are only a few food items)
+        while True:
+            position = divmod(self.free_cells.random_cell(self.rng), self.size)
+            if position not in self.food:
+                self.food.append(position)
+                return True
+
+    def is_alive(self, player):
+        """Check whether the given player's snake is still alive."""
+        return self.alive[player - 1]
+
+    def get_valid_actions(self, player):
+        """Return the SnakeAction values the given player can take (everything but a 180-degree turn)."""
+        return list(VALID_ACTIONS[self.direction_indices[player - 1]])
+
+    def step(self, actions, agents=None):
+        """
+        Move every living snake at once.
+
+        Args:
+        - actions: one SnakeAction (or SnakeAction value) per snake, in player order; dead snakes' actions are ignored.
+        - agents: the agents playing each snake, whose rewards are updated.
+
+        Returns:
+        - the per player states, the per player rewards and whether the game is over.
+        """
+        size = self.size
+        occupancy = self.occupancy
+
+        # work out where every living snake's head moves to
+        new_heads = [None] * self.num_snakes
+        for index, action in enumerate(actions):
+            if not self.alive[index]:
+                continue
+
+            # update the direction, ignoring NONE and 180-degree turns
+            action = action.action if isinstance(action, SnakeAction) else action
+            if action != SnakeAction.NONE and action - 1 != OPPOSITE_DIRECTIONS[self.direction_indices[index]]:
+                self.direction_indices[index] = action - 1
+
+            # get the next position
+            head_row, head_col = self.snakes[index].head
+            delta_row, delta_col = DIRECTION_DELTAS[self.direction_indices[index]]
+            new_heads[index] = (head_row + delta_row, head_col + delta_col)
+
+        # count the heads entering each cell, to find head-to-head collisions
+        head_counts = {}
+        for new_head in new_heads:
+            if new_head is not None:
+                head_counts[new_head] = head_counts.get(new_head, 0) + 1
+
+        # resolve deaths against the board as it was before anyone moved
+        dying = [False] * self.num_snakes
+        for index, new_head in enumerate(new_heads):
+            if new_head is None:
+                continue
+            row, col = new_head
+            dying[index] = (
+                not (0 <= row < size and 0 <= col < size)
+                or occupancy[row * size + col] == 1
+                or head_counts[new_head] > 1
+                or self.steps_since_last_food[index] > self.max_steps_without_food
+            )
+
+        # move the survivors and compute every snake's reward
+        rewards = [0] * self.num_snakes
+        eaten_food = []
+        for index, new_head in enumerate(new_heads):
+            if new_head is None:
+                continue
+
+            # the snake died this tick
+            if dying[index]:
+                rewards[index] = self.reward_function(False, True, self.steps_since_last_food[index], False, self.snakes[index].head, self.nearest_food(self.snakes[index].head))
+                continue
+
+            # add the new head to the snake
+            body = self.snakes[index]
+            body.push_head(new_head)
+
+            if new_head in self.food:
+                # the snake grows and the food is replaced below
+                eaten_food.append(new_head)
+                rewards[index] = self.reward_function(True, False, self.steps_since_last_food[index], False, new_head, new_head)
+                self.steps_since_last_food[index] = 0
+                self.scores[index] += 1
+            else:
+                # Remove the tail if food wasn't eaten
+                body.pop_tail()
+                rewards[index] = self.reward_function(False, False, self.steps_since_last_food[index], False, new_head, self.nearest_food(new_head))
+                self.steps_since_last_food[index] += 1
+
+        # take the dead snakes off the board
+        for index, died in enumerate(dying):
+            if died:
+                self.alive[index] = False
+                self.snakes[index].release()
+
+        # replace the eaten food where a free cell without food is left (the food already on the board stays)
+        for position in eaten_food:
+            self.food.remove(position)
+            self.place_food()
+
+        # the board is full once the snakes cover every cell
+        board_full = len(self.free_cells) == 0
+
+        # increase steps
+        self.steps += 1
+
+        # check whether the game is over
+        survivors = [index for index, alive in enumerate(self.alive) if alive]
+        if not survivors or (self.num_snakes > 1 and len(survivors) == 1) or board_full:
+            self.game_over = True
+            if len(survivors) == 1:
+                self.winner = survivors[0] + 1
+
+        # update the agents' rewards
+        if agents:
+            for agent, reward in zip(agents, rewards):
+                agent.add_reward(reward)
+
+        # return the states, rewards and game over
+        return self.get_state(), rewards, self.game_over
+
+    def nearest_food(self, position):
+        """Return the food closest to a position (None if there is no food)."""
+        if not self.food:
+            return None
+        return min(self.food, key=lambda food: abs(food[0] - position[0]) + abs(food[1] - position[1]))
+
+    def get_state(self, player=None):
+        """
+        Return the (size, size, 4) state from one player's point of view: channel 0 every snake body,
+        1 the player's head, 2 the food, and 3 the cell the player's head moves into next.
+        Without a player, return the states of all players stacked along the first axis.
+        """
+        if player is None:
+            return np.stack([self.get_state(index + 1) for index in range(self.num_snakes)])
+
+        # channel 0: every snake body
+        state = np.zeros((self.size, self.size, 4))
+        state[:, :, 0] = np.frombuffer(self.occupancy, dtype=np.uint8).reshape(self.size, self.size)
+
+        # channel 2: the food
+        for row, col in self.food:
+            state[row, col, 2] = 1
+
+        # a dead snake has no head
+        body = self.snakes[player - 1]
+        if not self.alive[player - 1]:
+            return state
+
+        # channel 1: the player's head
+        head_row, head_col = body.head
+        state[head_row, head_col, 1] = 1
+
+        # channel 3: the player's next head position, if it is on the board
+        delta_row, delta_col = DIRECTION_DELTAS[self.direction_indices[player - 1]]
+        next_row, next_col = head_row + delta_row, head_col + delta_col
+        if 0 <= next_row < self.size and 0 <= next_col < self.size:
+            state[next_row, next_col, 3] = 1
+
+        # return the state
+        return state
+
+    def get_observation(self, player):
+        """
+        Return the game from one player's point of view as a SnakeObservation: the player's head, body and
+        direction, the food nearest to the head, and the occupancy of every snake.
+        """
+        body = self.snakes[player - 1]
+        head = body.head if self.alive[player - 1] else None
+        direction_index = self.direction_indices[player - 1]
+        return SnakeObservation(
+            self.size, head, body, self.nearest_food(head) if head else None, direction_index + 1,
+            VALID_ACTION_MASKS[direction_index], np.frombuffer(self.occupancy, dtype=np.uint8).reshape(self.size, self.size)
+        )
+
+    def get_render(self):
+        render_str = "\n"
+        grid = [['.' for _ in range(self.size)] for _ in range(self.size)]
+
+        # each snake is drawn with its own letter, upper case for the head
+        for index, body in enumerate(self.snakes):
+            letter = chr(ord('a') + index)
+            for row, col in body:
+                grid[row][col] = letter
+            if self.alive[index]:
+                head_row, head_col = body.head
+                grid[head_row][head_col] = letter.upper()
+
+        # Set the food positions in the grid
+        for row, col in self.food:
+            grid[row][col] = 'F'
+
+        # Game Board Header
+        render_str += "Game Board:\n"
+        render_str += '\n'.join([' '.join(row) for row in grid]) + "\n\n"
+
+        # Game Instructions
+        instructions = [
+            "Game Instructions:",
+            "-" * 35,
+            "1. Each player controls one snake, all snakes move at the same time.",
+            "2. Use actions to move your snake (UP, DOWN, LEFT, RIGHT).",
+            "3. Avoid the walls and every snake's body, including your own.",
+            "4. Snakes whose heads meet on the same cell all die.",
+            "5. The last snake alive wins.",
+            "-" * 35,
+        ]
+
+        # Game details
+        game_state = [
+            "Game Information:",
+            "-" * 35,
+            f" Game ID             : {self.game_id}",
+            f" Steps Taken         : {self.steps}",
+            f" Food Positions      : {self.food}",
+            f" Game Over           : {self.game_over}",
+            f" Winner              : {f'Player {self.winner}' if self.winner else 'None'}",
+            "-" * 35,
+        ]
+
+        # Snake details
+        snakes = ["Snakes:", "-" * 35]
+        for index, body in enumerate(self.snakes):
+            letter = chr(ord('A') + index)
+            status = f"Length {len(body)}, Head {body.head}" if self.alive[index] else "Dead"
+            snakes.append(f" Player {index + 1} ({letter}): {status}, Food Eaten {self.scores[index]}")
+        snakes.append("-" * 35)
+
+        # Legend
+        legend = [
+            "Legend:",
+            "-" * 35,
+            " A, B, ... - Head of each player's snake",
+            " a, b, ... - Body of each player's snake",
+            " F - Food",
+            " . - Empty space",
+            "-" * 35,
+        ]
+
+        # Combine all parts for the final render string
+        render_str += "\n".join(instructions) + "\n\n" + "\n".join(game_state) + "\n\n" + "\n".join(snakes) + "\n\n" + "\n".join(legend)
+
+        return render_str
+
+    def render(self):
+        # Clear the console
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+        # Get and print the render string
+        print(self.get_render())
@@ -0,0 +1,93 @@
+# File: environments/snake/observation_buffer.py
+import numpy as np
+
+class ObservationBuffer:
+    """
+    A persistent (size, size, 4) snake observation that is updated by deltas rather than rebuilt.
+
+    Channels match SnakeEnv.get_state: 0 = body (head included), 1 = head, 2 = food, 3 = the cell the
+    head moves into next. Each update touches at most two cells, so no step allocates or repaints.
+    """
+
+    def __init__(self, size, dtype=np.float64):
+        # set the size and the buffer
+        self.size = size
+        self.state = np.zeros((size, size, 4), dtype=dtype)
+
+        # a read-only view handed out to callers that do not need their own copy
+        self.view = self.state.view()
+        self.view.flags.writeable = False
+
+        # the cells currently marked in the head, food and direction channels
+        self.head = None
+        self.food = None
+        self.direction_cell = None
+
+    def repaint(self, body, food, direction_cell):
+        """Rebuild every channel from a SnakeBody or BitboardSnakeBody (used on reset and restore)."""
+        # clear the buffer
+        self.state.fill(0)
+        self.head = None
+        self.food = None
+        self.direction_cell = None
+
+        # paint the body straight from its occupancy plane, then the head
+        self.state[:, :, 0] = body.occupancy_plane()
+        if len(body):
+            self.add_head(body.head)
+
+        # paint the food and direction cell
+        self.set_food(food)
+        self.set_direction_cell(direction_cell)
+
+    def add_head(self, position):
+        """The snake moved (or grew) into position."""
+        # the old head is now just body
+        if self.head is not None:
+            self.state[self.head[0], self.head[1], 1] = 0
+
+        # mark the new head
+        self.state[position[0], position[1], 0] = 1
+        self.state[position[0], position[1], 1] = 1
+        self.head = position
+
+    def remove_tail(self, position):
+        """The tail left position."""
+        self.state[position[0], position[1], 0] = 0
+
+    def set_food(self, position):
+        """Move the food to position (None once the board is full)."""
+        if self.food is not None:
+            self.state[self.food[0], self.food[1], 2] = 0
+        if position is not None:
+            self.state[position[0], position[1], 2] = 1
+        self.food = position
+
+    def set_direction_cell(self, position):
+        """Move the direction marker to position (None if the next head is off the board)."""
+        # nothing to do if the marker has not moved
+        if position == self.direction_cell:
+            return
+
+        # move the marker
+        if self.direction_cell is not None:
+            self.state[self.direction_cell[0], self.direction_cell[1], 3] = 0
+        if position is not None:
+            self.state[position[0], position[1], 3] = 1
+        self.direction_cell = position
+
+    def copy(self):
+        """Return an independent copy of the buffer."""
+        buffer = ObservationBuffer.__new__(ObservationBuffer)
+        buffer.size = self.size
+        buffer.state = self.state.copy()
+        buffer.view = buffer.state.view()
+        buffer.view.flags.writeable = False
+        buffer.head = self.head
+        buffer.food = self.food
+        buffer.direction_cell = self.direction_cell
+        return buffer
+
+    def get(self, copy=True):
+        """Return a copy of the observation, or the read-only view of the live buffer."""
+        return self.state.copy() if copy else self.view
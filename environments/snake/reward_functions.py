@@ -1,7 +1,12 @@
 # File: reward_functions.py
+from typing import Callable, NamedTuple
 import numpy as np
 
-def simple_reward(eaten, dead, steps):
+# Every reward function takes (eaten, dead, steps, repeated_action, snake_head, food_position).
+# The batch versions take the same arguments as arrays: boolean eaten/dead/repeated_action vectors,
+# a steps-since-last-food vector, and (N, 2) arrays of snake heads and food positions.
+
+def simple_reward(eaten, dead, steps, repeated_action=False, snake_head=None, food_position=None):
     if dead:
         return -1
     elif eaten:
@@ -10,7 +15,7 @@ def simple_reward(eaten, dead, steps):
         return -1
     else:
         return 0
-    
+
 def improved_reward(eaten, dead, steps, repeated_action, snake_head, food_position):
     if dead:
         # High penalty for dying
@@ -23,7 +28,7 @@ def improved_reward(eaten, dead, steps, repeated_action, snake_head, food_positi
         survival_reward = 0.1
 
         # Calculate Manhattan distance to the food
-        distance_to_food = np.abs(snake_head[0] - food_position[0]) + np.abs(snake_head[1] - food_position[1])
+        distance_to_food = abs(snake_head[0] - food_position[0]) + abs(snake_head[1] - food_position[1])
 
         # Reward for getting closer to food (larger reward the closer it gets)
         distance_reward = 1 / (distance_to_food + 1)
@@ -32,4 +37,41 @@ def improved_reward(eaten, dead, steps, repeated_action, snake_head, food_positi
         repetition_penalty = -1 if repeated_action else 0
 
         # Combine rewards and penalties
-        return survival_reward + distance_reward + repetition_penalty
\ No newline at end of file
+        return survival_reward + distance_reward + repetition_penalty
+
+def simple_reward_batch(eaten, dead, steps, repeated_action=None, snake_heads=None, food_positions=None):
+    """Vectorised simple_reward."""
+    return np.where(dead, -1.0, np.where(eaten, 1.0, np.where(steps > 49, -1.0, 0.0)))
+
+def improved_reward_batch(eaten, dead, steps, repeated_action, snake_heads, food_positions):
+    """Vectorised improved_reward."""
+    # Calculate Manhattan distance to the food
+    distance_to_food = np.abs(snake_heads - food_positions).sum(axis=1)
+
+    # survival, distance and repetition terms for the snakes that just moved
+    move_rewards = 0.1 + 1.0 / (distance_to_food + 1) - np.asarray(repeated_action, dtype=np.float64)
+
+    # combine dying, eating and moving
+    return np.where(dead, -100.0, np.where(eaten, 50.0 + 100.0 / (steps + 1), move_rewards))
+
+class RewardFunction(NamedTuple):
+    """A reward function with its scalar form (used by SnakeEnv) and batch form (used by VectorSnakeEnv)."""
+    reward: Callable
+    batch: Callable
+
+# reward functions selectable by name, e.g. from the env_params in environment_config.json
+REWARD_FUNCTIONS = {}
+
+def register_reward_function(name, reward, batch):
+    """Register a reward function under a name, so environments can select it by that name."""
+    REWARD_FUNCTIONS[name] = RewardFunction(reward, batch)
+
+def get_reward_function(name) -> RewardFunction:
+    """Return the reward function registered under a name."""
+    if name not in REWARD_FUNCTIONS:
+        raise ValueError(f"Reward function '{name}' not found")
+    return REWARD_FUNCTIONS[name]
+
+# register the built in reward functions
+register_reward_function("simple_reward", simple_reward, simple_reward_batch)
+register_reward_function("improved_reward", improved_reward, improved_reward_batch)
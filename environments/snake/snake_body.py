@@ -0,0 +1,155 @@
+# File: environments/snake/snake_body.py
+from collections import deque
+from itertools import islice
+import numpy as np
+from environments.snake.free_cell_index import FreeCellIndex
+
+class SnakeBody:
+    """
+    The snake body as a deque of (row, col) tuples, ordered tail first and head last,
+    backed by a persistent occupancy array so that moving, growing and collision checks are O(1),
+    and by a free-cell index so that food can be placed with a single random draw.
+
+    It behaves like the list of tuples SnakeEnv used to store, so snake[-1] is the head,
+    len(snake) is the length and (row, col) in snake is an O(1) occupancy test.
+
+    Several bodies can share one occupancy array and free-cell index (see MultiSnakeEnv), in which
+    case the occupancy tests answer for every snake on the board.
+    """
+
+    def __init__(self, size, positions=(), occupancy=None, free_cells=None):
+        # set the size of the board
+        self.size = size
+
+        # the ordered body (tail first) and the occupancy of each cell (row * size + col)
+        self.segments = deque()
+        self.occupancy = occupancy if occupancy is not None else bytearray(size * size)
+
+        # the cells not covered by the body
+        self.free_cells = free_cells if free_cells is not None else FreeCellIndex(size * size)
+
+        # add the initial positions, without resetting the storage: new storage starts empty, and shared
+        # storage is reset by its owner once for all the bodies on it
+        for position in positions:
+            self.push_head(position)
+
+    def reset(self, positions=()):
+        """Replace the body with the given positions (tail first)."""
+        # clear the current body, rebuilding the free cells in cell order so that
+        # food placement after a reset does not depend on earlier games
+        for row, col in self.segments:
+            self.occupancy[row * self.size + col] = 0
+        self.segments.clear()
+        self.free_cells.reset()
+
+        # add the new positions
+        for position in positions:
+            self.push_head(position)
+
+    def release(self):
+        """Remove the whole body from the board, handing its cells back to the free-cell index."""
+        while self.segments:
+            self.pop_tail()
+
+    @property
+    def head(self):
+        """Return the head position."""
+        return self.segments[-1]
+
+    @property
+    def tail(self):
+        """Return the tail position."""
+        return self.segments[0]
+
+    def push_head(self, position):
+        """Add a new head to the snake."""
+        cell = position[0] * self.size + position[1]
+        self.segments.append(position)
+        self.occupancy[cell] = 1
+        self.free_cells.remove(cell)
+
+    def pop_tail(self):
+        """Remove and return the tail of the snake."""
+        row, col = self.segments.popleft()
+        cell = row * self.size + col
+        self.occupancy[cell] = 0
+        self.free_cells.add(cell)
+        return row, col
+
+    def is_blocked(self, row, col):
+        """Check whether a cell is off the board or covered by the body."""
+        return not (0 <= row < self.size and 0 <= col < self.size) or self.occupancy[row * self.size + col] == 1
+
+    def free_count(self):
+        """Return the number of cells not covered by any body."""
+        return len(self.free_cells)
+
+    def random_free_position(self, rng):
+        """Return a uniformly random position not covered by the body, or None if the board is full."""
+        cell = self.free_cells.random_cell(rng)
+        return None if cell is None else divmod(cell, self.size)
+
+    def occupancy_plane(self):
+        """Return the occupancy of the board as a (size, size) uint8 view of the occupancy array."""
+        return np.frombuffer(self.occupancy, dtype=np.uint8).reshape(self.size, self.size)
+
+    def snapshot(self):
+        """Return the body as a tuple of cell ids (tail first), plus the occupancy and free-cell index as bytes."""
+        size = self.size
+        return tuple([row * size + col for row, col in self.segments]), bytes(self.occupancy), self.free_cells.snapshot()
+
+    def restore(self, snapshot, positions):
+        """
+        Restore the body from a snapshot.
+
+        Args:
+        - snapshot: a value returned by snapshot().
+        - positions: the (row, col) tuple of every cell id, so the restored body reuses existing tuples.
+        """
+        cells, occupancy, free_cells = snapshot
+
+        # rebuild the body and its occupancy
+        self.segments = deque([positions[cell] for cell in cells])
+        self.occupancy[:] = occupancy
+
+        # restore the free cells in the same order, so later food draws match
+        self.free_cells.restore(free_cells)
+
+    def copy(self):
+        """Return an independent copy of the body."""
+        body = SnakeBody.__new__(SnakeBody)
+        body.size = self.size
+        body.segments = self.segments.copy()
+        body.occupancy = bytearray(self.occupancy)
+        body.free_cells = self.free_cells.copy()
+        return body
+
+    def is_occupied(self, position):
+        """Check whether an on-board position is covered by the body."""
+        return self.occupancy[position[0] * self.size + position[1]] == 1
+
+    def __contains__(self, position):
+        # off-board positions are never part of the body
+        row, col = position
+        return 0 <= row < self.size and 0 <= col < self.size and self.occupancy[row * self.size + col] == 1
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __iter__(self):
+        return iter(self.segments)
+
+    def __getitem__(self, index):
+        # slices are returned as lists, matching the old list representation
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self.segments))
+            return list(islice(self.segments, start, stop, step)) if step > 0 else list(self.segments)[index]
+        return self.segments[index]
+
+    def __eq__(self, other):
+        if isinstance(other, SnakeBody):
+            return self.segments == other.segments
+        return list(self.segments) == list(other)
+
+    def __repr__(self):
+        return repr(list(self.segments))
@@ -5,10 +5,42 @@ import uuid
 from agents.snake.snake_action import SnakeAction
 from environments.environment_base import Environment
 from environments.snake.action_history import ActionHistory
-from environments.snake.reward_functions import improved_reward  # Updated to use improved_reward
+from environments.snake.bitboard_snake_body import BitboardSnakeBody
+from environments.snake.snake_body import SnakeBody
+from environments.snake.snake_observation import SnakeObservation
+from environments.snake.observation_buffer import ObservationBuffer
+from environments.snake.snake_renderer import SnakeRenderer
+from environments.snake.reward_functions import get_reward_function
+
+# row/column deltas indexed by direction index (SnakeAction value - 1): UP, RIGHT, DOWN, LEFT
+DIRECTION_DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+# the direction index that is a 180-degree turn from each direction index
+OPPOSITE_DIRECTIONS = (2, 3, 0, 1)
+
+# the valid SnakeAction values for each direction index (everything but the 180-degree turn)
+VALID_ACTIONS = tuple(
+    tuple(action for action in (SnakeAction.UP, SnakeAction.RIGHT, SnakeAction.DOWN, SnakeAction.LEFT) if action - 1 != OPPOSITE_DIRECTIONS[direction])
+    for direction in range(4)
+)
+
+def _read_only_mask(direction):
+    # build the mask over UP, RIGHT, DOWN, LEFT (indexed by SnakeAction value - 1)
+    mask = np.array([action - 1 != OPPOSITE_DIRECTIONS[direction] for action in range(1, 5)])
+    mask.flags.writeable = False
+    return mask
+
+# the valid action mask for each direction index
+VALID_ACTION_MASKS = tuple(_read_only_mask(direction) for direction in range(4))
+
+# the snake bodies selectable with the engine parameter, e.g. from the env_params in environment_config.json
+SNAKE_ENGINES = {
+    "grid": SnakeBody,
+    "bitboard": BitboardSnakeBody,
+}
 
 class SnakeEnv(Environment):
-    def __init__(self, size=10, agents=None):
+    def __init__(self, size=10, agents=None, obs_dtype="float64", copy_state=True, record_history=True, seed=None, reward_function="improved_reward", engine="grid", history_window=20, max_steps_without_food=100):
         # set the game_id
         self.game_id = str(uuid.uuid4())
         
@@ -23,15 +55,53 @@ class SnakeEnv(Environment):
             SnakeAction.LEFT: (0, -1)
         }
 
+        # set the reward function, either a registered name or a callable (only a name can be recorded)
+        self.reward_function = get_reward_function(reward_function).reward if isinstance(reward_function, str) else reward_function
+        self.reward_function_name = reward_function if isinstance(reward_function, str) else None
+
         # Initialize agents (if provided)
         self.agents = agents if agents else []  # Store agents
         
-        # set the steps, and steps since last food
+        # set the steps, and steps since last food (the snake starves after more than max_steps_without_food)
         self.steps = 0
         self.steps_since_last_food = 0
+        self.max_steps_without_food = max_steps_without_food
 
-        # reset action history
+        # reset action history, step_fast never records and step only records if record_history is set;
+        # the render shows only the last history_window records (all of them if it is None)
         self.action_history = ActionHistory()
+        self.history_window = history_window
+        self.record_history = record_history
+
+        # the (row, col) tuple of every cell, so moving the head does not build new tuples
+        self.positions = [(row, col) for row in range(size) for col in range(size)]
+
+        # the current direction as an index into DIRECTION_DELTAS
+        self.direction_index = 0
+
+        # every episode is played from its own seed, drawn from seed_sequence unless reset is given one,
+        # so any episode can be replayed from (episode_seed, actions)
+        self.seed_sequence = random.Random(seed)
+        self.episode_seed = None
+        self.rng = random.Random()
+
+        # an optional EpisodeRecorder that every game is written to
+        self.recorder = None
+
+        # the snake body, with O(1) move, grow and collision checks: "grid" keeps an occupancy array and a
+        # free-cell index, "bitboard" keeps one int per row (food is drawn differently, see BitboardSnakeBody)
+        if engine not in SNAKE_ENGINES:
+            raise ValueError(f"Snake engine '{engine}' not found")
+        self.engine = engine
+        self.body = SNAKE_ENGINES[engine](size)
+
+        # the observation, updated in place as the snake moves; get_state returns a copy of it
+        # unless copy_state is False, in which case it returns a read-only view of the live buffer
+        self.observation = ObservationBuffer(size, dtype=np.dtype(obs_dtype))
+        self.copy_state = copy_state
+
+        # the text render, created by the first get_render and then patched as the snake moves
+        self.renderer = None
         
         # reset the environment
         self.reset()
@@ -42,33 +112,77 @@ class SnakeEnv(Environment):
         """
         self.agents = agents
 
-    def place_food(self):
-        # loop
-        while True:
-            # place the food somewhere randomly
-            self.food = (random.randint(0, self.size-1), random.randint(0, self.size-1))
+    def attach_recorder(self, recorder):
+        """
+        Record every game from the next reset onwards with an EpisodeRecorder (None to stop recording).
 
-            # ensure the food is not in the snake
-            if self.food not in self.snake:
-                break
+        The recorder writes the size, engine, reward function and max_steps_without_food to its file, so they
+        must be this environment's.
+        """
+        if recorder is not None:
+            if self.reward_function_name is None:
+                raise ValueError("Only games with a registered reward function can be recorded")
+            if (recorder.size, recorder.engine, recorder.reward_function, recorder.max_steps_without_food) != (self.size, self.engine, self.reward_function_name, self.max_steps_without_food):
+                raise ValueError("The recorder was created for a different environment")
+        self.recorder = recorder
+
+    @property
+    def direction(self):
+        """The current direction as a (row, col) delta."""
+        return DIRECTION_DELTAS[self.direction_index]
+
+    @direction.setter
+    def direction(self, delta):
+        # store the direction as an index
+        self.direction_index = DIRECTION_DELTAS.index(tuple(delta))
+
+    @property
+    def snake(self):
+        """The snake body as an ordered sequence of (row, col) tuples, tail first and head last."""
+        return self.body
+
+    @snake.setter
+    def snake(self, positions):
+        # rebuild the body (and its occupancy) from the positions
+        self.body.reset(positions)
+
+        # repaint the observation and render to match
+        self.observation.repaint(self.body, getattr(self, 'food', None), None)
+        if self.renderer:
+            self.renderer.repaint(self.body, getattr(self, 'food', None))
+
+    def place_food(self):
+        # place the food on a random free cell, there is none once the snake fills the board
+        self.food = self.body.random_free_position(self.rng)
+        self.observation.set_food(self.food)
+        if self.renderer:
+            self.renderer.set_food(self.food)
 
-    def reset(self):
+    def reset(self, seed=None):
         # set the game_id
         self.game_id = str(uuid.uuid4())
 
+        # a recorder stores the seed as a uint64
+        if self.recorder and seed is not None and not (isinstance(seed, int) and 0 <= seed < 1 << 64):
+            raise ValueError(f"Recorded games need a seed between 0 and 2**64 - 1, got {seed!r}")
+
+        # seed the episode, food placement and the initial direction are drawn from self.rng
+        self.episode_seed = seed if seed is not None else self.seed_sequence.getrandbits(64)
+        self.rng.seed(self.episode_seed)
+
         # no game over
         self.game_over = False
+        self.won = False
 
         # self.snake is essentially a list of grid coordinates for the snake
         # the snake always starts at the center of the grid i.e. [5,5]
-        self.snake = [(self.size//2, self.size//2)]
+        self.body.reset([(self.size//2, self.size//2)])
 
         # place the food in the grid
         self.place_food()
 
         # Choose a random initial direction
-        initial_action = random.choice([SnakeAction(SnakeAction.UP), SnakeAction(SnakeAction.RIGHT), SnakeAction(SnakeAction.DOWN), SnakeAction(SnakeAction.LEFT)])
-        self.direction = self.direction_dict[initial_action.action]
+        self.direction_index = self.rng.randrange(4)
 
         # set steps since last food
         self.steps = 0
@@ -77,25 +191,29 @@ class SnakeEnv(Environment):
         # Reset the action history
         self.action_history.clear()
 
+        # repaint the observation and render for the new game
+        self.observation.repaint(self.body, self.food, None)
+        if self.renderer:
+            self.renderer.repaint(self.body, self.food)
+
+        # start a new game record
+        if self.recorder:
+            self.recorder.begin_game(self.episode_seed, self.direction_index + 1)
+
         # return the state
         return self.get_state()
     
     def get_next_head(self):
         # calculate the next position of the head without wrap around
-        return (self.snake[-1][0] + self.direction[0], 
-                self.snake[-1][1] + self.direction[1])
+        head_row, head_col = self.body.segments[-1]
+        delta_row, delta_col = DIRECTION_DELTAS[self.direction_index]
+        return (head_row + delta_row, head_col + delta_col)
 
     def is_valid_direction_change(self, action: SnakeAction):
         """
         Check if the direction change is valid (not a 180-degree turn).
         """
-        current_direction = next(key for key, value in self.direction_dict.items() if value == self.direction)
-        if (current_direction == SnakeAction.UP and action.action == SnakeAction.DOWN) or \
-           (current_direction == SnakeAction.DOWN and action.action == SnakeAction.UP) or \
-           (current_direction == SnakeAction.LEFT and action.action == SnakeAction.RIGHT) or \
-           (current_direction == SnakeAction.RIGHT and action.action == SnakeAction.LEFT):
-            return False
-        return True
+        return action.action - 1 != OPPOSITE_DIRECTIONS[self.direction_index]
     
     def is_valid_position(self, position):
         # get x,y from position
@@ -104,124 +222,142 @@ class SnakeEnv(Environment):
         # ensure within bounds of grid
         return 0 <= x < self.size and 0 <= y < self.size
     
-    def get_state(self):
-        # set the state to zero
-        state = np.zeros((self.size, self.size, 4))
-
-        # channel 0: the snake body
-        for i, j in self.snake:
-            # set the snake body
-            state[i, j, 0] = 1
-
-        # channel 1: the snake head
-        state[self.snake[-1][0], self.snake[-1][1], 1] = 1
-
-        # channel 2: set the food
-        state[self.food[0], self.food[1], 2] = 1
+    def get_state(self, copy=None):
+        """
+        Return the (size, size, 4) observation: channel 0 the snake body, 1 the head, 2 the food,
+        and 3 the cell the head moves into next.
 
-        # channel 3: Direction
+        Args:
+        - copy: True for a fresh array, False for a read-only view of the live buffer
+          (valid until the next step), None to use the copy_state setting.
+        """
+        # channel 3 follows the head and the direction, so refresh it first
         next_head = self.get_next_head()
-        if self.is_valid_position(next_head):
-            state[next_head[0], next_head[1], 3] = 1
+        self.observation.set_direction_cell(next_head if self.is_valid_position(next_head) else None)
 
         # return the state
-        return state
+        return self.observation.get(self.copy_state if copy is None else copy)
     
+    def get_observation(self):
+        """
+        Return the game as a SnakeObservation (head, live body, food, direction, valid action mask and
+        occupancy), for agents that work with positions rather than the array state.
+        """
+        return SnakeObservation(
+            self.size, self.body.segments[-1], self.body, self.food, self.direction_index + 1,
+            VALID_ACTION_MASKS[self.direction_index], self.body.occupancy_plane()
+        )
+
     def get_valid_actions(self):
         """
         Returns a list of valid actions based on the snake's current direction.
         Prevents the snake from turning into its own body (180-degree turn).
         
         Returns:
-            valid_actions (list): List of valid SnakeAction objects.
+            valid_actions (list): List of valid SnakeAction values.
         """
-        valid_actions = [SnakeAction.UP, SnakeAction.RIGHT, SnakeAction.DOWN, SnakeAction.LEFT]
-        current_direction = next(key for key, value in self.direction_dict.items() if value == self.direction)
-        
-        if current_direction == SnakeAction.UP:
-            valid_actions.remove(SnakeAction.DOWN)  # Remove invalid downward action
-        elif current_direction == SnakeAction.DOWN:
-            valid_actions.remove(SnakeAction.UP)    # Remove invalid upward action
-        elif current_direction == SnakeAction.LEFT:
-            valid_actions.remove(SnakeAction.RIGHT) # Remove invalid right action
-        elif current_direction == SnakeAction.RIGHT:
-            valid_actions.remove(SnakeAction.LEFT)  # Remove invalid left action
-        
-        return valid_actions
+        return list(VALID_ACTIONS[self.direction_index])
+
+    def valid_action_mask(self):
+        """
+        Return a read-only boolean mask over UP, RIGHT, DOWN, LEFT (indexed by SnakeAction value - 1)
+        that is False only for the 180-degree turn. The mask is shared, not rebuilt on each call.
+        """
+        return VALID_ACTION_MASKS[self.direction_index]
     
     def step(self, action: SnakeAction = SnakeAction.NONE, agent=None):
         # Ensure action is an instance of SnakeAction
         if not isinstance(action, SnakeAction):
             action = SnakeAction(action)
 
-        # Determine the previous direction before applying the new action
-        prev_direction = next(key for key, value in self.direction_dict.items() if value == self.direction)
-        
         # Log the current state before updating
-        self.action_history.add_record(
-            step=self.steps,
-            snake_head_position=self.snake[-1],
-            snake_direction=prev_direction,
-            snake_length=len(self.snake),
-            action=action
-        )
+        if self.record_history:
+            self.action_history.add_record(
+                step=self.steps,
+                snake_head_position=self.body.segments[-1],
+                snake_direction=self.direction_index + 1,
+                snake_length=len(self.body),
+                action=action
+            )
+
+        # take the step
+        state, reward, game_over = self.step_fast(action.action)
+
+        # update the agent's reward
+        if agent:
+            agent.add_reward(reward)
 
-        # Update direction only if a new direction is specified
-        if action.action != SnakeAction.NONE and self.is_valid_direction_change(action):
-            self.direction = self.direction_dict[action.action]
+        # return the state, reward and game over
+        return state, reward, game_over
 
-        # get the next position
-        new_head = self.get_next_head()
-        
-        # Check if snake has hit itself
-        if not self.is_valid_position(new_head) or new_head in self.snake[:-1]:
-            # game over
-            self.game_over = True
+    def step_fast(self, action: int):
+        """
+        Take a step with a plain SnakeAction value (0 = NONE, 1 = UP, 2 = RIGHT, 3 = DOWN, 4 = LEFT).
 
-            # Assign the reward for game over and update the agent's reward
-            reward = improved_reward(eaten=False, dead=True, steps=self.steps_since_last_food, repeated_action=(action == prev_direction), snake_head=self.snake[-1], food_position=self.food)
-            if agent:
-                agent.add_reward(reward)
+        Same rules and rewards as step, but without the SnakeAction wrapper, the action history or
+        agent rewards. Use copy_state=False to also avoid allocating the returned state.
+        """
+        # Check the action is a SnakeAction value, before it is recorded or changes the direction
+        if not 0 <= action <= 4:
+            raise ValueError(f"Invalid action: {action}")
 
-            return self.get_state(), reward, self.game_over
-        
-        # Check if we took too many steps
-        if self.steps_since_last_food > 100:
+        # record the action
+        if self.recorder:
+            self.recorder.record(action)
+
+        # Update direction only if a new direction is specified and it is not a 180-degree turn
+        if action != SnakeAction.NONE and action - 1 != OPPOSITE_DIRECTIONS[self.direction_index]:
+            self.direction_index = action - 1
+
+        # get the next position
+        head_row, head_col = self.body.segments[-1]
+        delta_row, delta_col = DIRECTION_DELTAS[self.direction_index]
+        new_row = head_row + delta_row
+        new_col = head_col + delta_col
+
+        # Check if snake has left the board or hit itself (the new head can never be the current head),
+        # or if we took too many steps
+        if self.body.is_blocked(new_row, new_col) or self.steps_since_last_food > self.max_steps_without_food:
             # game over
             self.game_over = True
 
-            # Assign the reward for game over and update the agent's reward
-            reward = improved_reward(eaten=False, dead=True, steps=self.steps_since_last_food, repeated_action=(action == prev_direction), snake_head=self.snake[-1], food_position=self.food)
-            if agent:
-                agent.add_reward(reward)
+            # Assign the reward for game over, step has never matched the SnakeAction it received
+            # against the previous direction value, so repeated_action is always False
+            reward = self.reward_function(False, True, self.steps_since_last_food, False, self.body.segments[-1], self.food)
 
             return self.get_state(), reward, self.game_over
 
         # add the new head to the snake
-        self.snake.append(new_head)
+        new_head = self.positions[new_row * self.size + new_col]
+        self.body.push_head(new_head)
+        self.observation.add_head(new_head)
+        if self.renderer:
+            self.renderer.add_head(new_head)
         
         # check if the snake ate the food
-        eaten = new_head == self.food
-
-        if eaten:
+        if new_head == self.food:
             # Place new food
             self.place_food()
 
-            # set the reward for eating and update the agent's reward
-            reward = improved_reward(eaten=True, dead=False, steps=self.steps_since_last_food, repeated_action=False, snake_head=self.snake[-1], food_position=self.food)
-            if agent:
-                agent.add_reward(reward)
+            # set the reward for eating
+            reward = self.reward_function(True, False, self.steps_since_last_food, False, new_head, self.food)
             
             # Reset steps since last food eaten
             self.steps_since_last_food = 0
+
+            # the snake has filled the board, so there is nowhere left to place food
+            if self.food is None:
+                self.game_over = True
+                self.won = True
         else:
             # Remove the tail if food wasn't eaten
-            self.snake.pop(0)
+            tail = self.body.pop_tail()
+            self.observation.remove_tail(tail)
+            if self.renderer:
+                self.renderer.remove_tail(tail)
 
-            # set the reward for moving and update the agent's reward
-            reward = improved_reward(eaten=False, dead=False, steps=self.steps_since_last_food, repeated_action=(action == prev_direction), snake_head=self.snake[-1], food_position=self.food)
-            if agent:
-                agent.add_reward(reward)
+            # set the reward for moving
+            reward = self.reward_function(False, False, self.steps_since_last_food, False, new_head, self.food)
 
             # increase steps since last food
             self.steps_since_last_food += 1
@@ -232,85 +368,102 @@ class SnakeEnv(Environment):
         # return the state, reward and game over
         return self.get_state(), reward, self.game_over
 
-    def get_render(self):
-        render_str = "\n"
-        grid = [['.' for _ in range(self.size)] for _ in range(self.size)]
+    def replay(self, seed, actions):
+        """
+        Replay an episode from its seed and SnakeAction values, yielding (state, reward, game_over)
+        after each step. The state before the first step is available from get_state().
+        """
+        # restart the episode from its seed
+        self.reset(seed=seed)
 
-        # Set the snake body position in the grid
-        for i, j in self.snake[:-1]:  # All but the last segment (head)
-            grid[i][j] = 'O'
+        # play the actions
+        for action in actions:
+            yield self.step_fast(int(action))
+            if self.game_over:
+                break
 
-        # Set the head of the snake (H) in the grid
-        head_x, head_y = self.snake[-1]
-        grid[head_x][head_y] = 'H'
+    def snapshot(self):
+        """
+        Capture the game (body, free cells, direction, food, counters and RNG state) as a compact tuple,
+        so a planner can return to this point with restore().
+        """
+        food = -1 if self.food is None else self.food[0] * self.size + self.food[1]
+        return (self.body.snapshot(), self.direction_index, food, self.steps, self.steps_since_last_food,
+                self.game_over, self.won, self.rng.getstate())
 
-        # Set the food position in the grid
-        food_x, food_y = self.food
-        grid[food_x][food_y] = 'F'
+    def restore(self, snapshot):
+        """
+        Return the game to a snapshot taken with snapshot() on an environment of the same size and engine.
+        """
+        body, self.direction_index, food, self.steps, self.steps_since_last_food, self.game_over, self.won, rng_state = snapshot
 
-        # Game Board Header
-        render_str += "Game Board:\n"
-        
-        # Convert grid to a string
-        grid_str = '\n'.join([' '.join(row) for row in grid])
-        render_str += grid_str + "\n\n"
-
-        # Game Instructions
-        instructions = [
-            "Game Instructions:",
-            "-" * 35,
-            "1. Control the snake to eat the food (F).",
-            "2. Use actions to move the snake (UP, DOWN, LEFT, RIGHT).",
-            "3. Avoid hitting the walls or the snake’s own body.",
-            "4. The game ends when the snake dies or reaches a length limit.",
-            "-" * 35,
-        ]
-        
-        # Game details
-        game_state = [
-            "Game Information:",
-            "-" * 35,
-            f" Game ID             : {self.game_id}",
-            f" Steps Taken         : {self.steps}",
-            f" Steps Since Last Food: {self.steps_since_last_food}",
-            f" Snake Length        : {len(self.snake)}",
-            f" Snake Head Position : {self.snake[-1]}",
-            f" Food Position       : {self.food}",
-            f" Game Over           : {self.game_over}",
-            "-" * 35,
-        ]
-
-        # Legend
-        legend = [
-            "Legend:",
-            "-" * 35,
-            " H - Head of the snake",
-            " O - Body of the snake",
-            " F - Food",
-            " . - Empty space",
-            "-" * 35,
-        ]
-        
-        # Action History
-        action_history_str = "\nAction History:\n" + "-" * 35 + "\n"
-        if self.action_history.get_history():
-            for record in self.action_history.get_history():
-                direction = str(SnakeAction(record['snake_direction']))
-                action = str(SnakeAction(record['action'].action))
-                action_history_str += (
-                    f" Step: {record['step']}, Position: {record['snake_head_position']}, "
-                    f"Direction: {direction}, Length: {record['snake_length']}, Action: {action}\n"
-                )
-        else:
-            action_history_str += " No actions have been made yet."
-        
-        action_history_str += "-" * 35
-        
-        # Combine all parts for the final render string
-        render_str += "\n".join(instructions) + "\n\n" + "\n".join(game_state) + "\n\n" + "\n".join(legend) + "\n\n" + action_history_str
+        # rebuild the body and food
+        self.body.restore(body, self.positions)
+        self.food = None if food < 0 else self.positions[food]
+
+        # rewind the food placement RNG
+        self.rng.setstate(rng_state)
 
-        return render_str
+        # repaint the observation and render
+        self.observation.repaint(self.body, self.food, None)
+        if self.renderer:
+            self.renderer.repaint(self.body, self.food)
+
+    def clone(self):
+        """
+        Return an independent copy of the game for lookahead, without the agents or action history.
+        """
+        env = SnakeEnv.__new__(SnakeEnv)
+
+        # share the immutable parts
+        env.game_id = self.game_id
+        env.size = self.size
+        env.engine = self.engine
+        env.direction_dict = self.direction_dict
+        env.reward_function = self.reward_function
+        env.reward_function_name = self.reward_function_name
+        env.max_steps_without_food = self.max_steps_without_food
+        env.positions = self.positions
+        env.agents = []
+
+        # a clone starts with an empty history, does not record and renders from scratch
+        env.action_history = ActionHistory()
+        env.history_window = self.history_window
+        env.record_history = False
+        env.recorder = None
+        env.renderer = None
+
+        # copy the RNGs, so the clone draws the same food as the original would
+        env.seed_sequence = random.Random()
+        env.seed_sequence.setstate(self.seed_sequence.getstate())
+        env.episode_seed = self.episode_seed
+        env.rng = random.Random()
+        env.rng.setstate(self.rng.getstate())
+
+        # copy the game
+        env.body = self.body.copy()
+        env.observation = self.observation.copy()
+        env.copy_state = self.copy_state
+        env.direction_index = self.direction_index
+        env.food = self.food
+        env.steps = self.steps
+        env.steps_since_last_food = self.steps_since_last_food
+        env.game_over = self.game_over
+        env.won = self.won
+        return env
+
+    def get_render(self):
+        """
+        Return the text render of the game: the board, the game information and the last
+        history_window actions. The render is built incrementally, so its cost does not grow with the game.
+        """
+        # draw the board from scratch the first time
+        if self.renderer is None:
+            self.renderer = SnakeRenderer(self.size, self.history_window)
+            self.renderer.repaint(self.body, self.food)
 
+        # return the render
+        return self.renderer.render(self)
 
     def render(self):
         # Clear the console
@@ -0,0 +1,44 @@
+# File: environments/snake/snake_observation.py
+class SnakeObservation:
+    """
+    A snake game as positions, published by SnakeEnv.get_observation (and MultiSnakeEnv, per player)
+    alongside the array state, so classic agents can read the head, body and food directly instead of
+    searching the state tensor for them.
+
+    Attributes:
+    - size: the size of the board.
+    - head: the (row, col) of the head (None for a dead snake in MultiSnakeEnv).
+    - body: the live snake body, tail first and head last. It supports len, iteration, indexing and an O(1)
+      (row, col) in body test, and must not be modified.
+    - food: the (row, col) of the food (the nearest food in MultiSnakeEnv), None if there is none.
+    - direction: the current direction as a SnakeAction value (1 = UP, 2 = RIGHT, 3 = DOWN, 4 = LEFT).
+    - valid_action_mask: read-only boolean mask over UP, RIGHT, DOWN, LEFT, False for the 180-degree turn.
+    - occupancy: (size, size) uint8 array of the cells covered by a body (every snake in MultiSnakeEnv).
+    """
+
+    __slots__ = ("size", "head", "body", "food", "direction", "valid_action_mask", "occupancy")
+
+    def __init__(self, size, head, body, food, direction, valid_action_mask, occupancy):
+        # set the fields
+        self.size = size
+        self.head = head
+        self.body = body
+        self.food = food
+        self.direction = direction
+        self.valid_action_mask = valid_action_mask
+        self.occupancy = occupancy
+
+    @property
+    def length(self):
+        """The length of the snake."""
+        return len(self.body)
+
+    def to_dict(self):
+        """Return the observation as plain values, for logging."""
+        return {
+            "size": self.size,
+            "head": self.head,
+            "body": list(self.body),
+            "food": self.food,
+            "direction": self.direction,
+        }
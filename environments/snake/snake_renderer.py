@@ -0,0 +1,162 @@
+# File: environments/snake/snake_renderer.py
+from collections import deque
+from agents.snake.snake_action import SnakeAction
+
+# the sections of the render that never change
+INSTRUCTIONS = "\n".join([
+    "Game Instructions:",
+    "-" * 35,
+    "1. Control the snake to eat the food (F).",
+    "2. Use actions to move the snake (UP, DOWN, LEFT, RIGHT).",
+    "3. Avoid hitting the walls or the snake’s own body.",
+    "4. The game ends when the snake dies or reaches a length limit.",
+    "-" * 35,
+])
+
+LEGEND = "\n".join([
+    "Legend:",
+    "-" * 35,
+    " H - Head of the snake",
+    " O - Body of the snake",
+    " F - Food",
+    " . - Empty space",
+    "-" * 35,
+])
+
+def format_record(record):
+    """Format one action history record as a line of the render."""
+    direction = str(SnakeAction(record['snake_direction']))
+    action = str(SnakeAction(record['action'].action))
+    return (
+        f" Step: {record['step']}, Position: {record['snake_head_position']}, "
+        f"Direction: {direction}, Length: {record['snake_length']}, Action: {action}"
+    )
+
+class SnakeRenderer:
+    """
+    Builds the SnakeEnv text render incrementally.
+
+    The grid is kept as rows of characters that SnakeEnv patches as the snake moves (the same deltas it
+    applies to its ObservationBuffer), and only the rows that changed are joined again. The static sections
+    are built once, and only the last history_window action history lines are shown (all of them if it is
+    None), each formatted once. A render therefore costs the same on step 10 as on step 10,000.
+    """
+
+    def __init__(self, size, history_window=None):
+        # set the size and the number of action history lines shown
+        self.size = size
+        self.history_window = history_window
+
+        # the grid characters, the joined row strings and the rows that need joining again
+        self.grid = [['.'] * size for _ in range(size)]
+        self.rows = [' '.join(row) for row in self.grid]
+        self.dirty_rows = set()
+
+        # the cells currently drawn as the head and the food
+        self.head = None
+        self.food = None
+
+        # the formatted action history lines shown, and the history generation and length they reflect
+        self.history_lines = deque()
+        self.history_generation = None
+        self.history_total = 0
+
+    def set_cell(self, position, char):
+        """Draw a character in a cell."""
+        self.grid[position[0]][position[1]] = char
+        self.dirty_rows.add(position[0])
+
+    def repaint(self, body, food):
+        """Redraw the whole grid from a snake body and food (used on reset and restore)."""
+        # clear the grid
+        for row in self.grid:
+            row[:] = ['.'] * self.size
+        self.dirty_rows.update(range(self.size))
+        self.head = None
+        self.food = None
+
+        # draw the body, then the head and the food
+        for position in body:
+            self.set_cell(position, 'O')
+        if len(body):
+            self.add_head(body.head)
+        self.set_food(food)
+
+    def add_head(self, position):
+        """The snake moved (or grew) into position."""
+        # the old head is now just body
+        if self.head is not None:
+            self.set_cell(self.head, 'O')
+        self.set_cell(position, 'H')
+        self.head = position
+
+    def remove_tail(self, position):
+        """The tail left position."""
+        self.set_cell(position, '.')
+
+    def set_food(self, position):
+        """Move the food to position (None once the board is full)."""
+        # the old food cell is empty again, unless the snake has just eaten it
+        if self.food is not None and self.grid[self.food[0]][self.food[1]] == 'F':
+            self.set_cell(self.food, '.')
+        if position is not None:
+            self.set_cell(position, 'F')
+        self.food = position
+
+    def get_board(self):
+        """Return the grid as text, joining only the rows that changed since the last call."""
+        for row in self.dirty_rows:
+            self.rows[row] = ' '.join(self.grid[row])
+        self.dirty_rows.clear()
+        return '\n'.join(self.rows)
+
+    def get_history(self, action_history):
+        """Return the action history section, formatting only the records added since the last call."""
+        # start over when the history was cleared
+        if action_history.generation != self.history_generation:
+            self.history_lines = deque(maxlen=self.history_window)
+            self.history_generation = action_history.generation
+            self.history_total = 0
+
+        # format the new records that fall in the window
+        history = action_history.history
+        start = self.history_total
+        if self.history_window is not None:
+            start = max(start, len(history) - self.history_window)
+        self.history_lines.extend(format_record(record) for record in history[start:])
+        self.history_total = len(history)
+
+        # build the section
+        lines = ["", "Action History:", "-" * 35]
+        if self.history_lines:
+            hidden = len(action_history.history) - len(self.history_lines)
+            if hidden:
+                lines.append(f" ({hidden} earlier actions not shown)")
+            lines.extend(self.history_lines)
+        else:
+            lines.append(" No actions have been made yet.")
+        lines.append("-" * 35)
+        return "\n".join(lines)
+
+    def render(self, env):
+        """Return the full render of a SnakeEnv."""
+        # Game details
+        game_state = "\n".join([
+            "Game Information:",
+            "-" * 35,
+            f" Game ID             : {env.game_id}",
+            f" Steps Taken         : {env.steps}",
+            f" Steps Since Last Food: {env.steps_since_last_food}",
+            f" Snake Length        : {len(env.body)}",
+            f" Snake Head Position : {env.body.head}",
+            f" Food Position       : {env.food}",
+            f" Game Over           : {env.game_over}",
+            f" Board Filled        : {env.won}",
+            "-" * 35,
+        ])
+
+        # Combine all parts for the final render string
+        return (
+            "\nGame Board:\n" + self.get_board() + "\n\n" + INSTRUCTIONS + "\n\n" + game_state + "\n\n" + LEGEND + "\n\n"
+            + self.get_history(env.action_history)
+        )
@@ -0,0 +1,205 @@
+# File: environments/snake/vector_snake_environment.py
+import numpy as np
+from agents.snake.snake_action import SnakeAction
+from environments.snake.reward_functions import get_reward_function
+
+# row/column deltas indexed by direction index (SnakeAction value - 1): UP, RIGHT, DOWN, LEFT
+DIRECTION_DELTAS = np.array([(-1, 0), (0, 1), (1, 0), (0, -1)], dtype=np.int64)
+
+# the direction index that is a 180-degree turn from each direction index
+OPPOSITE_DIRECTIONS = np.array([2, 3, 0, 1], dtype=np.int64)
+
+class VectorSnakeEnv:
+    """
+    Runs num_envs independent games of snake in lockstep, keeping every game in stacked arrays.
+
+    The rules match SnakeEnv.step: a 180-degree turn or NONE keeps the current direction, leaving the
+    board or entering any body cell is death, more than max_steps_without_food steps without food is death, and rewards
+    come from the batch form of the named reward function. Finished games are reset automatically, so the state returned for a game
+    that is done is the first state of its next game.
+    """
+
+    def __init__(self, num_envs, size=10, seed=None, dtype=np.float64, reward_function="improved_reward", max_steps_without_food=100):
+        # set the number of environments and the board size
+        self.num_envs = num_envs
+        self.size = size
+        self.num_cells = size * size
+        self.dtype = dtype
+
+        # set the batch reward function, either a registered name or a callable
+        self.reward_function = get_reward_function(reward_function).batch if isinstance(reward_function, str) else reward_function
+
+        # set the random generator used for food placement and initial directions
+        self.rng = np.random.default_rng(seed)
+
+        # the snake bodies are ring buffers of cell ids, the head lives at head_index
+        self.bodies = np.zeros((num_envs, self.num_cells), dtype=np.int64)
+        self.head_index = np.zeros(num_envs, dtype=np.int64)
+        self.lengths = np.zeros(num_envs, dtype=np.int64)
+
+        # occupancy of each board by the snake body (head included)
+        self.occupancy = np.zeros((num_envs, self.num_cells), dtype=bool)
+
+        # head cell, food cell (-1 once the board is full), and direction index of each game
+        self.heads = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.zeros(num_envs, dtype=np.int64)
+        self.directions = np.zeros(num_envs, dtype=np.int64)
+
+        # per game step counters, a snake starves after more than max_steps_without_food steps without food
+        self.max_steps_without_food = max_steps_without_food
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.steps_since_last_food = np.zeros(num_envs, dtype=np.int64)
+
+        # index of every environment, used for fancy indexing
+        self.env_indices = np.arange(num_envs)
+
+        # reset all of the games
+        self.reset()
+
+    def reset(self, seed=None):
+        """Reset every game and return the stacked states, reseeding the random generator if a seed is given."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.env_indices)
+        return self.get_states()
+
+    def reset_envs(self, env_ids):
+        """Reset the given games to a length one snake in the centre of the board."""
+        # nothing to reset
+        if len(env_ids) == 0:
+            return
+
+        # clear the boards and place the snake in the centre
+        center = (self.size // 2) * self.size + self.size // 2
+        self.occupancy[env_ids] = False
+        self.occupancy[env_ids, center] = True
+        self.bodies[env_ids, 0] = center
+        self.head_index[env_ids] = 0
+        self.lengths[env_ids] = 1
+        self.heads[env_ids] = center
+
+        # place the food, then choose a random initial direction (same order as SnakeEnv.reset)
+        self.food[env_ids] = self.sample_free_cells(env_ids)
+        self.directions[env_ids] = self.rng.integers(0, 4, size=len(env_ids))
+
+        # reset the counters
+        self.steps[env_ids] = 0
+        self.steps_since_last_food[env_ids] = 0
+
+    def sample_free_cells(self, env_ids):
+        """Draw a uniformly random free cell for each given game, or -1 if its board is full."""
+        # score every cell at random and knock out the occupied ones
+        scores = self.rng.random((len(env_ids), self.num_cells))
+        scores[self.occupancy[env_ids]] = -1.0
+
+        # the highest scoring free cell is a uniform draw over the free cells
+        cells = np.argmax(scores, axis=1)
+        return np.where(scores[np.arange(len(env_ids)), cells] >= 0.0, cells, -1)
+
+    def step(self, actions):
+        """
+        Advance every game by one step.
+
+        Args:
+        - actions: integer array of SnakeAction values (0 = NONE, 1 = UP, 2 = RIGHT, 3 = DOWN, 4 = LEFT).
+
+        Returns:
+        - states, rewards and dones for every game.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+
+        # turn only for a real direction that is not a 180-degree turn
+        requested = actions - 1
+        turn = (actions != SnakeAction.NONE) & (requested != OPPOSITE_DIRECTIONS[self.directions])
+        self.directions = np.where(turn, requested, self.directions)
+
+        # get the next head position
+        head_rows, head_cols = np.divmod(self.heads, self.size)
+        deltas = DIRECTION_DELTAS[self.directions]
+        new_rows = head_rows + deltas[:, 0]
+        new_cols = head_cols + deltas[:, 1]
+        in_bounds = (new_rows >= 0) & (new_rows < self.size) & (new_cols >= 0) & (new_cols < self.size)
+        new_heads = np.where(in_bounds, new_rows * self.size + new_cols, 0)
+
+        # the snake dies by leaving the board or running into its body (the tail included)
+        collided = ~in_bounds | self.occupancy[self.env_indices, new_heads]
+
+        # or by taking too many steps without food
+        starved = ~collided & (self.steps_since_last_food > self.max_steps_without_food)
+        dead = collided | starved
+        alive = ~dead
+
+        # check which snakes ate and which simply moved
+        eaten = alive & (new_heads == self.food)
+        moved = alive & ~eaten
+
+        # compute the rewards before the counters change
+        rewards = self.compute_rewards(eaten, dead, new_rows, new_cols)
+
+        # remove the tail of every snake that moved without eating
+        moved_ids = self.env_indices[moved]
+        tail_index = (self.head_index[moved_ids] - self.lengths[moved_ids] + 1) % self.num_cells
+        self.occupancy[moved_ids, self.bodies[moved_ids, tail_index]] = False
+
+        # add the new head to every living snake
+        alive_ids = self.env_indices[alive]
+        self.head_index[alive_ids] = (self.head_index[alive_ids] + 1) % self.num_cells
+        self.bodies[alive_ids, self.head_index[alive_ids]] = new_heads[alive_ids]
+        self.occupancy[alive_ids, new_heads[alive_ids]] = True
+        self.heads[alive_ids] = new_heads[alive_ids]
+
+        # grow the snakes that ate and place their new food
+        eaten_ids = self.env_indices[eaten]
+        self.lengths[eaten_ids] += 1
+        self.food[eaten_ids] = self.sample_free_cells(eaten_ids)
+
+        # update the counters
+        self.steps_since_last_food[moved_ids] += 1
+        self.steps_since_last_food[eaten_ids] = 0
+        self.steps[alive_ids] += 1
+
+        # a game also ends once the snake fills the whole board
+        dones = dead | (self.food < 0)
+
+        # reset the finished games
+        self.reset_envs(self.env_indices[dones])
+
+        # return the states, rewards and dones
+        return self.get_states(), rewards, dones
+
+    def compute_rewards(self, eaten, dead, new_rows, new_cols):
+        """Compute the rewards for the current step with the batch reward function."""
+        # the new heads and the food, as (num_envs, 2) arrays
+        snake_heads = np.stack((new_rows, new_cols), axis=1)
+        food_positions = np.stack(np.divmod(self.food, self.size), axis=1)
+
+        # SnakeEnv never applies the repetition penalty (see SnakeEnv.step_fast)
+        repeated_action = np.zeros(self.num_envs, dtype=bool)
+
+        # compute the rewards
+        return self.reward_function(eaten, dead, self.steps_since_last_food, repeated_action, snake_heads, food_positions)
+
+    def get_states(self):
+        """Return the (num_envs, size, size, 4) states, using the same channels as SnakeEnv.get_state."""
+        states = np.zeros((self.num_envs, self.num_cells, 4), dtype=self.dtype)
+
+        # channel 0: the snake body
+        states[:, :, 0] = self.occupancy
+
+        # channel 1: the snake head
+        states[self.env_indices, self.heads, 1] = 1
+
+        # channel 2: the food (there is none once the board is full)
+        has_food = self.food >= 0
+        states[self.env_indices[has_food], self.food[has_food], 2] = 1
+
+        # channel 3: the next head position, if it is on the board
+        head_rows, head_cols = np.divmod(self.heads, self.size)
+        deltas = DIRECTION_DELTAS[self.directions]
+        next_rows = head_rows + deltas[:, 0]
+        next_cols = head_cols + deltas[:, 1]
+        valid = (next_rows >= 0) & (next_rows < self.size) & (next_cols >= 0) & (next_cols < self.size)
+        states[self.env_indices[valid], (next_rows * self.size + next_cols)[valid], 3] = 1
+
+        # return the states in board shape
+        return states.reshape(self.num_envs, self.size, self.size, 4)
@@ -5,22 +5,46 @@ import logging
 from datetime import datetime
 from environments.environment_base import Environment
 from environments.tic_tac_toe.action_history import ActionHistory
+from environments.tic_tac_toe.tic_tac_toe_observation import TicTacToeObservation
 from environments.tic_tac_toe.reward_functions import simple_reward
+from environments.tic_tac_toe.win_lines import cell_line_masks
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TicTacToeEnv(Environment):
-    def __init__(self, player_x_id="PlayerX", player_o_id="PlayerO", player_x_type="AI", player_o_type="AI", reward_function=simple_reward):
+    """
+    Tic tac toe on a rows x cols board, won by win_length marks in a row (an m,n,k game, 3x3 with 3 in a
+    row by default). Actions number the cells row by row from 1. Each player's marks are also kept as a
+    bitboard, so a move is checked for a win against the masks of the lines through its cell only.
+    """
+
+    def __init__(self, player_x_id="PlayerX", player_o_id="PlayerO", player_x_type="AI", player_o_type="AI", reward_function=simple_reward, rows=3, cols=3, win_length=3, render_on_step=True):
+        # Board shape and the marks in a row needed to win
+        if win_length > max(rows, cols):
+            raise ValueError(f"A {rows}x{cols} board has no line of {win_length}")
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self.num_cells = rows * cols
+
+        # the masks of the winning lines through each cell, and of every line
+        self.cell_line_masks = cell_line_masks(rows, cols, win_length)
+        self.line_masks = sorted(set(mask for masks in self.cell_line_masks for mask in masks))
+
+        # Whether step renders the board (main_simple renders after each step itself)
+        self.render_on_step = render_on_step
+
         # Player information
         self.player_x_id = player_x_id
         self.player_o_id = player_o_id
         self.player_x_type = player_x_type
         self.player_o_type = player_o_type
         
-        # Initialize the board (3x3 grid), 0 = empty, 1 = 'X', 2 = 'O'
-        self.board = np.zeros((3, 3), dtype=int)
+        # Initialize the board, 0 = empty, 1 = 'X', 2 = 'O', and the bitboard of each player (indexed by player)
+        self.board = np.zeros((rows, cols), dtype=int)
+        self.bitboards = [0, 0, 0]
         
         # Current player (1 for 'X', 2 for 'O')
         self.current_player = 1
@@ -89,7 +113,8 @@ class TicTacToeEnv(Environment):
         self.game_end_time = None
 
         # Reset the board and game status
-        self.board = np.zeros((3, 3), dtype=int)
+        self.board = np.zeros((self.rows, self.cols), dtype=int)
+        self.bitboards = [0, 0, 0]
         self.game_over = False
         self.steps = 0
         self.result_message = "Game is ongoing."
@@ -130,8 +155,8 @@ class TicTacToeEnv(Environment):
 
     def step(self, action, agent=None):
         """
-        Take a step in the environment. The action is expected to be a number from 1 to 9,
-        representing the position where the current player wants to place their mark.
+        Take a step in the environment. The action is expected to be a number from 1 to rows * cols
+        (1 to 9 on the 3x3 board), representing the position where the current player wants to place their mark.
         """
         # Check if the game is over
         if self.game_over:
@@ -147,23 +172,21 @@ class TicTacToeEnv(Environment):
 
 
         # Check the move is valid
-        if action not in range(1, 10):
-            raise ValueError(f"Invalid move: {action}. Must be between 1 and 9.")
+        if action not in range(1, self.num_cells + 1):
+            raise ValueError(f"Invalid move: {action}. Must be between 1 and {self.num_cells}.")
 
-        # Convert the action (1-9) into row, col coordinates
-        action_map = {
-            1: (0, 0), 2: (0, 1), 3: (0, 2),
-            4: (1, 0), 5: (1, 1), 6: (1, 2),
-            7: (2, 0), 8: (2, 1), 9: (2, 2)
-        }
+        # Convert the action into the cell and its row, col coordinates
+        cell = int(action) - 1
+        row, col = divmod(cell, self.cols)
 
         # Check the move is valid
-        row, col = action_map[action]
-        if self.board[row, col] != 0:
+        bit = 1 << cell
+        if (self.bitboards[1] | self.bitboards[2]) & bit:
             raise ValueError(f"Invalid action: Cell ({row}, {col}) is already occupied.")
 
         # Place the player's mark
         self.board[row, col] = self.current_player
+        self.bitboards[self.current_player] |= bit
         self.steps += 1
 
         # Determine the current player role ('X' or 'O')
@@ -176,8 +199,8 @@ class TicTacToeEnv(Environment):
             action=action
         )
 
-        # Check if the current player wins
-        if self.check_win(self.current_player):
+        # Check if the current player wins, on the lines through the cell just played
+        if self.is_winning_move(cell, self.current_player):
             self.game_over = True
             self.result_message = f"Player {player_role} wins!"
             self.game_end_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -191,7 +214,7 @@ class TicTacToeEnv(Environment):
             return self.get_state(), reward, self.game_over
 
         # Check for draw
-        if self.steps == 9:
+        if self.steps == self.num_cells:
             self.game_over = True
             self.result_message = "The game is a draw."
             self.game_end_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -212,7 +235,8 @@ class TicTacToeEnv(Environment):
             agent.add_reward(reward)
 
         # Render before switching player
-        self.render()
+        if self.render_on_step:
+            self.render()
 
         # Switch to the next player
         self.current_player = 2 if self.current_player == 1 else 1
@@ -221,25 +245,90 @@ class TicTacToeEnv(Environment):
         return self.get_state(), reward, self.game_over
 
 
+    def reset_fast(self):
+        """
+        Reset the board for another headless game: same as reset, but without a new game id, timestamps, the
+        action history or the agents (who keep their players).
+        """
+        self.board = np.zeros((self.rows, self.cols), dtype=int)
+        self.bitboards = [0, 0, 0]
+        self.game_over = False
+        self.steps = 0
+        self.result_message = "Game is ongoing."
+        self.current_player = 1
+
+    def step_fast(self, action: int):
+        """
+        Take a step with an action from 1 to rows * cols, for headless games such as self-play training.
+
+        Same rules and rewards as step, but without the action history, agent rewards, timestamps or rendering,
+        and returning the live board (valid until the next step) rather than a copy.
+        """
+        # Check if the game is over
+        if self.game_over:
+            raise ValueError("Game is over. Please reset the environment.")
+
+        # Check the move is on the board, then that its cell is empty
+        cell = action - 1
+        if not 0 <= cell < self.num_cells:
+            raise ValueError(f"Invalid action: {action}.")
+        bit = 1 << cell
+        if (self.bitboards[1] | self.bitboards[2]) & bit:
+            raise ValueError(f"Invalid action: {action}.")
+
+        # Place the player's mark
+        self.board.flat[cell] = self.current_player
+        self.bitboards[self.current_player] |= bit
+        self.steps += 1
+
+        # Check for a win on the lines through the cell, then for a draw
+        if self.is_winning_move(cell, self.current_player):
+            self.game_over = True
+            self.result_message = f"Player {'X' if self.current_player == 1 else 'O'} wins!"
+            return self.board, self.reward_function(won=True, draw=False, ongoing=False), True
+        if self.steps == self.num_cells:
+            self.game_over = True
+            self.result_message = "The game is a draw."
+            return self.board, self.reward_function(won=False, draw=True, ongoing=False), True
+
+        # Switch to the next player
+        self.current_player = 2 if self.current_player == 1 else 1
+        return self.board, self.reward_function(won=False, draw=False, ongoing=True), False
+
     def get_state(self):
         # Return the current board state
         return np.copy(self.board)
     
+    def get_observation(self):
+        """
+        Return the position as a TicTacToeObservation (board, cells tuple, current player and valid actions),
+        for agents that check lines and moves on plain values rather than the array state.
+        """
+        board = np.copy(self.board)
+        return TicTacToeObservation(tuple(board.ravel().tolist()), self.current_player, board=board, rows=self.rows, cols=self.cols, win_length=self.win_length)
+
     def get_valid_moves(self):
         """Return a list of valid moves (empty cells) from the current board state."""
-        return [i+1 for i, cell in enumerate(self.board.flatten()) if cell == 0]
+        occupied = self.bitboards[1] | self.bitboards[2]
+        return [cell + 1 for cell in range(self.num_cells) if not occupied >> cell & 1]
+
+    def is_winning_move(self, cell, player):
+        """
+        Check if the mark the player just placed on a cell completes a line.
+        """
+        bitboard = self.bitboards[player]
+        for mask in self.cell_line_masks[cell]:
+            if bitboard & mask == mask:
+                return True
+        return False
 
     def check_win(self, player):
         """
         Check if the given player has won the game.
         """
-        # Check rows, columns, and diagonals for a win
-        return (
-            np.any(np.all(self.board == player, axis=0)) or  # Check columns
-            np.any(np.all(self.board == player, axis=1)) or  # Check rows
-            np.all(np.diag(self.board) == player) or  # Check main diagonal
-            np.all(np.diag(np.fliplr(self.board)) == player)  # Check anti-diagonal
-        )
+        # Check every line against the player's bitboard
+        bitboard = self.bitboards[player]
+        return any(bitboard & mask == mask for mask in self.line_masks)
 
     def render(self):
         # Clear the console
@@ -261,19 +350,22 @@ class TicTacToeEnv(Environment):
 
         render_str += "\n"
         
-        # Add Game Instructions
+        # Add Game Instructions, with the action number of each cell
+        width = len(str(self.num_cells))
+        grid = [
+            "   " + " | ".join(str(row * self.cols + col + 1).rjust(width) for col in range(self.cols))
+            for row in range(self.rows)
+        ]
         instructions = [
             "Game Instructions:",
             "-" * 35,
-            "1. The game is played on a 3x3 grid.",
+            f"1. The game is played on a {self.rows}x{self.cols} grid.",
             "2. Player X always goes first, followed by Player O.",
             "3. Players take turns placing their mark (X or O) in an empty cell.",
-            "4. To make a move, select a number from 1 to 9 corresponding to the position on the grid:",
-            "   1 | 2 | 3",
-            "   4 | 5 | 6",
-            "   7 | 8 | 9",
-            "5. The first player to get 3 of their marks in a row (horizontally, vertically, or diagonally) wins.",
-            "6. If all 9 cells are filled and no player has 3 in a row, the game is a draw.",
+            f"4. To make a move, select a number from 1 to {self.num_cells} corresponding to the position on the grid:",
+            *grid,
+            f"5. The first player to get {self.win_length} of their marks in a row (horizontally, vertically, or diagonally) wins.",
+            f"6. If all {self.num_cells} cells are filled and no player has {self.win_length} in a row, the game is a draw.",
             "-" * 35,
         ]
 
@@ -0,0 +1,54 @@
+# File: environments/tic_tac_toe/tic_tac_toe_observation.py
+import numpy as np
+
+class TicTacToeObservation:
+    """
+    A tic tac toe position, published by TicTacToeEnv.get_observation alongside the array state, so
+    classic agents can check lines and moves on plain tuples instead of slicing numpy arrays.
+
+    Attributes:
+    - cells: the board as a tuple of rows * cols ints (0 = empty, 1 = X, 2 = O), cell i holding action i + 1.
+    - current_player: the player to move (1 for X, 2 for O).
+    - valid_actions: the empty cells as a tuple of actions (1 to rows * cols), in ascending order.
+    - rows, cols, win_length: the board shape and the marks in a row needed to win.
+    - board: the rows x cols board as an array, the same as get_state() (built on first use).
+    - valid_action_mask: boolean array over the actions, True for the empty cells (built on first use).
+    """
+
+    __slots__ = ("cells", "current_player", "valid_actions", "rows", "cols", "win_length", "_board")
+
+    def __init__(self, cells, current_player, valid_actions=None, board=None, rows=3, cols=3, win_length=3):
+        # set the fields, finding the valid actions if they are not given
+        self.cells = cells
+        self.current_player = current_player
+        self.valid_actions = valid_actions if valid_actions is not None else tuple([index + 1 for index, cell in enumerate(cells) if cell == 0])
+        self.rows = rows
+        self.cols = cols
+        self.win_length = win_length
+        self._board = board
+
+    @property
+    def board(self):
+        """The board as an array."""
+        if self._board is None:
+            self._board = np.array(self.cells).reshape(self.rows, self.cols)
+        return self._board
+
+    @property
+    def valid_action_mask(self):
+        """Boolean array over the actions, True for the empty cells."""
+        return np.array(self.cells) == 0
+
+    def apply_action(self, action, player):
+        """Return the observation after a player takes an action (the other player moves next)."""
+        index = action - 1
+        cells = self.cells[:index] + (player,) + self.cells[index + 1:]
+        valid_actions = tuple([valid_action for valid_action in self.valid_actions if valid_action != action])
+        return TicTacToeObservation(cells, 3 - player, valid_actions, rows=self.rows, cols=self.cols, win_length=self.win_length)
+
+    def to_dict(self):
+        """Return the observation as plain values, for logging."""
+        return {
+            "board": [list(self.cells[row * self.cols:(row + 1) * self.cols]) for row in range(self.rows)],
+            "current_player": self.current_player,
+        }
@@ -0,0 +1,36 @@
+# File: environments/tic_tac_toe/win_lines.py
+"""
+The winning lines of an m,n,k board (rows x cols, win_length in a row to win), as cell tuples and as
+bitmasks. Cells are row-major indices and cell i is bit i of a bitboard.
+"""
+
+# the (row, col) steps of the four line directions: across, down, diagonal and anti-diagonal
+LINE_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+def winning_windows(rows, cols, win_length):
+    """Return every run of win_length cells in a line on the board, as tuples of cells."""
+    windows = []
+    for row in range(rows):
+        for col in range(cols):
+            for delta_row, delta_col in LINE_DIRECTIONS:
+                end_row = row + delta_row * (win_length - 1)
+                end_col = col + delta_col * (win_length - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    windows.append(tuple((row + delta_row * step) * cols + col + delta_col * step for step in range(win_length)))
+    return windows
+
+def window_mask(window):
+    """Return the bitmask of a window's cells."""
+    mask = 0
+    for cell in window:
+        mask |= 1 << cell
+    return mask
+
+def cell_line_masks(rows, cols, win_length):
+    """Return, for each cell, the bitmasks of the winning windows through it."""
+    masks = [[] for _ in range(rows * cols)]
+    for window in winning_windows(rows, cols, win_length):
+        mask = window_mask(window)
+        for cell in window:
+            masks[cell].append(mask)
+    return [tuple(cell_masks) for cell_masks in masks]
@@ -9,8 +9,9 @@ def train_dqn(episodes=10000, batch_size=64, render_interval=500, render_delay=0
     # Example: Select Snake Environment
     selected_env_id = "snake"
 
-    # Create environment using the loader
-    env, env_config = get_environment(selected_env_id)
+    # Create environment using the loader, with float32 states (what the network consumes) handed
+    # out as read-only views, the flatten below takes the copy we store in the replay buffer
+    env, env_config = get_environment(selected_env_id, obs_dtype="float32", copy_state=False)
 
     # Get the state space (ensure it is flattened)
     state_dim = np.prod(env.get_state().shape)
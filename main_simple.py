@@ -71,6 +71,63 @@ def get_agents(game_id, env_config, selected_agents, providers=None, models=None
 
 
 
+def play_simultaneous_turns(env, state):
+    """
+    Play a game in which every agent moves at once each tick (e.g. multi snake), returning the final state.
+    """
+    while not env.game_over:
+        actions = []
+        for agent in env.agents:
+            # Agents that are out of the game have no move to make
+            if not env.is_alive(agent.player):
+                actions.append(None)
+                continue
+
+            # Snake agents take the numerical state from their own point of view, LLM agents take the rendered state
+            if agent.agent_type == AgentType.LLM:
+                actions.append(agent.get_action(env.steps + 1, env.get_render()))
+            elif agent.agent_type == AgentType.CLASSIC and hasattr(env, 'get_observation'):
+                # Classic agents read positions straight from the observation
+                actions.append(agent.get_action(env.steps + 1, env.get_observation(agent.player)))
+            else:
+                actions.append(agent.get_action(env.steps + 1, env.get_state(agent.player)))
+
+        # Now perform a step in the environment with every action
+        state, rewards, game_over = env.step(actions, env.agents)
+
+        # **Render after every step** to reflect the current state
+        env.render()
+
+        # 150 millisecond delay between steps
+        time.sleep(0.15)
+
+    return state
+
+def play_single_agent(env, state):
+    """
+    Play a game with one agent and no turns (e.g. snake), returning the final state.
+    """
+    agent = env.agents[0]
+    while not env.game_over:
+        # Snake agents take the step and their state: the rendered state for LLM agents, the observation for classic agents
+        if agent.agent_type == AgentType.LLM:
+            action = agent.get_action(env.steps + 1, env.get_render())
+        elif agent.agent_type == AgentType.CLASSIC and hasattr(env, 'get_observation'):
+            action = agent.get_action(env.steps + 1, env.get_observation())
+        else:
+            action = agent.get_action(env.steps + 1, state)
+
+        # Now perform a step in the environment
+        state, reward, game_over = env.step(action, agent)
+
+        # **Render after every step** to reflect the current state
+        env.render()
+
+        # 150 millisecond delay between steps
+        time.sleep(0.15)
+
+    return state
+
 def play(selected_env_id, selected_agents, providers=None, models=None, episodes=1000):
     # Create environment using the loader
     env, env_config = get_environment(selected_env_id)
@@ -102,6 +159,14 @@ def play(selected_env_id, selected_agents, providers=None, models=None, episodes
         # 150 millisecond delay
         time.sleep(0.15)
 
+        # Simultaneous move games resolve every agent's move together
+        if getattr(env, 'simultaneous_moves', False):
+            state = play_simultaneous_turns(env, state)
+
+        # Single agent games have no turns, the agent moves on every step
+        elif not hasattr(env, 'current_player'):
+            state = play_single_agent(env, state)
+
         # Loop until the game is over
         while not env.game_over:
             for agent in env.agents:
@@ -111,6 +176,9 @@ def play(selected_env_id, selected_agents, providers=None, models=None, episodes
                     if agent.agent_type == AgentType.LLM:
                         # Pass both the state and the rendered state
                         action = agent.get_action(env.steps + 1, state, env.get_render(), env.current_player)
+                    elif agent.agent_type == AgentType.CLASSIC and hasattr(env, 'get_observation'):
+                        # Classic agents read positions straight from the observation
+                        action = agent.get_action(env.steps + 1, env.get_observation(), env.get_render(), env.current_player)
                     else:
                         # Pass both the state and the rendered state
                         action = agent.get_action(env.steps + 1, state, env.get_render(), env.current_player)